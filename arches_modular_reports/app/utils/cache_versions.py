@@ -0,0 +1,46 @@
+"""
+Version tokens for invalidating cached report data.
+
+Cached values embed the current version token of whatever they were derived
+from (e.g. a graph) in their cache key. Bumping the token orphans every entry
+built from the previous version, so invalidation never has to enumerate keys.
+"""
+
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY_PREFIX = "arches_modular_reports"
+
+
+def get_report_cache_timeout():
+    return getattr(settings, "MODULAR_REPORTS_CACHE_TIMEOUT", 3600 * 24)
+
+
+def make_cache_key(*parts):
+    return ":".join([CACHE_KEY_PREFIX, *(str(part) for part in parts)])
+
+
+def get_cache_version(scope, identifier):
+    key = make_cache_key("version", scope, identifier)
+    version = cache.get(key)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(key, version, timeout=None):
+            # Lost a race with another process; use the winner's token.
+            version = cache.get(key, version)
+    return version
+
+
+def bump_cache_version(scope, identifier):
+    cache.set(make_cache_key("version", scope, identifier), uuid4().hex, timeout=None)
+
+
+def hash_nodegroup_permissions(readable_nodegroup_ids, writable_nodegroup_ids):
+    digest = hashlib.sha1()
+    for nodegroup_ids in (readable_nodegroup_ids, writable_nodegroup_ids):
+        digest.update(",".join(sorted(str(pk) for pk in nodegroup_ids)).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
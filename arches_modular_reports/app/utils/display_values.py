@@ -0,0 +1,138 @@
+import operator
+from collections import defaultdict
+from functools import reduce
+
+from django.contrib.postgres.search import SearchVector
+from django.db import transaction
+from django.db.models import F, Q, Value
+
+from arches.app.models import models
+from arches.app.models.system_settings import settings
+
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    ArchesGetNodeDisplayValueV2,
+    ArchesGetNodeDisplayValueV3,
+    ArchesGetValueId,
+)
+from arches_modular_reports.models import TileDisplayValue
+
+EXCLUDED_DATATYPES = {"semantic", "annotation", "geojson-feature-collection"}
+VALUE_ID_DATATYPES = {
+    "concept",
+    "concept-list",
+    "resource-instance",
+    "resource-instance-list",
+    "url",
+}
+
+
+def get_display_value_languages():
+    return [code for code, _name in settings.LANGUAGES]
+
+
+def compute_tile_display_values(tile_ids, nodes, language):
+    """Run the display value functions for nodes of one nodegroup."""
+    annotations = {}
+    for i, node in enumerate(nodes):
+        annotations[f"display_value_{i}"] = ArchesGetNodeDisplayValueV2(
+            F("data"), Value(node.pk), Value(language)
+        )
+        annotations[f"display_pairs_{i}"] = ArchesGetNodeDisplayValueV3(
+            F("data"), Value(node.pk), Value(language)
+        )
+        if node.datatype in VALUE_ID_DATATYPES:
+            annotations[f"value_ids_{i}"] = ArchesGetValueId(
+                F("data"), Value(node.pk), Value(language)
+            )
+
+    tiles = (
+        models.TileModel.objects.filter(pk__in=tile_ids)
+        .annotate(**annotations)
+        .values("pk", *annotations)
+    )
+    return [
+        TileDisplayValue(
+            tile_id=tile["pk"],
+            node_id=node.pk,
+            language=language,
+            display_value=tile[f"display_value_{i}"],
+            display_pairs=tile[f"display_pairs_{i}"],
+            value_ids=tile.get(f"value_ids_{i}"),
+        )
+        for tile in tiles
+        for i, node in enumerate(nodes)
+    ]
+
+
+def refresh_tile_display_values(tile_ids):
+    """Replace the stored display values of the given tiles."""
+    tile_ids = list(tile_ids)
+    tile_ids_by_nodegroup = defaultdict(list)
+    for tile_id, nodegroup_id in models.TileModel.objects.filter(
+        pk__in=tile_ids
+    ).values_list("pk", "nodegroup_id"):
+        tile_ids_by_nodegroup[nodegroup_id].append(tile_id)
+
+    nodes_by_nodegroup = defaultdict(list)
+    for node in (
+        models.Node.objects.filter(nodegroup_id__in=tile_ids_by_nodegroup)
+        .exclude(datatype__in=EXCLUDED_DATATYPES)
+        .only("pk", "nodegroup_id", "datatype")
+    ):
+        nodes_by_nodegroup[node.nodegroup_id].append(node)
+
+    display_values = [
+        display_value
+        for nodegroup_id, nodegroup_tile_ids in tile_ids_by_nodegroup.items()
+        if nodes_by_nodegroup[nodegroup_id]
+        for language in get_display_value_languages()
+        for display_value in compute_tile_display_values(
+            nodegroup_tile_ids, nodes_by_nodegroup[nodegroup_id], language
+        )
+    ]
+
+    with transaction.atomic():
+        delete_tile_display_values(tile_ids)
+        TileDisplayValue.objects.bulk_create(display_values, batch_size=1000)
+        TileDisplayValue.objects.filter(tile_id__in=tile_ids).update(
+            search_vector=SearchVector("display_value", config="simple")
+        )
+
+
+def delete_tile_display_values(tile_ids):
+    TileDisplayValue.objects.filter(tile_id__in=tile_ids).delete()
+
+
+def refresh_referring_display_values(pair_key, ids):
+    """Refresh the stored display values of tiles with a display pair whose
+    pair_key ("id" or "value_id") is one of ids, e.g. after the resource or
+    concept they label has changed."""
+    if not ids:
+        return
+    tile_ids = (
+        TileDisplayValue.objects.filter(
+            reduce(
+                operator.or_,
+                [Q(display_pairs__contains=[{pair_key: str(id)}]) for id in ids],
+            )
+        )
+        .values_list("tile_id", flat=True)
+        .distinct()
+    )
+    refresh_tile_display_values(tile_ids)
+
+
+def refresh_resource_label_display_values(resource_id):
+    refresh_referring_display_values("id", [resource_id])
+
+
+def refresh_concept_label_display_values(concept_id, value_ids=()):
+    """Any value of a concept can label it in some language, so refresh the
+    tiles referring to any of them."""
+    value_ids = {
+        *value_ids,
+        *models.Value.objects.filter(concept_id=concept_id).values_list(
+            "pk", flat=True
+        ),
+    }
+    refresh_referring_display_values("value_id", value_ids)
@@ -0,0 +1,113 @@
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection
+
+from arches.app.utils.response import JSONResponse
+
+from arches_modular_reports.metrics_registry import get_all
+
+logger = logging.getLogger(__name__)
+
+_current_metrics = ContextVar("modular_reports_view_metrics", default=None)
+
+
+def instrumentation_enabled():
+    return getattr(settings, "MODULAR_REPORTS_INSTRUMENTATION", False)
+
+
+@dataclass
+class ViewMetrics:
+    """Measurements of one request to a modular report API view.
+    Times are in seconds."""
+
+    view_name: str
+    query_count: int = 0
+    db_time: float = 0.0
+    serialization_time: float = 0.0
+    total_time: float = 0.0
+    response_size: int | None = None
+    status_code: int | None = None
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_count += 1
+            self.db_time += time.perf_counter() - start
+
+    def as_server_timing(self):
+        return ", ".join(
+            [
+                f'db;desc="{self.query_count} queries";dur={self.db_time * 1000:.1f}',
+                f"serialize;dur={self.serialization_time * 1000:.1f}",
+                f"total;dur={self.total_time * 1000:.1f}",
+            ]
+        )
+
+
+@contextmanager
+def record_serialization():
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics := _current_metrics.get():
+            metrics.serialization_time += time.perf_counter() - start
+
+
+class InstrumentedJSONResponse(JSONResponse):
+    """JSONResponse that adds its serialization time to the current
+    request's metrics, if any."""
+
+    def __init__(self, *args, **kwargs):
+        with record_serialization():
+            super().__init__(*args, **kwargs)
+
+
+def get_view_name(request, view_func):
+    if request.resolver_match:
+        return request.resolver_match.view_name
+    return view_func.__name__
+
+
+def instrument_view(view_func):
+    """
+    Decorator that, when MODULAR_REPORTS_INSTRUMENTATION is enabled, measures
+    the decorated view, adds a Server-Timing header to its response, and
+    passes the measurements to the callbacks in metrics_registry.
+    """
+
+    @functools.wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not instrumentation_enabled():
+            return view_func(request, *args, **kwargs)
+
+        metrics = ViewMetrics(view_name=get_view_name(request, view_func))
+        token = _current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics.record_query):
+                response = view_func(request, *args, **kwargs)
+        finally:
+            _current_metrics.reset(token)
+        metrics.total_time = time.perf_counter() - start
+        metrics.status_code = response.status_code
+        if not response.streaming:
+            metrics.response_size = len(response.content)
+
+        response["Server-Timing"] = metrics.as_server_timing()
+        for name, callback in get_all().items():
+            try:
+                callback(request, metrics)
+            except Exception:
+                logger.exception("Modular reports metrics callback %s failed", name)
+        return response
+
+    return _wrapped_view
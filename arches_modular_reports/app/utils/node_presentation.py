@@ -0,0 +1,132 @@
+from django.core.cache import cache
+from django.utils import translation
+
+from arches.app.models import models
+
+from arches_modular_reports.app.utils.cache_versions import (
+    get_cache_version,
+    get_report_cache_timeout,
+    make_cache_key,
+)
+
+
+def getattr_from_queryset(queryset, attr, fallback):
+    if queryset:
+        return getattr(queryset[0], attr, fallback)
+    return fallback
+
+
+def get_widget_name(queryset, fallback):
+    if queryset and queryset[0].widget:
+        return getattr(queryset[0].widget, "name", fallback)
+    return fallback
+
+
+def get_widget_format(queryset, fallback=None):
+    if fallback is None:
+        fallback = {"format": "", "prefix": {}, "suffix": {}}
+    if queryset and queryset[0].widget:
+        if getattr(queryset[0].widget, "name", None) != "number-widget":
+            return fallback
+        config = getattr(queryset[0], "config", None)
+        if config:
+            ret = {
+                "format": config.get("format", fallback),
+                "prefix": config.get("prefix", fallback),
+                "suffix": config.get("suffix", fallback),
+            }
+            return ret
+    return fallback
+
+
+def get_node_visibility(node):
+    if node.pk == node.nodegroup.pk and node.nodegroup.cardmodel_set.all():
+        return node.nodegroup.cardmodel_set.all()[0].visible
+    if node.cardxnodexwidget_set.all():
+        return node.cardxnodexwidget_set.all()[0].visible
+    return True
+
+
+def build_node_presentation(graph_id):
+    """Presentation data for every node of the graph with a nodegroup, with
+    card names and widget labels in the active language."""
+    nodes = (
+        models.Node.objects.filter(graph_id=graph_id, nodegroup__isnull=False)
+        .select_related("nodegroup")
+        .prefetch_related(
+            "nodegroup__cardmodel_set",
+            "cardxnodexwidget_set__widget",
+        )
+    )
+
+    return {
+        node.alias: {
+            "nodeid": node.nodeid,
+            "name": node.name,
+            "card_name": str(
+                getattr_from_queryset(
+                    node.nodegroup.cardmodel_set.all(),
+                    "name",
+                    "",
+                )
+            ),
+            "card_order": getattr_from_queryset(
+                node.nodegroup.cardmodel_set.all(),
+                "sortorder",
+                0,
+            ),
+            "card_visible": getattr_from_queryset(
+                node.nodegroup.cardmodel_set.all(),
+                "visible",
+                True,
+            ),
+            "widget_label": str(
+                getattr_from_queryset(
+                    node.cardxnodexwidget_set.all(),
+                    "label",
+                    node.name.replace("_", " ").title(),
+                )
+            ),
+            "widget_order": getattr_from_queryset(
+                node.cardxnodexwidget_set.all(),
+                "sortorder",
+                0,
+            ),
+            "visible": get_node_visibility(node),
+            "nodegroup": {
+                "nodegroup_id": node.nodegroup.pk,
+                "cardinality": node.nodegroup.cardinality,
+            },
+            "is_rich_text": get_widget_name(node.cardxnodexwidget_set.all(), None)
+            == "rich-text-widget",
+            "is_required": node.isrequired,
+            "is_numeric": get_widget_name(node.cardxnodexwidget_set.all(), None)
+            == "number-widget",
+            "number_format": get_widget_format(node.cardxnodexwidget_set.all()),
+        }
+        for node in nodes
+    }
+
+
+def get_compiled_node_presentation(graph_id):
+    """Cached build_node_presentation(), per language. Invalidated whenever
+    the graph or one of its nodes, nodegroups, cards or widgets is saved or
+    deleted."""
+    key = make_cache_key(
+        "node_presentation",
+        graph_id,
+        get_cache_version("graph", graph_id),
+        translation.get_language(),
+    )
+    if (presentation := cache.get(key)) is None:
+        presentation = build_node_presentation(graph_id)
+        cache.set(key, presentation, timeout=get_report_cache_timeout())
+    return presentation
+
+
+def get_node_presentation(graph, permitted_nodegroups):
+    return {
+        alias: node_presentation
+        for alias, node_presentation in get_compiled_node_presentation(graph.pk).items()
+        if node_presentation["nodegroup"]["nodegroup_id"] in permitted_nodegroups
+    }
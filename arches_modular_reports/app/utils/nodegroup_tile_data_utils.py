@@ -1,31 +1,42 @@
 import json
 import operator
+import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import defaultdict
 from functools import reduce
-from uuid import UUID
 
+from django.conf import settings
 from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.search import SearchQuery
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.db.models import (
+    BooleanField,
     Case,
+    Count,
     Exists,
+    ExpressionWrapper,
     F,
     Func,
     IntegerField,
     JSONField,
     OuterRef,
     Q,
+    Subquery,
     TextField,
     Value,
     When,
 )
-from django.db.models.expressions import CombinedExpression
+from django.db.models.expressions import CombinedExpression, RawSQL
 from django.db.models.fields.json import KT
-from django.db.models.functions import Cast, Concat, JSONObject
+from django.db.models.functions import Cast, Coalesce, Concat, JSONObject
 from django.urls import get_script_prefix, reverse
+from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 
 from arches import __version__ as _arches_version_str
 from arches.app.models import models
 
+from arches_modular_reports.models import TileDisplayValue
 from packaging.version import Version
 
 arches_version = Version(_arches_version_str)
@@ -37,6 +48,14 @@ class ArchesGetNodeDisplayValueV2(Func):
     arity = 3
 
 
+class ArchesGetNodeDisplayValueV3(Func):
+    """A JSON array of {"label", "id"} objects, one per value of the node."""
+
+    function = "__arches_get_node_display_value_v3"
+    output_field = JSONField()
+    arity = 3
+
+
 class ArchesGetValueId(Func):
     function = "__arches_get_valueid"
     output_field = TextField()
@@ -49,6 +68,115 @@ class ArrayToString(Func):
     arity = 3
 
 
+def display_values_are_materialized():
+    return getattr(settings, "MODULAR_REPORTS_MATERIALIZE_DISPLAY_VALUES", False)
+
+
+def get_materialized_value(node_id, language, field):
+    """Read a stored TileDisplayValue field for the tile in the enclosing
+    queryset. node_id is a node id, or an OuterRef to one in that queryset."""
+    if isinstance(node_id, OuterRef):
+        node_id = OuterRef(node_id)
+    return Subquery(
+        TileDisplayValue.objects.filter(
+            tile_id=OuterRef("pk"), node_id=node_id, language=language
+        ).values(field)[:1]
+    )
+
+
+def get_unmaterialized_tiles_filter(language):
+    """Match tiles without stored display values in the language, e.g. tiles
+    saved before display values were materialized or loaded without signals,
+    until display values are rebuilt."""
+    return ~Exists(
+        TileDisplayValue.objects.filter(tile_id=OuterRef("pk"), language=language)
+    )
+
+
+def get_display_value(node_id, language):
+    """The display value of a node in the tile being queried. Tiles without
+    stored display values have theirs computed instead."""
+    display_value = ArchesGetNodeDisplayValueV2(
+        F("data"),
+        node_id if isinstance(node_id, OuterRef) else Value(node_id),
+        Value(language),
+    )
+    if display_values_are_materialized():
+        return Coalesce(
+            get_materialized_value(node_id, language, "display_value"),
+            display_value,
+        )
+    return display_value
+
+
+def get_value_ids(node_id, language):
+    value_ids = ArchesGetValueId(
+        F("data"),
+        node_id if isinstance(node_id, OuterRef) else Value(node_id),
+        Value(language),
+    )
+    if display_values_are_materialized():
+        return Coalesce(
+            get_materialized_value(node_id, language, "value_ids"), value_ids
+        )
+    return value_ids
+
+
+def get_display_pairs(node_id, language):
+    """The {"label", "id"} pairs of a node's values in the tile being queried.
+    Rows stored before pairs were materialized have none, so those are
+    computed instead."""
+    display_pairs = ArchesGetNodeDisplayValueV3(
+        F("data"),
+        node_id if isinstance(node_id, OuterRef) else Value(node_id),
+        Value(language),
+    )
+    if display_values_are_materialized():
+        return Coalesce(
+            get_materialized_value(node_id, language, "display_pairs"),
+            display_pairs,
+        )
+    return display_pairs
+
+
+def resolve_display_pairs(display_pairs):
+    """Label linked values that have no label, e.g. resources without a name
+    in the request language, as undefined."""
+    return [
+        (
+            {**pair, "label": _("Undefined")}
+            if pair["id"] and pair["label"] is None
+            else pair
+        )
+        for pair in display_pairs or []
+    ]
+
+
+def get_search_terms(query):
+    return re.findall(r"\w+", query)
+
+
+def get_indexed_search_filter(query, node_ids, language):
+    """Match tiles with a stored display value (of one of node_ids) containing
+    a word starting with each term of the query, using the full-text index
+    on TileDisplayValue.search_vector."""
+    return reduce(
+        operator.and_,
+        [
+            Q(
+                pk__in=TileDisplayValue.objects.filter(
+                    node_id__in=node_ids,
+                    language=language,
+                    search_vector=SearchQuery(
+                        f"{term}:*", config="simple", search_type="raw"
+                    ),
+                ).values("tile_id")
+            )
+            for term in get_search_terms(query)
+        ],
+    )
+
+
 def get_link(datatype, value_id):
     if datatype in ["concept", "concept-list"]:
         return reverse("rdm", args=[value_id])
@@ -183,11 +311,8 @@ def annotate_node_values(
         )
         .annotate(
             json_object=JSONObject(
-                display_value=ArchesGetNodeDisplayValueV2(
-                    F("data"),
-                    OuterRef("nodeid"),
-                    Value(user_language),
-                ),
+                display_value=get_display_value(OuterRef("nodeid"), user_language),
+                display_pairs=get_display_pairs(OuterRef("nodeid"), user_language),
                 tile_value=CombinedExpression(
                     F("data"),
                     "->",
@@ -217,6 +342,43 @@ def annotate_node_values(
     )
 
 
+def serialize_node_tile_data(
+    node_aliases,
+    resourceinstance_id,
+    permitted_nodegroups,
+    user_language,
+    tile_limit,
+    is_user_rdm_admin,
+):
+    nodes_with_display_data = list(
+        annotate_node_values(
+            node_aliases,
+            resourceinstance_id,
+            permitted_nodegroups,
+            user_language,
+            tile_limit,
+        )
+    )
+    serialized = {}
+    for node in nodes_with_display_data:
+        serialized[node.alias] = []
+        for display_object in node.display_data:
+            display_pairs = resolve_display_pairs(display_object["display_pairs"])
+            serialized[node.alias].append(
+                {
+                    "display_values": [pair["label"] for pair in display_pairs],
+                    "links": prepare_links(
+                        node,
+                        [display_object["tile_value"]],
+                        display_pairs,
+                        user_language,
+                        is_user_rdm_admin,
+                    ),
+                }
+            )
+    return serialized
+
+
 def get_sorted_filtered_tiles(
     *,
     resourceinstanceid,
@@ -227,13 +389,17 @@ def get_sorted_filtered_tiles(
     user_language,
     user,
     filters,
+    permitted_nodegroups=None,
 ):
+    if permitted_nodegroups is None:
+        permitted_nodegroups = user.userprofile.viewable_nodegroups
+
     # semantic, annotation, and geojson-feature-collection data types are
     # excluded in __arches_get_node_display_value
     nodes = models.Node.objects.filter(
         graph__resourceinstance=resourceinstanceid,
         nodegroup__node__alias=nodegroup_alias,
-        nodegroup__in=user.userprofile.viewable_nodegroups,
+        nodegroup__in=permitted_nodegroups,
     ).exclude(
         datatype__in={"semantic", "annotation", "geojson-feature-collection"},
     )
@@ -250,9 +416,7 @@ def get_sorted_filtered_tiles(
     for node in nodes:
         field_key = f'field_{str(node.pk).replace("-", "_")}'
 
-        display_value = ArchesGetNodeDisplayValueV2(
-            F("data"), Value(str(node.pk)), Value(user_language)
-        )
+        display_value = get_display_value(node.pk, user_language)
 
         value_ids = None
         tile_value = None
@@ -263,9 +427,7 @@ def get_sorted_filtered_tiles(
             or node.datatype == "resource-instance-list"
             or node.datatype == "url"
         ):
-            value_ids = ArchesGetValueId(
-                F("data"), Value(node.pk), Value(user_language)
-            )
+            value_ids = get_value_ids(node.pk, user_language)
         elif node.datatype == "file-list":
             tile_value = F(f"data__{node.pk}")
         elif node.datatype == "reference":
@@ -301,17 +463,34 @@ def get_sorted_filtered_tiles(
         )
         .annotate(**field_annotations)
         .annotate(alias_annotations=JSONObject(**alias_annotations))
-        .annotate(
+    )
+    # Only build (and filter on) the concatenated display values when
+    # searching: otherwise every tile of the nodegroup is a result.
+    if query:
+        tiles = tiles.annotate(
             search_text=Concat(*display_values_with_spaces, output_field=TextField())
         )
-        .filter(tile_filters & Q(search_text__icontains=query))
-        .annotate(
-            has_children=Exists(
-                models.TileModel.objects.filter(parenttile=OuterRef("pk"))
+    if query and display_values_are_materialized() and get_search_terms(query):
+        # Tiles without stored display values are not in the index.
+        tiles = tiles.filter(
+            get_indexed_search_filter(query, [node.pk for node in nodes], user_language)
+            | (
+                Q(get_unmaterialized_tiles_filter(user_language))
+                & Q(search_text__icontains=query)
             )
         )
+    elif query:
+        tiles = tiles.filter(search_text__icontains=query)
+    if filters:
+        tiles = tiles.filter(tile_filters)
+    tiles = tiles.annotate(
+        has_children=Exists(models.TileModel.objects.filter(parenttile=OuterRef("pk")))
     )
 
+    # Every ordering ends in (sortorder, tileid) so that it is total, which
+    # keyset pagination (see paginate_by_cursor()) relies upon.
+    tiles = tiles.annotate(tile_sortorder=Coalesce(F("sortorder"), Value(0)))
+
     if sort_node_id:
         sort_field_name = f'field_{sort_node_id.replace("-", "_")}'
 
@@ -321,22 +500,282 @@ def get_sorted_filtered_tiles(
             default=Value(0),
             output_field=IntegerField(),
         )
+        tiles = tiles.annotate(
+            sort_priority=sort_priority,
+            sort_value=Coalesce(
+                F(sort_field_name), Value(""), output_field=TextField()
+            ),
+        )
 
         if direction.lower().startswith("asc"):
-            tiles = tiles.annotate(sort_priority=sort_priority).order_by(
-                "sort_priority", F(sort_field_name).asc()
+            tiles = tiles.order_by(
+                "sort_priority", "sort_value", "tile_sortorder", "tileid"
             )
         else:
-            tiles = tiles.annotate(sort_priority=sort_priority).order_by(
-                "-sort_priority", F(sort_field_name).desc()
+            tiles = tiles.order_by(
+                "-sort_priority", "-sort_value", "-tile_sortorder", "-tileid"
             )
     else:
         # default sort order for consistent pagination
-        tiles = tiles.order_by("sortorder")
+        tiles = tiles.order_by("tile_sortorder", "tileid")
 
     return tiles
 
 
+def get_unfiltered_tiles(*, resourceinstanceid, nodegroup_alias):
+    """Plain tile rows for a nodegroup of a resource, i.e. the rows of
+    get_sorted_filtered_tiles() when there is no query or filter."""
+    return models.TileModel.objects.filter(
+        resourceinstance_id=resourceinstanceid,
+        nodegroup_id__in=models.Node.objects.filter(
+            graph__resourceinstance=resourceinstanceid, alias=nodegroup_alias
+        ).values("nodegroup_id"),
+    )
+
+
+class PrefetchPaginator(Paginator):
+    """Paginator that can also return the page after the requested one,
+    so that clients can prefetch it without another request. If count is
+    given, object_list is not counted."""
+
+    def __init__(self, object_list, per_page, *, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            # Paginator.count is a cached_property.
+            self.__dict__["count"] = count
+
+    def get_rows(self, bottom, top):
+        return list(self.object_list[bottom:top])
+
+    def get_page_and_next(self, number):
+        """Like get_page(), but returns (page, next_page), where next_page
+        is None on the last page. Rows for both come from one query."""
+        try:
+            number = self.validate_number(number)
+        except PageNotAnInteger:
+            number = 1
+        except EmptyPage:
+            number = self.num_pages
+        bottom = (number - 1) * self.per_page
+        rows = self.get_rows(bottom, bottom + 2 * self.per_page)
+        page = self._get_page(rows[: self.per_page], number, self)
+        if not page.has_next():
+            return page, None
+        return page, self._get_page(rows[self.per_page :], number + 1, self)
+
+
+class UnfilteredTilePaginator(PrefetchPaginator):
+    """Paginates get_sorted_filtered_tiles() when there is no query or
+    filter. Rows are counted, and unless sorted by a display value also
+    chosen, from plain tile rows; display values are only computed for the
+    tiles on the requested page."""
+
+    def __init__(self, object_list, per_page, *, unfiltered_tiles, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.unfiltered_tiles = unfiltered_tiles
+
+    @cached_property
+    def count(self):
+        return self.unfiltered_tiles.count()
+
+    @property
+    def is_default_order(self):
+        return self.object_list.query.order_by == ("tile_sortorder", "tileid")
+
+    def get_rows(self, bottom, top):
+        if not self.is_default_order:
+            return super().get_rows(bottom, top)
+        page_tile_ids = list(
+            self.unfiltered_tiles.annotate(
+                tile_sortorder=Coalesce(F("sortorder"), Value(0))
+            )
+            .order_by("tile_sortorder", "tileid")
+            .values_list("pk", flat=True)[bottom:top]
+        )
+        return list(self.object_list.filter(pk__in=page_tile_ids))
+
+    def page(self, number):
+        if not self.is_default_order:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.get_rows(bottom, bottom + self.per_page), number, self
+        )
+
+
+def encode_cursor(row, fields, backwards):
+    position = {
+        "values": [getattr(row, field) for field in fields],
+        "backwards": backwards,
+    }
+    return urlsafe_b64encode(json.dumps(position, default=str).encode()).decode()
+
+
+def decode_cursor(cursor, fields):
+    """Raises ValueError for cursors that were not made by encode_cursor()."""
+    try:
+        position = json.loads(urlsafe_b64decode(cursor.encode()))
+        values = position["values"]
+        backwards = bool(position["backwards"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(cursor) from e
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise ValueError(cursor)
+    return values, backwards
+
+
+def paginate_by_cursor(queryset, rows_per_page, cursor=None):
+    """Keyset ("seek") pagination: rather than OFFSET past earlier rows,
+    filter to rows sorting after the last row the client saw. The queryset
+    must be ordered by field or annotation names that together are unique.
+
+    Returns (rows, next_cursor, previous_cursor).
+    """
+    ordering = [str(field) for field in queryset.query.order_by]
+    fields = [field.lstrip("-") for field in ordering]
+    descending = [field.startswith("-") for field in ordering]
+
+    backwards = False
+    if cursor:
+        values, backwards = decode_cursor(cursor, fields)
+        seek = Q()
+        for i, field in enumerate(fields):
+            lookup = "lt" if descending[i] != backwards else "gt"
+            seek |= Q(
+                **{fields[j]: values[j] for j in range(i)},
+                **{f"{field}__{lookup}": values[i]},
+            )
+        queryset = queryset.filter(seek)
+        if backwards:
+            queryset = queryset.reverse()
+
+    rows = list(queryset[: rows_per_page + 1])
+    has_more = len(rows) > rows_per_page
+    rows = rows[:rows_per_page]
+    if backwards:
+        rows.reverse()
+
+    if not rows:
+        return rows, None, None
+    has_next = has_more if not backwards else True
+    has_previous = bool(cursor) if not backwards else has_more
+    return (
+        rows,
+        encode_cursor(rows[-1], fields, backwards=False) if has_next else None,
+        encode_cursor(rows[0], fields, backwards=True) if has_previous else None,
+    )
+
+
+def get_relations(*, resource, permitted_nodegroups, related_graph=None):
+    """Relations between resource and resources of related_graph (or of
+    any graph), through nodes of permitted nodegroups, without
+    annotations."""
+    if arches_version < Version("8.0"):
+        resource_from_field = "resourceinstanceidfrom"
+        resource_from_graph_field = "resourceinstancefrom_graphid"
+        resource_to_field = "resourceinstanceidto"
+        resource_to_graph_field = "resourceinstanceto_graphid"
+        node_field = "nodeid"
+    else:
+        resource_from_field = "from_resource"
+        resource_from_graph_field = "from_resource_graph"
+        resource_to_field = "to_resource"
+        resource_to_graph_field = "to_resource_graph"
+        node_field = "node"
+
+    # Each direction of the relation is selected separately, so that each
+    # can use the index on its resource column.
+    meta = models.ResourceXResource._meta
+    directions = []
+    params = []
+    for resource_field, counterpart_graph_field in (
+        (resource_from_field, resource_to_graph_field),
+        (resource_to_field, resource_from_graph_field),
+    ):
+        sql = (
+            f"SELECT {meta.pk.column} FROM {meta.db_table} "
+            f"WHERE {meta.get_field(resource_field).column} = %s"
+        )
+        params.append(resource.pk)
+        if related_graph:
+            sql += f" AND {meta.get_field(counterpart_graph_field).column} = %s"
+            params.append(related_graph.pk)
+        directions.append(sql)
+    relation_ids = RawSQL(" UNION ALL ".join(directions), params)
+
+    return models.ResourceXResource.objects.filter(
+        Q(pk__in=relation_ids),
+        Q(**{f"{node_field}__nodegroup_id__in": permitted_nodegroups}),
+    )
+
+
+def get_relation_counts_by_graph(*, resource, permitted_nodegroups):
+    """{graph slug: number of relations} for the graphs of resources related
+    to resource, counted in one grouped query."""
+    if arches_version < Version("8.0"):
+        resource_from_field = "resourceinstanceidfrom"
+        resource_from_graph_field = "resourceinstancefrom_graphid"
+        resource_to_graph_field = "resourceinstanceto_graphid"
+    else:
+        resource_from_field = "from_resource"
+        resource_from_graph_field = "from_resource_graph"
+        resource_to_graph_field = "to_resource_graph"
+
+    counts = (
+        get_relations(resource=resource, permitted_nodegroups=permitted_nodegroups)
+        .annotate(
+            counterpart_graph_slug=Case(
+                When(
+                    Q(**{resource_from_field: resource}),
+                    then=F(f"{resource_to_graph_field}__slug"),
+                ),
+                default=F(f"{resource_from_graph_field}__slug"),
+            )
+        )
+        .values("counterpart_graph_slug")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    return {row["counterpart_graph_slug"]: row["count"] for row in counts}
+
+
+def get_related_graph_ids(*, resource):
+    """The ids of the graphs of resources related to resource, through any
+    node."""
+    if arches_version < Version("8.0"):
+        resource_from_field = "resourceinstanceidfrom"
+        resource_from_graph_field = "resourceinstancefrom_graphid"
+        resource_to_field = "resourceinstanceidto"
+        resource_to_graph_field = "resourceinstanceto_graphid"
+    else:
+        resource_from_field = "from_resource"
+        resource_from_graph_field = "from_resource_graph"
+        resource_to_field = "to_resource"
+        resource_to_graph_field = "to_resource_graph"
+
+    graph_ids = set()
+    for graph_id_pair in (
+        models.ResourceXResource.objects.filter(
+            Q(**{resource_from_field: resource}) | Q(**{resource_to_field: resource})
+        )
+        .values_list(f"{resource_from_graph_field}_id", f"{resource_to_graph_field}_id")
+        .distinct()
+    ):
+        graph_ids.update(graph_id for graph_id in graph_id_pair if graph_id)
+    return graph_ids
+
+
+RELATION_DISPLAY_PAIR_DATATYPES = {
+    "concept",
+    "concept-list",
+    "resource-instance",
+    "resource-instance-list",
+    "url",
+}
+
+
 def get_sorted_filtered_relations(
     *,
     resource,
@@ -347,33 +786,30 @@ def get_sorted_filtered_relations(
     direction,
     query,
     request_language,
+    include_node_values=True,
 ):
+    """Relations between resource and resources of related_graph, annotated
+    with the counterpart resource's id, name and relation name, and, if
+    include_node_values, with the display values of nodes. Without node
+    values, the relations can be neither searched nor sorted by node; use
+    attach_related_node_values() on a page of them instead."""
     if arches_version < Version("8.0"):
         resource_from_field = "resourceinstanceidfrom"
-        resource_from_graph_field = "resourceinstancefrom_graphid"
         resource_to_field = "resourceinstanceidto"
-        resource_to_graph_field = "resourceinstanceto_graphid"
         node_field = "nodeid"
     else:
         resource_from_field = "from_resource"
-        resource_from_graph_field = "from_resource_graph"
         resource_to_field = "to_resource"
-        resource_to_graph_field = "to_resource_graph"
         node_field = "node"
 
-    def make_tile_annotations(node, direction):
-        resource_field = resource_to_field if direction == "to" else resource_from_field
+    def make_tile_annotations(node):
         tile_query = ArraySubquery(
             models.TileModel.objects.filter(
-                resourceinstance=OuterRef(resource_field),
+                resourceinstance=OuterRef("counterpart_id"),
                 nodegroup_id=node.nodegroup_id,
             )
             .exclude(**{f"data__{node.pk}__isnull": True})
-            .annotate(
-                display_value=ArchesGetNodeDisplayValueV2(
-                    F("data"), Value(node.pk), Value(request_language)
-                )
-            )
+            .annotate(display_value=get_display_value(node.pk, request_language))
             .order_by("sortorder")
             .values("display_value")
             .distinct()
@@ -384,11 +820,10 @@ def get_sorted_filtered_relations(
             Value(_("None")),  # null replacement
         )
 
-    def make_tile_instance_details_annotations(node, direction):
-        resource_field = resource_to_field if direction == "to" else resource_from_field
+    def make_tile_instance_details_annotations(node):
         return ArraySubquery(
             models.TileModel.objects.filter(
-                resourceinstance=OuterRef(resource_field),
+                resourceinstance=OuterRef("counterpart_id"),
                 nodegroup_id=node.nodegroup_id,
             )
             .exclude(**{f"data__{node.pk}__isnull": True})
@@ -398,59 +833,52 @@ def get_sorted_filtered_relations(
             .distinct()
         )
 
-    data_annotations = {
-        node.alias: Case(
-            When(
-                Q(**{resource_from_field: resource}),
-                then=make_tile_annotations(node, "to"),
-            ),
-            When(
-                Q(**{resource_to_field: resource}),
-                then=make_tile_annotations(node, "from"),
-            ),
+    def make_tile_display_pairs_annotations(node):
+        return ArraySubquery(
+            models.TileModel.objects.filter(
+                resourceinstance=OuterRef("counterpart_id"),
+                nodegroup_id=node.nodegroup_id,
+            )
+            .exclude(**{f"data__{node.pk}__isnull": True})
+            .order_by("sortorder")
+            .annotate(display_pairs=get_display_pairs(node.pk, request_language))
+            .values("display_pairs")
+            .distinct()
         )
+
+    if not include_node_values:
+        nodes = []
+
+    data_annotations = {
+        node.alias: make_tile_annotations(node)
         for node in nodes
         if node.nodegroup_id in permitted_nodegroups
     }
     instance_details_annotations = {
-        node.alias
-        + "_instance_details": Case(
-            When(
-                Q(**{resource_from_field: resource}),
-                then=make_tile_instance_details_annotations(node, "to"),
-            ),
-            When(
-                Q(**{resource_to_field: resource}),
-                then=make_tile_instance_details_annotations(node, "from"),
-            ),
-        )
+        node.alias + "_instance_details": make_tile_instance_details_annotations(node)
         for node in nodes
-        if node.datatype
-        in {
-            "concept",
-            "concept-list",
-            "resource-instance",
-            "resource-instance-list",
-            "url",
-            "file-list",
-        }
+        if node.datatype == "file-list" and node.nodegroup_id in permitted_nodegroups
+    }
+    display_pairs_annotations = {
+        node.alias + "_display_pairs": make_tile_display_pairs_annotations(node)
+        for node in nodes
+        if node.datatype in RELATION_DISPLAY_PAIR_DATATYPES
         and node.nodegroup_id in permitted_nodegroups
     }
 
     relations = (
-        (
-            models.ResourceXResource.objects.filter(
-                Q(**{resource_from_field: resource}),
-                Q(**{resource_to_graph_field: related_graph}),
-                Q(**{f"{node_field}__nodegroup_id__in": permitted_nodegroups}),
-            )
-            | models.ResourceXResource.objects.filter(
-                Q(**{resource_to_field: resource}),
-                Q(**{resource_from_graph_field: related_graph}),
-                Q(**{f"{node_field}__nodegroup_id__in": permitted_nodegroups}),
+        get_relations(
+            resource=resource,
+            related_graph=related_graph,
+            permitted_nodegroups=permitted_nodegroups,
+        )
+        # The relation's other side, worked out once for the annotations.
+        .annotate(
+            counterpart_id=Case(
+                When(Q(**{resource_from_field: resource}), then=F(resource_to_field)),
+                default=F(resource_from_field),
             )
         )
-        .distinct()
         .annotate(
             relation_name_json=(
                 models.CardXNodeXWidget.objects.filter(
@@ -462,20 +890,16 @@ def get_sorted_filtered_relations(
         # https://github.com/archesproject/arches/issues/10028
         .annotate(**{"@relation_name": KT(f"relation_name_json__{request_language}")})
         .annotate(
-            display_name_json=Case(
-                When(
-                    Q(**{resource_from_field: resource}),
-                    then=F(f"{resource_to_field}__name"),
-                ),
-                When(
-                    Q(**{resource_to_field: resource}),
-                    then=F(f"{resource_from_field}__name"),
-                ),
+            display_name_json=Subquery(
+                models.ResourceInstance.objects.filter(
+                    pk=OuterRef("counterpart_id")
+                ).values("name")[:1]
             )
         )
         .annotate(**{"@display_name": KT(f"display_name_json__{request_language}")})
         .annotate(**data_annotations)
         .annotate(**instance_details_annotations)
+        .annotate(**display_pairs_annotations)
     )
 
     if query:
@@ -501,6 +925,104 @@ def get_sorted_filtered_relations(
     return relations
 
 
+def get_related_node_values(
+    *, resource_ids, nodes, permitted_nodegroups, request_language
+):
+    """The node values that get_sorted_filtered_relations() annotates, for
+    each of resource_ids, fetched with one query per nodegroup. Returns
+    {resource id: {annotation name: value}}."""
+    nodes = [node for node in nodes if node.nodegroup_id in permitted_nodegroups]
+    node_values = {}
+    for resource_id in resource_ids:
+        node_values[resource_id] = {}
+        for node in nodes:
+            node_values[resource_id][node.alias] = []
+            if node.datatype == "file-list":
+                node_values[resource_id][node.alias + "_instance_details"] = []
+            if node.datatype in RELATION_DISPLAY_PAIR_DATATYPES:
+                node_values[resource_id][node.alias + "_display_pairs"] = []
+
+    nodes_by_nodegroup = defaultdict(list)
+    for node in nodes:
+        nodes_by_nodegroup[node.nodegroup_id].append(node)
+
+    for nodegroup_id, nodegroup_nodes in nodes_by_nodegroup.items():
+        # Annotation names are indexed, as node aliases could clash with
+        # TileModel fields.
+        annotations = {}
+        for i, node in enumerate(nodegroup_nodes):
+            annotations[f"has_value_{i}"] = ExpressionWrapper(
+                Q(data__has_key=str(node.pk)), output_field=BooleanField()
+            )
+            annotations[f"display_value_{i}"] = get_display_value(
+                node.pk, request_language
+            )
+            if node.datatype == "file-list":
+                annotations[f"node_value_{i}"] = F(f"data__{node.pk}")
+            if node.datatype in RELATION_DISPLAY_PAIR_DATATYPES:
+                annotations[f"display_pairs_{i}"] = get_display_pairs(
+                    node.pk, request_language
+                )
+        tiles = (
+            models.TileModel.objects.filter(
+                resourceinstance_id__in=resource_ids, nodegroup_id=nodegroup_id
+            )
+            .annotate(**annotations)
+            .order_by("resourceinstance_id", "sortorder", "tileid")
+            .values("resourceinstance_id", "sortorder", *annotations)
+        )
+        for tile in tiles:
+            values = node_values[tile["resourceinstance_id"]]
+            for i, node in enumerate(nodegroup_nodes):
+                if not tile[f"has_value_{i}"]:
+                    continue
+                position = tile["sortorder"]
+                values[node.alias].append((position, tile[f"display_value_{i}"]))
+                if node.datatype == "file-list":
+                    values[node.alias + "_instance_details"].append(
+                        (position, tile[f"node_value_{i}"])
+                    )
+                if node.datatype in RELATION_DISPLAY_PAIR_DATATYPES:
+                    values[node.alias + "_display_pairs"].append(
+                        (position, tile[f"display_pairs_{i}"])
+                    )
+
+    for values in node_values.values():
+        for name, positioned_values in values.items():
+            # Like the DISTINCT in the annotations' subqueries, which
+            # compares sort order as well as value.
+            unique_values = []
+            seen = set()
+            for position, value in positioned_values:
+                key = (position, json.dumps(value, sort_keys=True))
+                if key not in seen:
+                    seen.add(key)
+                    unique_values.append(value)
+            values[name] = unique_values
+        for node in nodes:
+            values[node.alias] = ", ".join(
+                _("None") if value is None else value for value in values[node.alias]
+            )
+
+    return node_values
+
+
+def attach_related_node_values(
+    relations, *, nodes, permitted_nodegroups, request_language
+):
+    """Set the node values that get_sorted_filtered_relations() would have
+    annotated with include_node_values on each of relations."""
+    node_values = get_related_node_values(
+        resource_ids={relation.counterpart_id for relation in relations},
+        nodes=nodes,
+        permitted_nodegroups=permitted_nodegroups,
+        request_language=request_language,
+    )
+    for relation in relations:
+        for name, value in node_values[relation.counterpart_id].items():
+            setattr(relation, name, value)
+
+
 def filter_hidden_nodes(
     list_or_dict_to_filter, card_visibility_reference, node_visibility_reference
 ):
@@ -527,52 +1049,40 @@ def filter_hidden_nodes(
     raise TypeError
 
 
+def get_relation_display_pairs(relation, node):
+    """Flatten the per-tile display pairs that get_sorted_filtered_relations()
+    annotates for a node."""
+    return resolve_display_pairs(
+        [
+            pair
+            for tile_pairs in getattr(relation, node.alias + "_display_pairs", None)
+            or []
+            for pair in tile_pairs or []
+        ],
+    )
+
+
+LINKED_DATATYPES = {
+    "concept",
+    "concept-list",
+    "resource-instance",
+    "resource-instance-list",
+    "url",
+    "reference",
+}
+
+
 def prepare_links(
     node,
     tile_values,
-    node_display_value,
+    display_pairs,
     request_language,
-    value_finder,
     is_user_rdm_admin,
 ):
+    """Build links from the {"label", "id"} pairs returned by
+    __arches_get_node_display_value_v3(), or for files from the tile values."""
     links = []
 
-    ### TEMPORARY HELPERS
-
-    def get_resource_labels(tiledata):
-        """This is a source of N+1 queries, but we're working around the fact
-        that __arches_get_node_display_value() is lossy, i.e. if the display
-        values contain the delimiter (", ") we can't distinguish those.
-        So we just get the display values again, unfortunately.
-        TODO: graduate from the PG function to ORM expressions?
-        """
-        nonlocal request_language
-        ordered_ids = [UUID(innerTileVal["resourceId"]) for innerTileVal in tiledata]
-        resources = models.ResourceInstance.objects.filter(pk__in=ordered_ids).in_bulk()
-        return [
-            (
-                resources[res_id]
-                .descriptors.get(request_language, {})
-                .get("name", _("Undefined"))
-                if res_id in resources
-                else _("Undefined")
-            )
-            for res_id in ordered_ids
-        ]
-
-    def get_concept_labels(value_ids):
-        nonlocal value_finder
-        return [
-            value_finder.get_value(value_id_str).value for value_id_str in value_ids
-        ]
-
-    def get_concept_ids(value_ids):
-        nonlocal value_finder
-        return [
-            value_finder.get_value(value_id_str).concept_id
-            for value_id_str in value_ids
-        ]
-
     def form_file_url(tile_url_string):
         prefix = get_script_prefix()
         if tile_url_string.startswith("http") or tile_url_string.startswith(prefix):
@@ -580,110 +1090,47 @@ def prepare_links(
         url = get_script_prefix() + tile_url_string
         return url.replace("//", "/")
 
-    ### BEGIN LINK GENERATION
-    for tile_val in tile_values:
-        if tile_val:
-            match node.datatype:
-                case "resource-instance":
-                    links.append(
-                        {
-                            "label": node_display_value,
-                            "link": get_link(node.datatype, tile_val[0]["resourceId"]),
-                        }
-                    )
-                case "resource-instance-list":
-                    labels = get_resource_labels(tile_val)
-                    for related_resource, label in zip(tile_val, labels, strict=True):
-                        links.append(
-                            {
-                                "label": label,
-                                "link": get_link(
-                                    node.datatype, related_resource["resourceId"]
-                                ),
-                            }
-                        )
-                case "concept":
-                    if is_user_rdm_admin and (
-                        concept_id_results := get_concept_ids([tile_val])
-                    ):
-                        links.append(
-                            {
-                                "label": node_display_value,
-                                "link": get_link(node.datatype, concept_id_results[0]),
-                            }
-                        )
-                case "concept-list":
-                    if is_user_rdm_admin:
-                        concept_ids = get_concept_ids(tile_val)
-                        labels = get_concept_labels(tile_val)
-                        for concept_id, label in zip(concept_ids, labels, strict=True):
-                            links.append(
-                                {
-                                    "label": label,
-                                    "link": get_link(node.datatype, concept_id),
-                                }
-                            )
-                case "url":
-                    links.append(
-                        {
-                            "label": (
-                                tile_val["url_label"]
-                                if tile_val["url_label"]
-                                else tile_val["url"]
-                            ),
-                            "link": tile_val["url"],
-                        }
-                    )
-                case "file-list":
-                    for file in tile_val:
-                        links.append(
-                            {
-                                "is_file": True,
-                                "altText": file.get("altText", {}).get(
-                                    request_language
-                                )["value"],
-                                "attribution": file.get("attribution", {}).get(
-                                    request_language
-                                )["value"],
-                                "title": file.get("title", {}).get(
-                                    request_language, ""
-                                )["value"],
-                                "description": file.get("description", {}).get(
-                                    request_language, ""
-                                )["value"],
-                                "url": form_file_url(file["url"]),
-                            }
-                        )
-                case "reference":
-                    for val_id, disp_val in zip(
-                        tile_val, json.loads(node_display_value)
-                    ):
-                        if val_id:
-                            links.append(
-                                {
-                                    "label": disp_val,
-                                    "link": get_link(node.datatype, val_id),
-                                }
-                            )
-
+    if node.datatype == "file-list":
+        for tile_val in tile_values:
+            if not tile_val:
+                continue
+            for file in tile_val:
+                links.append(
+                    {
+                        "is_file": True,
+                        "altText": file.get("altText", {}).get(request_language)[
+                            "value"
+                        ],
+                        "attribution": file.get("attribution", {}).get(
+                            request_language
+                        )["value"],
+                        "title": file.get("title", {}).get(request_language, "")[
+                            "value"
+                        ],
+                        "description": file.get("description", {}).get(
+                            request_language, ""
+                        )["value"],
+                        "url": form_file_url(file["url"]),
+                    }
+                )
+        return links
+
+    if node.datatype not in LINKED_DATATYPES:
+        return links
+    if node.datatype in {"concept", "concept-list"} and not is_user_rdm_admin:
+        return links
+
+    for pair in display_pairs or []:
+        if not pair["id"]:
+            continue
+        links.append(
+            {
+                "label": pair["label"],
+                "link": (
+                    pair["id"]  # already a uri
+                    if node.datatype == "reference"
+                    else get_link(node.datatype, pair["id"])
+                ),
+            }
+        )
     return links
-
-
-def is_number(s):
-    try:
-        float(s)
-        return True
-    except:
-        return False
-
-
-def array_from_string(input_str):
-    if not input_str:
-        return []
-    elif is_number(input_str):
-        return [input_str]
-    else:
-        try:
-            return json.loads(input_str)
-        except json.JSONDecodeError:
-            return [input_str]
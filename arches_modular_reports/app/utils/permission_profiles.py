@@ -0,0 +1,63 @@
+import hashlib
+from dataclasses import dataclass
+from uuid import UUID
+
+from django.core.cache import cache
+
+from arches.app.utils.permission_backend import get_nodegroups_by_perm, group_required
+
+from arches_modular_reports.app.utils.cache_versions import (
+    get_cache_version,
+    get_report_cache_timeout,
+    hash_nodegroup_permissions,
+    make_cache_key,
+)
+
+
+@dataclass(frozen=True)
+class PermissionProfile:
+    """The permissions that decide what a user sees in a report. Users with
+    equal profiles see the same data, so responses can be cached by
+    fingerprint rather than by user."""
+
+    readable_nodegroup_ids: frozenset
+    writable_nodegroup_ids: frozenset
+    is_rdm_admin: bool
+
+    @property
+    def fingerprint(self):
+        digest = hashlib.sha1(
+            hash_nodegroup_permissions(
+                self.readable_nodegroup_ids, self.writable_nodegroup_ids
+            ).encode()
+        )
+        digest.update(b"rdm_admin" if self.is_rdm_admin else b"")
+        return digest.hexdigest()
+
+
+def get_nodegroup_ids(user, perm):
+    # Normalize to UUIDs so that profiles compare equal to nodegroup_id values.
+    return frozenset(
+        UUID(str(nodegroup_id)) for nodegroup_id in get_nodegroups_by_perm(user, perm)
+    )
+
+
+def get_permission_profile(user):
+    """Return the user's PermissionProfile, cached per user until any object
+    permission, group membership, or nodegroup changes."""
+    key = make_cache_key(
+        "permission_profile",
+        user.pk or "anonymous",
+        user.is_superuser,
+        get_cache_version("permissions", "all"),
+    )
+
+    if (profile := cache.get(key)) is None:
+        profile = PermissionProfile(
+            readable_nodegroup_ids=get_nodegroup_ids(user, "models.read_nodegroup"),
+            writable_nodegroup_ids=get_nodegroup_ids(user, "models.write_nodegroup"),
+            is_rdm_admin=bool(group_required(user, "RDM Administrator")),
+        )
+        cache.set(key, profile, timeout=get_report_cache_timeout())
+
+    return profile
@@ -0,0 +1,116 @@
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+
+from arches.app.models import models
+
+from arches_modular_reports.app.utils.cache_versions import (
+    get_cache_version,
+    get_report_cache_timeout,
+    hash_nodegroup_permissions,
+    make_cache_key,
+)
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    get_related_graph_ids,
+    get_relation_counts_by_graph,
+    get_relations,
+)
+from arches_modular_reports.app.utils.report_config_cache import (
+    get_graph_nodegroup_ids,
+)
+
+
+def get_resource_instance_node_ids(nodegroup_id):
+    """The ids of the resource-instance(-list) nodes of a nodegroup, cached
+    until a node is saved to or deleted from it."""
+    key = make_cache_key("resource_instance_nodes", nodegroup_id)
+
+    if (node_ids := cache.get(key)) is None:
+        node_ids = {
+            str(node_id)
+            for node_id in models.Node.objects.filter(
+                nodegroup_id=nodegroup_id,
+                datatype__in=["resource-instance", "resource-instance-list"],
+            ).values_list("pk", flat=True)
+        }
+        cache.set(key, node_ids, timeout=get_report_cache_timeout())
+
+    return node_ids
+
+
+def relation_counts_are_cached():
+    return not isinstance(caches["default"], DummyCache)
+
+
+def get_relevant_nodegroup_ids(graph_ids, permitted_nodegroups):
+    """The permitted nodegroups of graph_ids, i.e. those whose nodes can
+    relate resources of those graphs."""
+    return set().union(
+        *(
+            get_graph_nodegroup_ids(graph_id, get_cache_version("graph", graph_id))
+            for graph_id in graph_ids
+        )
+    ) & set(permitted_nodegroups)
+
+
+def get_cached_related_graph_ids(resource):
+    key = make_cache_key(
+        "related_graphs", resource.pk, get_cache_version("relations", resource.pk)
+    )
+
+    if (graph_ids := cache.get(key)) is None:
+        graph_ids = get_related_graph_ids(resource=resource)
+        cache.set(key, graph_ids, timeout=get_report_cache_timeout())
+
+    return graph_ids
+
+
+def get_relation_count(*, resource, related_graph, permitted_nodegroups):
+    """Count the relations that get_sorted_filtered_relations() returns
+    without a query, without annotating them. Counts are shared between
+    users who can read the same nodegroups of the two graphs, and are
+    invalidated whenever a relation to or from the resource is saved or
+    deleted."""
+    relevant_nodegroup_ids = get_relevant_nodegroup_ids(
+        {resource.graph_id, related_graph.pk}, permitted_nodegroups
+    )
+    key = make_cache_key(
+        "relation_count",
+        resource.pk,
+        related_graph.pk,
+        get_cache_version("relations", resource.pk),
+        hash_nodegroup_permissions(relevant_nodegroup_ids, []),
+    )
+
+    if (count := cache.get(key)) is None:
+        count = get_relations(
+            resource=resource,
+            related_graph=related_graph,
+            permitted_nodegroups=relevant_nodegroup_ids,
+        ).count()
+        cache.set(key, count, timeout=get_report_cache_timeout())
+
+    return count
+
+
+def get_relation_counts(*, resource, permitted_nodegroups):
+    """Cached get_relation_counts_by_graph(), shared between users who can
+    read the same nodegroups of the resource's graph and its related graphs,
+    and invalidated like get_relation_count()."""
+    relevant_nodegroup_ids = get_relevant_nodegroup_ids(
+        {resource.graph_id, *get_cached_related_graph_ids(resource)},
+        permitted_nodegroups,
+    )
+    key = make_cache_key(
+        "relation_counts",
+        resource.pk,
+        get_cache_version("relations", resource.pk),
+        hash_nodegroup_permissions(relevant_nodegroup_ids, []),
+    )
+
+    if (counts := cache.get(key)) is None:
+        counts = get_relation_counts_by_graph(
+            resource=resource, permitted_nodegroups=relevant_nodegroup_ids
+        )
+        cache.set(key, counts, timeout=get_report_cache_timeout())
+
+    return counts
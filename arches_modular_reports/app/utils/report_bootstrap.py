@@ -0,0 +1,86 @@
+from pathlib import Path
+
+from django.utils.translation import get_language_info
+
+from arches.app.models import models
+from arches.app.utils.permission_backend import user_can_edit_resource
+
+from arches_modular_reports.app.utils.node_presentation import get_node_presentation
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    serialize_node_tile_data,
+)
+from arches_modular_reports.app.utils.permission_profiles import (
+    get_permission_profile,
+)
+from arches_modular_reports.app.utils.report_config_cache import (
+    get_permitted_report_config,
+)
+from arches_modular_reports.models import ReportConfig
+
+# Mirrors RESOURCE_LIMIT_FOR_HEADER in constants.ts
+TOMBSTONE_TILE_LIMIT = 5
+
+
+def find_component_config(config, component_name):
+    for component in config.get("components", []):
+        if Path(component.get("component", "")).stem == component_name:
+            return component.get("config", {})
+    return None
+
+
+def get_header_tile_limit(header_config):
+    limits = [
+        options["limit"]
+        for options in (header_config.get("node_alias_options") or {}).values()
+        if "limit" in options
+    ]
+    return max(limits, default=1)
+
+
+def build_report_bootstrap(*, user, resourceid, report_config_slug, user_language):
+    """Gather everything a modular report needs above the fold, resolving
+    the graph and the user's permissions only once."""
+    graph = models.GraphModel.objects.filter(resourceinstance=resourceid).get()
+    config = get_permitted_report_config(resourceid, report_config_slug, user)
+    profile = get_permission_profile(user)
+    permitted_nodegroups = profile.readable_nodegroup_ids
+    is_user_rdm_admin = profile.is_rdm_admin
+
+    def get_node_tile_data(node_aliases, tile_limit):
+        return serialize_node_tile_data(
+            node_aliases,
+            resourceid,
+            permitted_nodegroups,
+            user_language,
+            tile_limit,
+            is_user_rdm_admin,
+        )
+
+    node_tile_data = {}
+    if (header_config := find_component_config(config, "ReportHeader")) is not None:
+        node_tile_data["header"] = get_node_tile_data(
+            ReportConfig.extract_node_aliases(header_config.get("descriptor", "")),
+            get_header_tile_limit(header_config),
+        )
+    if (
+        tombstone_config := find_component_config(config, "ReportTombstone")
+    ) is not None:
+        node_tile_data["tombstone"] = get_node_tile_data(
+            tombstone_config.get("node_aliases", []), TOMBSTONE_TILE_LIMIT
+        )
+        if image_node_alias := tombstone_config.get("image_node_alias"):
+            node_tile_data["tombstone_image"] = get_node_tile_data(
+                [image_node_alias], 1
+            )
+
+    return {
+        "config": config,
+        "node_presentation": get_node_presentation(graph, permitted_nodegroups),
+        "node_tile_data": node_tile_data,
+        "permissions": {"RDM Administrator": is_user_rdm_admin},
+        "user_can_edit_resource": bool(
+            user_can_edit_resource(user, resourceid=resourceid)
+        ),
+        "language": user_language,
+        "language_dir": "rtl" if get_language_info(user_language)["bidi"] else "ltr",
+    }
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+
+from arches.app.models import models
+
+from arches_modular_reports.app.utils.cache_versions import (
+    get_cache_version,
+    get_report_cache_timeout,
+    hash_nodegroup_permissions,
+    make_cache_key,
+)
+from arches_modular_reports.app.utils.get_report_config import get_report_config
+from arches_modular_reports.app.utils.permission_profiles import (
+    get_permission_profile,
+)
+from arches_modular_reports.app.utils.update_report_configuration_for_nodegroup_permissions import (
+    update_report_configuration_with_nodegroup_permissions,
+)
+from arches_modular_reports.models import ReportConfig
+
+
+def get_graph_nodegroup_ids(graph_id, graph_version):
+    key = make_cache_key("graph_nodegroups", graph_id, graph_version)
+    nodegroup_ids = cache.get(key)
+    if nodegroup_ids is None:
+        nodegroup_ids = set(
+            models.Node.objects.filter(graph_id=graph_id, nodegroup__isnull=False)
+            .values_list("nodegroup_id", flat=True)
+            .distinct()
+        )
+        cache.set(key, nodegroup_ids, timeout=get_report_cache_timeout())
+    return nodegroup_ids
+
+
+def get_permitted_report_config(resourceid, slug, user):
+    """Return the report config for the resource's graph, filtered down to
+    the nodegroups the user can read. Results are shared between all users
+    with the same readable/writable nodegroups, and are invalidated whenever
+    a ReportConfig, Node, or NodeGroup of the graph is saved or deleted.
+    """
+    graph_id = (
+        models.ResourceInstance.objects.filter(pk=resourceid)
+        .values_list("graph_id", flat=True)
+        .first()
+    )
+    if graph_id is None:
+        raise ReportConfig.DoesNotExist
+
+    graph_version = get_cache_version("graph", graph_id)
+    graph_nodegroup_ids = get_graph_nodegroup_ids(graph_id, graph_version)
+    profile = get_permission_profile(user)
+    readable_nodegroup_ids = graph_nodegroup_ids & profile.readable_nodegroup_ids
+    writable_nodegroup_ids = graph_nodegroup_ids & profile.writable_nodegroup_ids
+    key = make_cache_key(
+        "report_config",
+        graph_id,
+        slug.lower(),
+        graph_version,
+        hash_nodegroup_permissions(readable_nodegroup_ids, writable_nodegroup_ids),
+    )
+
+    if (filtered_config := cache.get(key)) is None:
+        filtered_config = update_report_configuration_with_nodegroup_permissions(
+            report_configuration_instance=get_report_config(resourceid, slug),
+            report_nodegroup_ids_with_user_read_permission=readable_nodegroup_ids,
+            report_nodegroup_ids_with_user_write_permission=writable_nodegroup_ids,
+        )
+        cache.set(key, filtered_config, timeout=get_report_cache_timeout())
+
+    return filtered_config
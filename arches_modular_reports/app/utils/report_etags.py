@@ -0,0 +1,88 @@
+import functools
+import hashlib
+
+from django.db.models import OuterRef, Subquery
+from django.utils import translation
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from arches.app.models import models
+from arches.app.utils.permission_backend import user_can_edit_resource
+
+from arches_modular_reports.app.utils.cache_versions import get_cache_version
+from arches_modular_reports.app.utils.permission_profiles import (
+    get_permission_profile,
+)
+from arches_modular_reports.models import ReportConfig
+
+
+def compute_report_etag(request, resourceid, *extra_parts):
+    """Hash what a report response for the resource depends on: the
+    versions of the resource's tiles (also bumped when a resource they refer
+    to is renamed), of its graph and of concepts, the graph's publication, the latest update to one of the graph's report
+    configs, the user's permission profile, and the active language. Takes
+    one query, or none beyond the profile's when that is cached."""
+    latest_config_update = (
+        ReportConfig.objects.filter(graph_id=OuterRef("graph_id"))
+        .order_by("-updated")
+        .values("updated")[:1]
+    )
+    resource_state = (
+        models.ResourceInstance.objects.filter(pk=resourceid)
+        .annotate(latest_config_update=Subquery(latest_config_update))
+        .values_list("graph_id", "graph__publication_id", "latest_config_update")
+        .first()
+    )
+    if resource_state is None:
+        return None
+
+    graph_id = resource_state[0]
+    digest = hashlib.sha1()
+    for part in (
+        resourceid,
+        *resource_state,
+        get_cache_version("resource", resourceid),
+        get_cache_version("graph", graph_id),
+        get_cache_version("concepts", "all"),
+        get_permission_profile(request.user).fingerprint,
+        translation.get_language(),
+        *extra_parts,
+    ):
+        digest.update(str(part).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+def get_report_etag(request, resourceid=None, **kwargs):
+    return compute_report_etag(request, resourceid or request.GET.get("resourceId"))
+
+
+def get_report_bootstrap_etag(request, resourceid, **kwargs):
+    # The bootstrap payload also reports whether the user can edit.
+    return compute_report_etag(
+        request,
+        resourceid,
+        bool(user_can_edit_resource(request.user, resourceid=resourceid)),
+    )
+
+
+def conditional_report_response(etag_func=get_report_etag):
+    """
+    Decorator that answers conditional GETs with 304 Not Modified when the
+    report data behind the response is unchanged, before the view runs its
+    queries. Responses must be revalidated on every use, and are private to
+    the user since they depend on the user's permissions.
+    """
+
+    def decorator(view_func):
+        conditional_view = condition(etag_func=etag_func)(view_func)
+
+        @functools.wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return _wrapped_view
+
+    return decorator
@@ -0,0 +1,323 @@
+"""
+Export of the sections of a modular report, as rows streamed from the same
+queries the report's tables page through.
+"""
+
+import csv
+import json
+from datetime import timedelta
+from itertools import groupby, islice
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+from django.utils.translation import gettext as _
+
+from arches import __version__ as _arches_version_str
+from arches.app.models import models
+
+from arches_modular_reports.app.utils.node_presentation import get_node_presentation
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    annotate_related_graph_nodes_with_widget_labels,
+    attach_related_node_values,
+    build_valueid_annotation,
+    get_sorted_filtered_relations,
+    get_sorted_filtered_tiles,
+    serialize_node_tile_data,
+)
+from packaging.version import Version
+
+arches_version = Version(_arches_version_str)
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+REPORT_FILE_DIRECTORY = "modular_reports"
+# How long generated report files are kept, in seconds.
+REPORT_FILE_EXPIRY = 24 * 3600
+HTML_SECTIONS_MARKER = "<!-- sections -->"
+
+
+class Echo:
+    """File-like object that returns what is written to it, so that
+    csv.writer can produce lines for a StreamingHttpResponse."""
+
+    def write(self, value):
+        return value
+
+
+def iter_export_components(components, section_name=None):
+    """Yield (section name, component name, config) for every component of
+    the report config, depth first and in display order."""
+    for component in components:
+        config = component.get("config", {})
+        yield section_name, Path(component.get("component", "")).stem, config
+        for child in [*config.get("tabs", []), *config.get("sections", [])]:
+            yield from iter_export_components(
+                child.get("components", []), child.get("name", section_name)
+            )
+
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def join_display_value(display_value):
+    if isinstance(display_value, list):
+        return ", ".join(str(item.get("label", "")) for item in display_value)
+    if display_value is None:
+        return ""
+    return str(display_value)
+
+
+def iter_tombstone_rows(*, section_name, config, labels, context):
+    node_aliases = config.get("node_aliases", [])
+    node_tile_data = serialize_node_tile_data(
+        node_aliases,
+        context["resource"].pk,
+        context["permitted_nodegroups"],
+        context["language"],
+        0,
+        False,
+    )
+    yield section_name, {
+        labels(alias): "; ".join(
+            ", ".join(tile["display_values"]) for tile in node_tile_data[alias]
+        )
+        for alias in node_aliases
+        if alias in node_tile_data
+    }
+
+
+def iter_data_section_rows(*, section_name, config, labels, context):
+    tiles = get_sorted_filtered_tiles(
+        resourceinstanceid=context["resource"].pk,
+        nodegroup_alias=config["nodegroup_alias"],
+        sort_node_id=None,
+        direction="asc",
+        query="",
+        user_language=context["language"],
+        user=context["user"],
+        filters=None,
+        permitted_nodegroups=context["permitted_nodegroups"],
+    )
+    node_aliases = config.get("node_aliases", [])
+    section_name = (
+        config.get("custom_card_name") or section_name or config["nodegroup_alias"]
+    )
+    for tile in tiles.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield section_name, {
+            labels(alias): join_display_value(
+                build_valueid_annotation(
+                    tile.alias_annotations[alias], False, context["language"]
+                )["display_value"]
+            )
+            for alias in node_aliases
+            if alias in tile.alias_annotations
+        }
+
+
+def iter_related_resources_rows(*, section_name, config, context):
+    filters = Q(slug=config["graph_slug"])
+    if arches_version >= Version("8.0"):
+        filters &= Q(source_identifier=None)
+    related_graph = models.GraphModel.objects.filter(filters).first()
+    if related_graph is None:
+        return
+
+    nodes = annotate_related_graph_nodes_with_widget_labels(
+        config.get("node_aliases", []), related_graph, context["language"]
+    )
+    custom_labels = config.get("custom_labels") or {}
+    columns = {
+        "@relation_name": _("Relation Name"),
+        "@display_name": _("Display Name"),
+        **{
+            node.alias: custom_labels.get(node.alias) or str(node.widget_label)
+            for node in nodes
+        },
+    }
+    relations = get_sorted_filtered_relations(
+        resource=context["resource"],
+        related_graph=related_graph,
+        nodes=nodes,
+        permitted_nodegroups=context["permitted_nodegroups"],
+        sort_field="@relation_name",
+        direction="asc",
+        query="",
+        request_language=context["language"],
+        include_node_values=False,
+    )
+    for chunk in iter_chunks(
+        relations.iterator(chunk_size=EXPORT_CHUNK_SIZE), EXPORT_CHUNK_SIZE
+    ):
+        attach_related_node_values(
+            chunk,
+            nodes=nodes,
+            permitted_nodegroups=context["permitted_nodegroups"],
+            request_language=context["language"],
+        )
+        for relation in chunk:
+            yield section_name or related_graph.name, {
+                label: join_display_value(getattr(relation, alias, None))
+                for alias, label in columns.items()
+            }
+
+
+def iter_report_rows(*, resource, config, user, profile, language):
+    """Yield (section name, {column label: display value}) for the rows of
+    the report's tombstone, data sections, and related resources sections,
+    in report order. Tiles and relations are read with server-side cursors,
+    so memory use does not grow with the size of the resource."""
+    context = {
+        "resource": resource,
+        "user": user,
+        "permitted_nodegroups": profile.readable_nodegroup_ids,
+        "language": language,
+    }
+    node_presentation = get_node_presentation(
+        resource.graph, profile.readable_nodegroup_ids
+    )
+
+    for section_name, component_name, component_config in iter_export_components(
+        config.get("components", [])
+    ):
+        custom_labels = component_config.get("custom_labels") or {}
+
+        def labels(alias):
+            return custom_labels.get(alias) or node_presentation.get(alias, {}).get(
+                "widget_label", alias
+            )
+
+        match component_name:
+            case "ReportTombstone":
+                yield from iter_tombstone_rows(
+                    section_name=_("Summary"),
+                    config=component_config,
+                    labels=labels,
+                    context=context,
+                )
+            case "DataSection":
+                yield from iter_data_section_rows(
+                    section_name=section_name,
+                    config=component_config,
+                    labels=labels,
+                    context=context,
+                )
+            case "RelatedResourcesSection":
+                yield from iter_related_resources_rows(
+                    section_name=section_name,
+                    config=component_config,
+                    context=context,
+                )
+
+
+def stream_csv(rows):
+    """One CSV table per section: a header row naming the section and its
+    columns, followed by its rows."""
+    writer = csv.writer(Echo())
+    table = None
+    for section_name, values in rows:
+        if get_table((section_name, values)) != table:
+            table = get_table((section_name, values))
+            yield writer.writerow([_("Section"), *values])
+        yield writer.writerow([section_name, *values.values()])
+
+
+def stream_ndjson(rows):
+    for section_name, values in rows:
+        yield json.dumps({"section": section_name, "values": values}) + "\n"
+
+
+def get_table(row):
+    """The section name and columns of a row. Adjacent sections can share a
+    name, e.g. data sections without custom card names, so rows belong to the
+    same table only if their columns match too."""
+    section_name, values = row
+    return section_name, list(values)
+
+
+def iter_report_sections(rows):
+    """Group rows into (section name, columns, rows of cells), lazily."""
+    for (section_name, columns), section_rows in groupby(rows, key=get_table):
+        yield section_name, columns, (
+            list(values.values()) for _section_name, values in section_rows
+        )
+
+
+def stream_json(rows):
+    yield "["
+    for i, (section_name, columns, section_rows) in enumerate(
+        iter_report_sections(rows)
+    ):
+        yield "," if i else ""
+        yield f'{{"section": {json.dumps(section_name)}, "rows": ['
+        for j, cells in enumerate(section_rows):
+            yield ("," if j else "") + json.dumps(dict(zip(columns, cells)))
+        yield "]}"
+    yield "]"
+
+
+def stream_html(rows, *, title):
+    """A static HTML page with one table per section, e.g. for printing,
+    rendered a row at a time."""
+    page_start, page_end = render_to_string(
+        "views/resource/report_snapshot.htm",
+        {"title": title, "sections": mark_safe(HTML_SECTIONS_MARKER)},
+    ).split(HTML_SECTIONS_MARKER)
+
+    yield page_start
+    has_sections = False
+    for section_name, columns, section_rows in iter_report_sections(rows):
+        has_sections = True
+        yield format_html(
+            "<h2>{}</h2>\n<table>\n<thead>\n<tr>{}</tr>\n</thead>\n<tbody>\n",
+            section_name,
+            format_html_join("", "<th>{}</th>", ((column,) for column in columns)),
+        )
+        for cells in section_rows:
+            yield format_html(
+                "<tr>{}</tr>\n",
+                format_html_join("", "<td>{}</td>", ((cell,) for cell in cells)),
+            )
+        yield "</tbody>\n</table>\n"
+    if not has_sections:
+        yield format_html("<p>{}</p>\n", _("This report has no data to export."))
+    yield page_end
+
+
+def get_report_file_name(*, resourceid, fingerprint, task_id, file_format):
+    """The storage name of a report file written by a task. Files are named
+    for the permission profile they were written for, so that only users
+    with that profile can download them (see ReportFileView)."""
+    return f"{REPORT_FILE_DIRECTORY}/{resourceid}_{fingerprint}_{task_id}.{file_format}"
+
+
+def get_report_file_url(*, resourceid, task_id, file_format):
+    return (
+        reverse("api_report_file", args=[resourceid])
+        + "?"
+        + urlencode({"taskid": task_id, "format": file_format})
+    )
+
+
+def delete_expired_report_files(storage):
+    """Delete report files written more than REPORT_FILE_EXPIRY ago."""
+    if not storage.exists(REPORT_FILE_DIRECTORY):
+        return
+    expired_before = timezone.now() - timedelta(seconds=REPORT_FILE_EXPIRY)
+    _directories, file_names = storage.listdir(REPORT_FILE_DIRECTORY)
+    for file_name in file_names:
+        name = f"{REPORT_FILE_DIRECTORY}/{file_name}"
+        if storage.get_modified_time(name) < expired_before:
+            storage.delete(name)
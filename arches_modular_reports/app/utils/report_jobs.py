@@ -0,0 +1,101 @@
+import logging
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from arches.app.models import models
+from arches.app.tasks import create_user_task_record
+from arches.app.utils.task_management import check_if_celery_available
+
+from arches_modular_reports.app.utils.cache_versions import make_cache_key
+from arches_modular_reports.app.utils.permission_profiles import (
+    get_permission_profile,
+)
+from arches_modular_reports.app.utils.report_snapshots import get_snapshot_key
+from arches_modular_reports.tasks import generate_report_file, generate_report_snapshot
+
+logger = logging.getLogger(__name__)
+
+# How long a job stays joinable if its task never finishes, in seconds.
+REPORT_JOB_TIMEOUT = 3600
+
+
+def start_report_file_job(
+    *, user, resourceid, report_config_slug, file_format, language
+):
+    """Queue generate_report_file() for the report, unless a job for the same
+    resource, config, format, language, and permission profile is already
+    queued or running, in which case the user joins that job. Each user
+    waiting for a job has a task record, which the job updates and notifies
+    when it finishes. Returns the job's task id."""
+    job_key = make_cache_key(
+        "report_file_job",
+        resourceid,
+        report_config_slug.lower(),
+        file_format,
+        language,
+        get_permission_profile(user).fingerprint,
+    )
+    task_id = str(uuid4())
+
+    if cache.add(job_key, task_id, REPORT_JOB_TIMEOUT):
+        create_user_task_record(task_id, generate_report_file.name, user.pk)
+        generate_report_file.apply_async(
+            args=[
+                user.pk,
+                str(resourceid),
+                report_config_slug,
+                file_format,
+                language,
+                job_key,
+            ],
+            task_id=task_id,
+        )
+        return task_id
+
+    task_id = cache.get(job_key)
+    if task_id is not None:
+        if not models.UserXTask.objects.filter(taskid=task_id, user=user).exists():
+            create_user_task_record(task_id, generate_report_file.name, user.pk)
+        # The job stops being joinable before it reads the task records to
+        # notify, so if it is still joinable, it will notify this user.
+        if cache.get(job_key) == task_id:
+            return task_id
+
+    # The job finished in the meantime; start another.
+    return start_report_file_job(
+        user=user,
+        resourceid=resourceid,
+        report_config_slug=report_config_slug,
+        file_format=file_format,
+        language=language,
+    )
+
+
+def get_report_snapshot(*, resourceid, graph_id, report_config_slug, language):
+    """Return the cached snapshot of the report for the anonymous user, or
+    None if there is none yet. On a miss, generate_report_snapshot() is
+    queued, once per snapshot, or run inline if Celery is unavailable."""
+    snapshot_key = get_snapshot_key(
+        resourceid=resourceid,
+        graph_id=graph_id,
+        report_config_slug=report_config_slug,
+        language=language,
+    )
+    if (snapshot := cache.get(snapshot_key)) is not None:
+        return snapshot or None
+
+    job_key = make_cache_key("report_snapshot_job", snapshot_key)
+    if not cache.add(job_key, True, REPORT_JOB_TIMEOUT):
+        return None
+    args = [str(resourceid), report_config_slug, language, snapshot_key]
+    if check_if_celery_available():
+        generate_report_snapshot.apply_async(args=args)
+        return None
+    try:
+        generate_report_snapshot(*args)
+    except Exception:
+        # The report is still served, just without a snapshot.
+        logger.exception("Could not build a snapshot of report %s", resourceid)
+        return None
+    return cache.get(snapshot_key) or None
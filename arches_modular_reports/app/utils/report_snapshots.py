@@ -0,0 +1,187 @@
+"""
+Snapshots of modular reports, embedded in the report page.
+
+For the anonymous user, a snapshot holds the API payloads a report requests
+while it loads, so that the report page can embed them instead of the
+browser requesting each one. Payloads are produced by calling the report API
+views in-process, so they are exactly what the client would have received.
+Other users can be sent a snapshot holding only the report's bootstrap (see
+build_bootstrap_snapshot).
+"""
+
+import json
+from collections import Counter
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.http import HttpRequest, QueryDict
+from django.urls import resolve, reverse
+
+from arches_modular_reports.app.utils.cache_versions import (
+    get_cache_version,
+    make_cache_key,
+)
+from arches_modular_reports.app.utils.report_bootstrap import build_report_bootstrap
+from arches_modular_reports.app.utils.report_export import iter_export_components
+
+# The page size of the sections' first pages, which the client adopts from
+# the snapshot so that its first requests match them.
+SNAPSHOT_ROWS_PER_PAGE = 5
+
+
+def snapshots_enabled():
+    # Snapshots are only ever read from the cache, so without one each
+    # request would build a snapshot for nothing.
+    return getattr(
+        settings, "MODULAR_REPORTS_ANONYMOUS_SNAPSHOTS", False
+    ) and not isinstance(caches["default"], DummyCache)
+
+
+def inline_bootstrap_enabled():
+    return getattr(settings, "MODULAR_REPORTS_INLINE_BOOTSTRAP", False)
+
+
+def is_anonymous_user(user):
+    return not user.is_authenticated or user.username == "anonymous"
+
+
+def get_snapshot_key(*, resourceid, graph_id, report_config_slug, language):
+    """The cache key of a snapshot, which changes whenever the resource's
+    tiles or relations, its graph or report configs, any concept, or any
+    permissions change."""
+    return make_cache_key(
+        "report_snapshot",
+        resourceid,
+        report_config_slug.lower(),
+        language,
+        get_cache_version("resource", resourceid),
+        get_cache_version("relations", resourceid),
+        get_cache_version("graph", graph_id),
+        get_cache_version("concepts", "all"),
+        get_cache_version("permissions", "all"),
+    )
+
+
+def get_api_payload(user, url_name, args, params=None):
+    """Call a report API view as the given user and return its JSON payload,
+    or None if the view did not respond with 200 OK."""
+    path = reverse(url_name, args=args)
+    request = HttpRequest()
+    request.method = "GET"
+    request.path = request.path_info = path
+    request.user = user
+    request.GET = QueryDict(urlencode(params or {}, doseq=True))
+    request.resolver_match = match = resolve(path)
+
+    response = match.func(request, *match.args, **match.kwargs)
+    if response.status_code != HTTPStatus.OK:
+        return None
+    return json.loads(response.content)
+
+
+def get_first_page_params(config):
+    """The parameters a section requests its first page with."""
+    return {
+        "rows_per_page": SNAPSHOT_ROWS_PER_PAGE,
+        "page": 1,
+        "direction": "asc",
+        "query": "",
+        "include_next_page": str(bool(config.get("prefetch_next_page"))).lower(),
+    }
+
+
+def build_report_snapshot(*, resourceid, report_config_slug):
+    """Request the report's bootstrap, related resource counts, and the first
+    page of each of its data and related resources sections as the anonymous
+    user. Returns None if the anonymous user cannot read the report."""
+    user = User.objects.get(username="anonymous")
+    resourceid = str(resourceid)
+    bootstrap = get_api_payload(
+        user,
+        "api_report_bootstrap",
+        [resourceid],
+        {"report_config_slug": report_config_slug},
+    )
+    if bootstrap is None:
+        return None
+
+    snapshot = {
+        "resourceid": resourceid,
+        "report_config_slug": report_config_slug,
+        "rows_per_page": SNAPSHOT_ROWS_PER_PAGE,
+        "bootstrap": bootstrap,
+        "related_resource_counts": get_api_payload(
+            user, "api_related_resource_counts", [resourceid]
+        ),
+        "nodegroup_tile_data": {},
+        "related_resources": {},
+    }
+
+    components = [
+        (component_name, config)
+        for _section_name, component_name, config in iter_export_components(
+            bootstrap["config"].get("components", [])
+        )
+    ]
+    # Sections sharing a nodegroup or graph can request different first
+    # pages, e.g. with other filters, so those are left to the client.
+    section_keys = Counter(
+        config.get("nodegroup_alias") or config.get("graph_slug")
+        for _component_name, config in components
+    )
+
+    for component_name, config in components:
+        match component_name:
+            case "DataSection":
+                alias = config["nodegroup_alias"]
+                if section_keys[alias] > 1:
+                    continue
+                snapshot["nodegroup_tile_data"][alias] = get_api_payload(
+                    user,
+                    "api_nodegroup_tile_data",
+                    [resourceid, alias],
+                    {
+                        **get_first_page_params(config),
+                        "sort_node_id": "",
+                        "filters": json.dumps(config.get("filters") or []),
+                    },
+                )
+            case "RelatedResourcesSection":
+                graph_slug = config["graph_slug"]
+                if section_keys[graph_slug] > 1:
+                    continue
+                snapshot["related_resources"][graph_slug] = get_api_payload(
+                    user,
+                    "api_related_resources",
+                    [resourceid, graph_slug],
+                    {
+                        **get_first_page_params(config),
+                        "node_aliases": ",".join(config.get("node_aliases", [])),
+                        "sort_field": "@relation_name",
+                    },
+                )
+
+    return snapshot
+
+
+def build_bootstrap_snapshot(*, user, resourceid, report_config_slug, language):
+    """A snapshot holding only the report's bootstrap for the user, so that
+    the client requests the remaining payloads itself."""
+    return {
+        "resourceid": str(resourceid),
+        "report_config_slug": report_config_slug,
+        "rows_per_page": SNAPSHOT_ROWS_PER_PAGE,
+        "bootstrap": build_report_bootstrap(
+            user=user,
+            resourceid=resourceid,
+            report_config_slug=report_config_slug,
+            user_language=language,
+        ),
+        "related_resource_counts": None,
+        "nodegroup_tile_data": {},
+        "related_resources": {},
+    }
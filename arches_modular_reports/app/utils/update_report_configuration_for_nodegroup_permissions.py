@@ -100,15 +100,7 @@ def update_report_configuration_with_nodegroup_permissions(
     return filter_node(copy_of_report_configuration)
 
 
-def update_report_configuration_for_nodegroup_permissions(
-    report_configuration_instance, user
-):
-    graph_nodegroup_ids = {
-        node.nodegroup.pk
-        for node in report_configuration_instance.graph.node_set.all()
-        if node.nodegroup
-    }
-
+def get_report_nodegroup_permissions(graph_nodegroup_ids, user):
     report_nodegroup_ids_with_user_read_permission = set()
     report_nodegroup_ids_with_user_write_permission = set()
 
@@ -132,6 +124,26 @@ def update_report_configuration_for_nodegroup_permissions(
         if "write_nodegroup" in permissions:
             report_nodegroup_ids_with_user_write_permission.add(nodegroup.pk)
 
+    return (
+        report_nodegroup_ids_with_user_read_permission,
+        report_nodegroup_ids_with_user_write_permission,
+    )
+
+
+def update_report_configuration_for_nodegroup_permissions(
+    report_configuration_instance, user
+):
+    graph_nodegroup_ids = {
+        node.nodegroup.pk
+        for node in report_configuration_instance.graph.node_set.all()
+        if node.nodegroup
+    }
+
+    (
+        report_nodegroup_ids_with_user_read_permission,
+        report_nodegroup_ids_with_user_write_permission,
+    ) = get_report_nodegroup_permissions(graph_nodegroup_ids, user)
+
     return update_report_configuration_with_nodegroup_permissions(
         report_configuration_instance=report_configuration_instance,
         report_nodegroup_ids_with_user_read_permission=report_nodegroup_ids_with_user_read_permission,
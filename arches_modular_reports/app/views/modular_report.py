@@ -1,9 +1,11 @@
 import json
+import logging
 from http import HTTPStatus
+from uuid import UUID
 
-from django.core.paginator import Paginator
+from django.core.files.storage import default_storage
 from django.db.models import Q
-from django.http import Http404
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils import translation
@@ -12,38 +14,93 @@ from django.utils.translation import get_language, get_language_info, gettext as
 from django.views.generic import View
 
 from arches import __version__ as _arches_version_str
-from arches.app.datatypes.concept_types import BaseConceptDataType
 from arches.app.models import models
 from arches.app.utils.betterJSONSerializer import JSONSerializer, JSONDeserializer
 from arches.app.utils.decorators import can_read_resource_instance
-from arches.app.utils.permission_backend import get_nodegroups_by_perm, group_required
-from arches.app.utils.response import JSONErrorResponse, JSONResponse
+from arches.app.utils.response import JSONErrorResponse
+from arches.app.utils.task_management import check_if_celery_available
 from arches.app.views.api import APIBase
 from arches.app.views.base import MapBaseManagerView
 from arches.app.views.resource import ResourceReportView
 
 from arches_modular_reports.app.utils.decorators import can_read_nodegroup
 from arches_modular_reports.app.utils.get_report_config import get_report_config
+from arches_modular_reports.app.utils.instrumentation import (
+    InstrumentedJSONResponse,
+    instrument_view,
+)
+from arches_modular_reports.app.utils.node_presentation import get_node_presentation
+from arches_modular_reports.app.utils.permission_profiles import (
+    get_permission_profile,
+)
+from arches_modular_reports.app.utils.relation_counts import (
+    get_relation_count,
+    get_relation_counts,
+)
+from arches_modular_reports.app.utils.report_bootstrap import build_report_bootstrap
+from arches_modular_reports.app.utils.report_config_cache import (
+    get_permitted_report_config,
+)
+from arches_modular_reports.app.utils.report_etags import (
+    conditional_report_response,
+    get_report_bootstrap_etag,
+)
+from arches_modular_reports.app.utils.report_export import (
+    EXPORT_FORMATS,
+    get_report_file_name,
+    iter_report_rows,
+    stream_csv,
+    stream_ndjson,
+)
+from arches_modular_reports.app.utils.report_jobs import (
+    get_report_snapshot,
+    start_report_file_job,
+)
+from arches_modular_reports.app.utils.report_snapshots import (
+    build_bootstrap_snapshot,
+    inline_bootstrap_enabled,
+    is_anonymous_user,
+    snapshots_enabled,
+)
 from arches_modular_reports.models import ReportConfig
+from arches_modular_reports.tasks import REPORT_FILE_FORMATS
 from packaging.version import Version
 
 arches_version = Version(_arches_version_str)
 
-from arches_modular_reports.app.utils.update_report_configuration_for_nodegroup_permissions import (
-    update_report_configuration_for_nodegroup_permissions,
-)
-
 from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
-    annotate_node_values,
     annotate_related_graph_nodes_with_widget_labels,
-    array_from_string,
+    attach_related_node_values,
     build_valueid_annotation,
+    get_relation_display_pairs,
     get_sorted_filtered_relations,
     get_sorted_filtered_tiles,
+    get_unfiltered_tiles,
+    paginate_by_cursor,
+    PrefetchPaginator,
     prepare_links,
+    serialize_node_tile_data,
+    UnfilteredTilePaginator,
 )
 
+logger = logging.getLogger(__name__)
+
+MAX_ROWS_PER_PAGE = 100
+
+
+def get_rows_per_page(request):
+    """The requested page size, or None if it is not a number of rows from 1
+    to MAX_ROWS_PER_PAGE."""
+    try:
+        rows_per_page = int(request.GET.get("rows_per_page", 10))
+    except ValueError:
+        return None
+    if not 1 <= rows_per_page <= MAX_ROWS_PER_PAGE:
+        return None
+    return rows_per_page
+
 
+@method_decorator(instrument_view, name="dispatch")
 class GraphSlugFromIdView(APIBase):
     def get(self, request, graphid):
         try:
@@ -53,26 +110,26 @@ class GraphSlugFromIdView(APIBase):
         except models.GraphModel.DoesNotExist:
             return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
 
-        return JSONResponse({"graph_slug": graph})
+        return InstrumentedJSONResponse({"graph_slug": graph})
 
 
+@method_decorator(instrument_view, name="dispatch")
 @method_decorator(can_read_resource_instance, name="dispatch")
+@method_decorator(conditional_report_response(), name="dispatch")
 class ModularReportConfigView(View):
     def get(self, request):
         try:
             resourceid = request.GET.get("resourceId")
             report_config_slug = request.GET.get("report_config_slug", "default")
-            config_instance = get_report_config(resourceid, report_config_slug)
+            filtered_config = get_permitted_report_config(
+                resourceid, report_config_slug, request.user
+            )
         except ReportConfig.DoesNotExist:
             return JSONErrorResponse(
                 _("No report config found."), status=HTTPStatus.NOT_FOUND
             )
 
-        return JSONResponse(
-            update_report_configuration_for_nodegroup_permissions(
-                config_instance, request.user
-            )
-        )
+        return InstrumentedJSONResponse(filtered_config)
 
 
 @method_decorator(can_read_resource_instance, name="dispatch")
@@ -99,6 +156,28 @@ class ModularReportAwareResourceReportView(ResourceReportView):
             except:
                 report_theme = None
 
+            report_snapshot = None
+            if snapshots_enabled() and is_anonymous_user(request.user):
+                report_snapshot = get_report_snapshot(
+                    resourceid=resourceid,
+                    graph_id=graph.pk,
+                    report_config_slug=report_config_slug,
+                    language=translation.get_language(),
+                )
+            if report_snapshot is None and inline_bootstrap_enabled():
+                try:
+                    report_snapshot = build_bootstrap_snapshot(
+                        user=request.user,
+                        resourceid=resourceid,
+                        report_config_slug=report_config_slug,
+                        language=translation.get_language(),
+                    )
+                except Exception:
+                    # The client requests the bootstrap itself instead.
+                    logger.exception(
+                        "Could not build the bootstrap of report %s", resourceid
+                    )
+
             template = "views/resource/modular_report.htm"
             # Skip a few queries by jumping over the MapBaseManagerView
             # and calling its parent. This report doesn't use a map.
@@ -111,6 +190,7 @@ class ModularReportAwareResourceReportView(ResourceReportView):
                 # To the extent possible, avoid DB queries needed for KO
                 report_templates=[graph.template],
                 report_config_slug=report_config_slug,
+                report_snapshot=report_snapshot,
                 card_components=models.CardComponent.objects.none(),
                 widgets=models.Widget.objects.none(),
                 map_markers=models.MapMarker.objects.none(),
@@ -144,6 +224,7 @@ class ModularReportAwareResourceReportView(ResourceReportView):
         return render(request, template, context)
 
 
+@method_decorator(instrument_view, name="dispatch")
 @method_decorator(can_read_resource_instance, name="dispatch")
 class RelatedResourceView(APIBase):
     def get(self, request, resourceid, related_graph_slug):
@@ -158,20 +239,28 @@ class RelatedResourceView(APIBase):
 
         additional_nodes = request.GET.get("node_aliases", "").split(",")
         page_number = request.GET.get("page", 1)
-        rows_per_page = request.GET.get("rows_per_page", 10)
+        rows_per_page = get_rows_per_page(request)
+        if rows_per_page is None:
+            return JSONErrorResponse(
+                _("Invalid rows per page."), status=HTTPStatus.BAD_REQUEST
+            )
         sort_field = request.GET.get("sort_field", "@relation_name")
         direction = request.GET.get("direction", "asc")
         query = request.GET.get("query", "")
         request_language = translation.get_language()
 
-        permitted_nodegroups = get_nodegroups_by_perm(
-            request.user, "models.read_nodegroup"
-        )
-        is_user_rdm_admin = group_required(request.user, "RDM Administrator")
+        profile = get_permission_profile(request.user)
+        permitted_nodegroups = profile.readable_nodegroup_ids
+        is_user_rdm_admin = profile.is_rdm_admin
 
         nodes = annotate_related_graph_nodes_with_widget_labels(
             additional_nodes, related_graph, request_language
         )
+        # Unless node values are searched or sorted on, only fetch them for
+        # the relations on the page(s) returned.
+        attach_values_after_paging = not query and sort_field not in {
+            node.alias for node in nodes
+        }
         relations = get_sorted_filtered_relations(
             resource=resource,
             related_graph=related_graph,
@@ -181,9 +270,28 @@ class RelatedResourceView(APIBase):
             direction=direction,
             query=query,
             request_language=request_language,
+            include_node_values=not attach_values_after_paging,
         )
-        paginator = Paginator(relations, rows_per_page)
-        result_page = paginator.get_page(page_number)
+        if query:
+            count = None
+        else:
+            count = get_relation_count(
+                resource=resource,
+                related_graph=related_graph,
+                permitted_nodegroups=permitted_nodegroups,
+            )
+        paginator = PrefetchPaginator(relations, rows_per_page, count=count)
+        if request.GET.get("include_next_page") == "true":
+            result_page, next_page = paginator.get_page_and_next(page_number)
+        else:
+            result_page, next_page = paginator.get_page(page_number), None
+        if attach_values_after_paging:
+            attach_related_node_values(
+                [*result_page, *(next_page or [])],
+                nodes=nodes,
+                permitted_nodegroups=permitted_nodegroups,
+                request_language=request_language,
+            )
 
         def make_resource_report_link(relation):
             nonlocal resourceid
@@ -200,160 +308,105 @@ class RelatedResourceView(APIBase):
                     target = relation.from_resource_id
             return reverse("resource_report", args=[target])
 
-        value_finder = BaseConceptDataType()  # fetches serially, but caches.
+        def serialize_relation(relation):
+            return {
+                "@relation_name": {
+                    "display_value": getattr(relation, "@relation_name"),
+                    "links": [],
+                },
+                "@display_name": {
+                    "display_value": getattr(relation, "@display_name"),
+                    "links": [
+                        {
+                            "label": getattr(relation, "@display_name"),
+                            "link": make_resource_report_link(relation),
+                        }
+                    ],
+                },
+                **{
+                    node.alias: {
+                        "display_value": getattr(relation, node.alias),
+                        "links": prepare_links(
+                            node=node,
+                            tile_values=getattr(
+                                relation, node.alias + "_instance_details", []
+                            ),
+                            display_pairs=get_relation_display_pairs(relation, node),
+                            request_language=request_language,
+                            is_user_rdm_admin=is_user_rdm_admin,
+                        ),
+                    }
+                    for node in nodes
+                },
+            }
 
         response_data = {
-            "results": [
-                {
-                    "@relation_name": {
-                        "display_value": getattr(relation, "@relation_name"),
-                        "links": [],
-                    },
-                    "@display_name": {
-                        "display_value": getattr(relation, "@display_name"),
-                        "links": [
-                            {
-                                "label": getattr(relation, "@display_name"),
-                                "link": make_resource_report_link(relation),
-                            }
-                        ],
-                    },
-                    **{
-                        node.alias: {
-                            "display_value": getattr(relation, node.alias),
-                            "links": prepare_links(
-                                node=node,
-                                tile_values=getattr(
-                                    relation, node.alias + "_instance_details", []
-                                ),
-                                node_display_value=getattr(relation, node.alias),
-                                request_language=request_language,
-                                value_finder=value_finder,
-                                is_user_rdm_admin=is_user_rdm_admin,
-                            ),
-                        }
-                        for node in nodes
-                    },
-                }
-                for relation in result_page
-            ],
+            "results": [serialize_relation(relation) for relation in result_page],
             "graph_name": related_graph.name,
             "widget_labels": {node.alias: node.widget_label for node in nodes},
             "total_count": paginator.count,
             "page": result_page.number,
         }
+        if next_page:
+            response_data["next_page"] = {
+                "results": [serialize_relation(relation) for relation in next_page],
+                "page": next_page.number,
+            }
+
+        return InstrumentedJSONResponse(response_data)
+
+
+@method_decorator(instrument_view, name="dispatch")
+@method_decorator(can_read_resource_instance, name="dispatch")
+class RelatedResourceCountsView(APIBase):
+    def get(self, request, resourceid):
+        try:
+            resource = models.ResourceInstance.objects.get(pk=resourceid)
+        except models.ResourceInstance.DoesNotExist:
+            return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
 
-        return JSONResponse(response_data)
+        permitted_nodegroups = get_permission_profile(
+            request.user
+        ).readable_nodegroup_ids
+        return InstrumentedJSONResponse(
+            {
+                "counts": get_relation_counts(
+                    resource=resource, permitted_nodegroups=permitted_nodegroups
+                )
+            }
+        )
 
 
+@method_decorator(instrument_view, name="dispatch")
 class NodePresentationView(APIBase):
     @method_decorator(can_read_resource_instance, name="dispatch")
+    @method_decorator(conditional_report_response())
     def get(self, request, resourceid):
         try:
             graph = models.GraphModel.objects.filter(resourceinstance=resourceid).get()
         except models.GraphModel.DoesNotExist:
             return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
-        permitted_nodegroups = get_nodegroups_by_perm(
-            request.user, "models.read_nodegroup"
-        )
-        nodes = (
-            models.Node.objects.filter(graph=graph)
-            .filter(nodegroup__in=permitted_nodegroups)
-            .select_related("nodegroup")
-            .prefetch_related(
-                "nodegroup__cardmodel_set",
-                "cardxnodexwidget_set__widget",
-            )
-        )
-
-        def getattr_from_queryset(queryset, attr, fallback):
-            if queryset:
-                return getattr(queryset[0], attr, fallback)
-            return fallback
-
-        def get_widget_name(queryset, fallback):
-            if queryset and queryset[0].widget:
-                return getattr(queryset[0].widget, "name", fallback)
-            return fallback
-
-        def get_widget_format(queryset, fallback=None):
-            if fallback is None:
-                fallback = {"format": "", "prefix": {}, "suffix": {}}
-            if queryset and queryset[0].widget:
-                if getattr(queryset[0].widget, "name", None) != "number-widget":
-                    return fallback
-                config = getattr(queryset[0], "config", None)
-                if config:
-                    ret = {
-                        "format": config.get("format", fallback),
-                        "prefix": config.get("prefix", fallback),
-                        "suffix": config.get("suffix", fallback),
-                    }
-                    return ret
-            return fallback
+        permitted_nodegroups = get_permission_profile(
+            request.user
+        ).readable_nodegroup_ids
 
-        def get_node_visibility(node):
-            if node.pk == node.nodegroup.pk and node.nodegroup.cardmodel_set.all():
-                return node.nodegroup.cardmodel_set.all()[0].visible
-            if node.cardxnodexwidget_set.all():
-                return node.cardxnodexwidget_set.all()[0].visible
-            return True
-
-        return JSONResponse(
-            {
-                node.alias: {
-                    "nodeid": node.nodeid,
-                    "name": node.name,
-                    "card_name": getattr_from_queryset(
-                        node.nodegroup.cardmodel_set.all(),
-                        "name",
-                        "",
-                    ),
-                    "card_order": getattr_from_queryset(
-                        node.nodegroup.cardmodel_set.all(),
-                        "sortorder",
-                        0,
-                    ),
-                    "card_visible": getattr_from_queryset(
-                        node.nodegroup.cardmodel_set.all(),
-                        "visible",
-                        True,
-                    ),
-                    "widget_label": getattr_from_queryset(
-                        node.cardxnodexwidget_set.all(),
-                        "label",
-                        node.name.replace("_", " ").title(),
-                    ),
-                    "widget_order": getattr_from_queryset(
-                        node.cardxnodexwidget_set.all(),
-                        "sortorder",
-                        0,
-                    ),
-                    "visible": get_node_visibility(node),
-                    "nodegroup": {
-                        "nodegroup_id": node.nodegroup.pk,
-                        "cardinality": node.nodegroup.cardinality,
-                    },
-                    "is_rich_text": get_widget_name(
-                        node.cardxnodexwidget_set.all(), None
-                    )
-                    == "rich-text-widget",
-                    "is_required": node.isrequired,
-                    "is_numeric": get_widget_name(node.cardxnodexwidget_set.all(), None)
-                    == "number-widget",
-                    "number_format": get_widget_format(node.cardxnodexwidget_set.all()),
-                }
-                for node in nodes
-            }
+        return InstrumentedJSONResponse(
+            get_node_presentation(graph, permitted_nodegroups)
         )
 
 
+@method_decorator(instrument_view, name="dispatch")
 @method_decorator(can_read_resource_instance, name="dispatch")
 @method_decorator(can_read_nodegroup, name="dispatch")
+@method_decorator(conditional_report_response(), name="dispatch")
 class NodegroupTileDataView(APIBase):
     def get(self, request, resourceid, nodegroup_alias):
         page_number = request.GET.get("page")
-        rows_per_page = request.GET.get("rows_per_page")
+        rows_per_page = get_rows_per_page(request)
+        if rows_per_page is None:
+            return JSONErrorResponse(
+                _("Invalid rows per page."), status=HTTPStatus.BAD_REQUEST
+            )
         filters = request.GET.get("filters", None)
         query = request.GET.get("query")
         sort_node_id = request.GET.get("sort_node_id")
@@ -363,7 +416,8 @@ class NodegroupTileDataView(APIBase):
 
         user_language = translation.get_language()
 
-        is_user_rdm_admin = group_required(request.user, "RDM Administrator")
+        profile = get_permission_profile(request.user)
+        is_user_rdm_admin = profile.is_rdm_admin
 
         tiles = get_sorted_filtered_tiles(
             resourceinstanceid=resourceid,
@@ -374,83 +428,243 @@ class NodegroupTileDataView(APIBase):
             user_language=user_language,
             user=request.user,
             filters=filters,
+            permitted_nodegroups=profile.readable_nodegroup_ids,
         )
 
-        paginator = Paginator(tiles, rows_per_page)
-        page = paginator.page(page_number)
+        # Without a query or filter, count plain tile rows rather than the
+        # annotated queryset (unless there are no readable nodes at all).
+        if query or filters or tiles.query.is_empty():
+            unfiltered_tiles = None
+        else:
+            unfiltered_tiles = get_unfiltered_tiles(
+                resourceinstanceid=resourceid, nodegroup_alias=nodegroup_alias
+            )
 
-        response_data = {
-            "results": [
+        def serialize_tile(tile):
+            return {
+                **{
+                    key: build_valueid_annotation(
+                        value, is_user_rdm_admin, user_language
+                    )
+                    for key, value in tile.alias_annotations.items()
+                },
+                "@has_children": tile.has_children,
+                "@tile_id": tile.tileid,
+            }
+
+        if request.GET.get("pagination") == "cursor":
+            try:
+                rows, next_cursor, previous_cursor = paginate_by_cursor(
+                    tiles, rows_per_page, request.GET.get("cursor")
+                )
+            except ValueError:
+                return JSONErrorResponse(
+                    _("Invalid pagination cursor."), status=HTTPStatus.BAD_REQUEST
+                )
+            if request.GET.get("include_total") == "true":
+                total_count = (
+                    tiles if unfiltered_tiles is None else unfiltered_tiles
+                ).count()
+            else:
+                total_count = None
+            return InstrumentedJSONResponse(
                 {
-                    **{
-                        key: build_valueid_annotation(
-                            value, is_user_rdm_admin, user_language
-                        )
-                        for key, value in tile.alias_annotations.items()
-                    },
-                    "@has_children": tile.has_children,
-                    "@tile_id": tile.tileid,
+                    "results": [serialize_tile(tile) for tile in rows],
+                    "next_cursor": next_cursor,
+                    "previous_cursor": previous_cursor,
+                    "total_count": total_count,
                 }
-                for tile in page.object_list
-            ],
+            )
+
+        if unfiltered_tiles is None:
+            paginator = PrefetchPaginator(tiles, rows_per_page)
+        else:
+            paginator = UnfilteredTilePaginator(
+                tiles, rows_per_page, unfiltered_tiles=unfiltered_tiles
+            )
+        # Clients prefetching the next page can get it in the same response,
+        # so the annotated query runs once per pair of pages.
+        if request.GET.get("include_next_page") == "true":
+            page, next_page = paginator.get_page_and_next(page_number)
+        else:
+            page, next_page = paginator.page(page_number), None
+
+        response_data = {
+            "results": [serialize_tile(tile) for tile in page.object_list],
             "total_count": paginator.count,
             "page": page.number,
         }
+        if next_page:
+            response_data["next_page"] = {
+                "results": [serialize_tile(tile) for tile in next_page.object_list],
+                "page": next_page.number,
+            }
 
-        return JSONResponse(response_data)
+        return InstrumentedJSONResponse(response_data)
 
 
+@method_decorator(instrument_view, name="dispatch")
 @method_decorator(can_read_resource_instance, name="dispatch")
+@method_decorator(conditional_report_response(), name="dispatch")
 class NodeTileDataView(APIBase):
     def get(self, request, resourceid):
-        permitted_nodegroups = get_nodegroups_by_perm(request.user, "read_nodegroup")
+        profile = get_permission_profile(request.user)
         node_aliases = request.GET.getlist("node_alias", [])
         user_lang = translation.get_language()
         tile_limit = int(request.GET.get("tile_limit", 0))
 
-        is_user_rdm_admin = group_required(request.user, "RDM Administrator")
+        return InstrumentedJSONResponse(
+            serialize_node_tile_data(
+                node_aliases,
+                resourceid,
+                profile.readable_nodegroup_ids,
+                user_lang,
+                tile_limit,
+                profile.is_rdm_admin,
+            )
+        )
+
+
+@method_decorator(instrument_view, name="dispatch")
+@method_decorator(can_read_resource_instance, name="dispatch")
+@method_decorator(
+    conditional_report_response(get_report_bootstrap_etag), name="dispatch"
+)
+class ReportBootstrapView(APIBase):
+    def get(self, request, resourceid):
+        report_config_slug = request.GET.get("report_config_slug", "default")
+        try:
+            bootstrap = build_report_bootstrap(
+                user=request.user,
+                resourceid=resourceid,
+                report_config_slug=report_config_slug,
+                user_language=translation.get_language(),
+            )
+        except models.GraphModel.DoesNotExist:
+            return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
+        except ReportConfig.DoesNotExist:
+            return JSONErrorResponse(
+                _("No report config found."), status=HTTPStatus.NOT_FOUND
+            )
+
+        return InstrumentedJSONResponse(bootstrap)
+
 
-        nodes_with_display_data = annotate_node_values(
-            node_aliases, resourceid, permitted_nodegroups, user_lang, tile_limit
+@method_decorator(instrument_view, name="dispatch")
+@method_decorator(can_read_resource_instance, name="dispatch")
+class ReportExportView(APIBase):
+    def get(self, request, resourceid):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return JSONErrorResponse(
+                _("Unsupported export format."), status=HTTPStatus.BAD_REQUEST
+            )
+        report_config_slug = request.GET.get("report_config_slug", "default")
+        try:
+            resource = models.ResourceInstance.objects.select_related("graph").get(
+                pk=resourceid
+            )
+            config = get_permitted_report_config(
+                resourceid, report_config_slug, request.user
+            )
+        except models.ResourceInstance.DoesNotExist:
+            return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
+        except ReportConfig.DoesNotExist:
+            return JSONErrorResponse(
+                _("No report config found."), status=HTTPStatus.NOT_FOUND
+            )
+
+        rows = iter_report_rows(
+            resource=resource,
+            config=config,
+            user=request.user,
+            profile=get_permission_profile(request.user),
+            language=translation.get_language(),
         )
-        value_finder = BaseConceptDataType()
+        stream = stream_csv if export_format == "csv" else stream_ndjson
+        response = StreamingHttpResponse(
+            stream(rows), content_type=EXPORT_FORMATS[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{resourceid}.{export_format}"'
+        )
+        return response
+
+
+@method_decorator(instrument_view, name="dispatch")
+@method_decorator(can_read_resource_instance, name="dispatch")
+class ReportFileView(APIBase):
+    def get(self, request, resourceid):
+        file_format = request.GET.get("format")
+        try:
+            task_id = UUID(request.GET.get("taskid", ""))
+        except ValueError:
+            return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
+        if file_format not in REPORT_FILE_FORMATS:
+            return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
 
-        return JSONResponse(
+        # Only files written for the user's permission profile are found.
+        file_name = get_report_file_name(
+            resourceid=resourceid,
+            fingerprint=get_permission_profile(request.user).fingerprint,
+            task_id=task_id,
+            file_format=file_format,
+        )
+        if not default_storage.exists(file_name):
+            return JSONErrorResponse(status=HTTPStatus.NOT_FOUND)
+        return FileResponse(
+            default_storage.open(file_name),
+            as_attachment=True,
+            filename=f"{resourceid}.{file_format}",
+        )
+
+    def post(self, request, resourceid):
+        file_format = request.POST.get("format", "json")
+        if file_format not in REPORT_FILE_FORMATS:
+            return JSONErrorResponse(
+                _("Unsupported export format."), status=HTTPStatus.BAD_REQUEST
+            )
+        if not check_if_celery_available():
+            return JSONErrorResponse(
+                _("Background exports are not available."),
+                status=HTTPStatus.SERVICE_UNAVAILABLE,
+            )
+
+        task_id = start_report_file_job(
+            user=request.user,
+            resourceid=resourceid,
+            report_config_slug=request.POST.get("report_config_slug", "default"),
+            file_format=file_format,
+            language=translation.get_language(),
+        )
+        return InstrumentedJSONResponse(
             {
-                node.alias: [
-                    {
-                        "display_values": array_from_string(
-                            display_object["display_value"]
-                        ),
-                        "links": prepare_links(
-                            node,
-                            [display_object["tile_value"]],
-                            display_object["display_value"],
-                            user_lang,
-                            value_finder,
-                            is_user_rdm_admin,
-                        ),
-                    }
-                    for display_object in node.display_data
-                ]
-                for node in nodes_with_display_data
-            }
+                "taskid": task_id,
+                "message": _(
+                    "Your report is being exported. You will be notified when it is ready to download."
+                ),
+            },
+            status=HTTPStatus.ACCEPTED,
         )
 
 
+@method_decorator(instrument_view, name="dispatch")
 class UserPermissionsView(APIBase):
     def get(self, request):
         reqested_permissions = json.loads(request.GET.get("permissions", "[]"))
         user_permissions = {}
         for permission in reqested_permissions:
             if permission == "RDM Administrator":
-                user_permissions[permission] = group_required(request.user, permission)
-        return JSONResponse(user_permissions)
+                user_permissions[permission] = get_permission_profile(
+                    request.user
+                ).is_rdm_admin
+        return InstrumentedJSONResponse(user_permissions)
 
 
+@method_decorator(instrument_view, name="dispatch")
 class LanguageSettingsView(APIBase):
     def get(self, request):
-        return JSONResponse(
+        return InstrumentedJSONResponse(
             {
                 "language": get_language(),
                 "language_dir": (
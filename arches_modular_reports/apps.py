@@ -11,6 +11,7 @@ class ArchesModularReportsConfig(AppConfig):
         # Django models cannot be imported at module level in AppConfig subclasses.
         from arches_modular_reports.config_generator_registry import register
         from arches_modular_reports.models import ReportConfig
+        from arches_modular_reports import signals  # connects signal receivers
 
         def _default_factory(graph):
             rc = ReportConfig(graph=graph)
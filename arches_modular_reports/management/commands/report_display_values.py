@@ -0,0 +1,87 @@
+from arches.app.models import models
+from arches_modular_reports.app.utils.display_values import (
+    refresh_tile_display_values,
+)
+from arches_modular_reports.models import TileDisplayValue
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Commands for managing materialized tile display values
+    (see MODULAR_REPORTS_MATERIALIZE_DISPLAY_VALUES)
+
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "operation",
+            choices=["rebuild", "clear"],
+            help='"rebuild" (recompute stored display values) or "clear".',
+        )
+
+        parser.add_argument(
+            "-g",
+            "--graph",
+            action="store",
+            dest="graph",
+            default="all",
+            help='Graph slug to operate on. Defaults to "all".',
+        )
+
+        parser.add_argument(
+            "-b",
+            "--batch-size",
+            action="store",
+            dest="batch_size",
+            type=int,
+            default=500,
+            help="Number of tiles to recompute per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        graph_slug = options["graph"]
+
+        # Rebuilding replaces the stored values batch by batch, so reports
+        # keep reading the previous values until each batch is committed.
+        if options["operation"] == "rebuild":
+            self.rebuild_display_values(
+                graph_slug=graph_slug, batch_size=options["batch_size"]
+            )
+        else:
+            self.clear_display_values(graph_slug=graph_slug)
+
+    def get_display_values(self, graph_slug=None):
+        display_values = TileDisplayValue.objects.all()
+        if graph_slug and graph_slug != "all":
+            display_values = display_values.filter(node__graph__slug=graph_slug)
+        return display_values
+
+    def clear_display_values(self, graph_slug=None):
+        self.get_display_values(graph_slug).delete()
+
+    def rebuild_display_values(self, graph_slug=None, batch_size=500):
+        tiles = models.TileModel.objects.order_by()
+        if graph_slug and graph_slug != "all":
+            tiles = tiles.filter(resourceinstance__graph__slug=graph_slug)
+
+        batch = []
+        count = 0
+        for tile_id in tiles.values_list("pk", flat=True).iterator(
+            chunk_size=batch_size
+        ):
+            batch.append(tile_id)
+            if len(batch) == batch_size:
+                refresh_tile_display_values(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            refresh_tile_display_values(batch)
+            count += len(batch)
+
+        # Values of tiles deleted without signals
+        self.get_display_values(graph_slug).exclude(
+            tile_id__in=models.TileModel.objects.values("pk")
+        ).delete()
+
+        self.stdout.write(f"Rebuilt display values for {count} tile(s).")
@@ -34,7 +34,18 @@ ko.components.register('modular-report', {
             graphSlug = data.graph_slug;
         }
 
-        createVueApplication(ModularReport, ModularReportTheme, { graphSlug, resourceInstanceId, reportConfigSlug }).then(vueApp => {
+        // Embedded in the report page when enabled (see
+        // MODULAR_REPORTS_ANONYMOUS_SNAPSHOTS and MODULAR_REPORTS_INLINE_BOOTSTRAP).
+        const snapshotElement = document.getElementById('modular-report-snapshot');
+        let reportSnapshot = snapshotElement && JSON.parse(snapshotElement.textContent);
+        if (
+            reportSnapshot?.resourceid !== resourceInstanceId ||
+            reportSnapshot?.report_config_slug !== reportConfigSlug
+        ) {
+            reportSnapshot = undefined;
+        }
+
+        createVueApplication(ModularReport, ModularReportTheme, { graphSlug, resourceInstanceId, reportConfigSlug, reportSnapshot }).then(vueApp => {
             // handles the Graph Designer case of multiple mounting points on the same page
             const mountingPoints = document.querySelectorAll('.modular-report-mounting-point');
             const mountingPoint = mountingPoints[mountingPoints.length - 1];
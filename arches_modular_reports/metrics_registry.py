@@ -0,0 +1,40 @@
+"""
+Registry for report API metrics callbacks.
+
+When MODULAR_REPORTS_INSTRUMENTATION is enabled, every modular report API
+request is measured, and each registered callback is called with the request
+and a ViewMetrics (see app/utils/instrumentation.py) holding the view name,
+query count, database time, serialization time, total time and response size.
+
+Usage (e.g. in another package's AppConfig.ready()):
+
+    from arches_modular_reports.metrics_registry import register
+    register("statsd", lambda request, metrics: statsd.timing(
+        f"modular_reports.{metrics.view_name}", metrics.total_time * 1000
+    ))
+"""
+
+from collections.abc import Callable
+
+_registry: dict[str, Callable] = {}
+
+
+def register(name: str, callback) -> None:
+    """Register a metrics callback under a given name.
+
+    Args:
+        name: A name for the callback, so it can be replaced or unregistered.
+        callback: A callable that accepts an HttpRequest and a ViewMetrics.
+                  Exceptions it raises are logged, not propagated.
+    """
+    _registry[name] = callback
+
+
+def unregister(name: str) -> None:
+    """Remove a registered callback, if present."""
+    _registry.pop(name, None)
+
+
+def get_all() -> dict:
+    """Return a copy of all registered name -> callback mappings."""
+    return dict(_registry)
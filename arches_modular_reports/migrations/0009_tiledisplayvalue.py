@@ -0,0 +1,54 @@
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_modular_reports", "0008_update_nodevalue_db_call"),
+        ("models", "11499_add_editlog_resourceinstance_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TileDisplayValue",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("language", models.TextField()),
+                ("display_value", models.TextField(null=True)),
+                ("value_ids", models.TextField(null=True)),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(null=True),
+                ),
+                (
+                    "node",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="models.node",
+                    ),
+                ),
+                (
+                    "tile",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="models.tilemodel",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "arches_modular_report_tile_display_value",
+                "managed": True,
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("tile", "node", "language"),
+                        name="unique_tile_node_language",
+                    )
+                ],
+            },
+        ),
+    ]
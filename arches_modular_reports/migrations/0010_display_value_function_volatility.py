@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# These functions only read from the database, so within a statement they
+# return the same result for the same arguments (STABLE, not IMMUTABLE,
+# since they read tables) and can run in parallel workers. Those that call
+# parallel unsafe core functions are made PARALLEL UNSAFE again by 0017.
+READ_ONLY_FUNCTIONS = [
+    "__arches_get_concept_valueid(uuid, text)",
+    "__arches_get_concept_list_valueids(jsonb, text)",
+    "__arches_get_valueid(jsonb, uuid, text)",
+    "__arches_get_concept_label_v2(uuid, text)",
+    "__arches_get_concept_list_label_v2(jsonb, text)",
+    "__arches_get_resourceinstance_list_label_v2(jsonb, text, text)",
+    "__arches_get_resourceinstance_id_list(jsonb, text, text)",
+    "__arches_get_resourceinstance_id(jsonb, text, text)",
+    "__arches_get_node_display_value_v2(jsonb, uuid, text)",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_modular_reports", "0009_tiledisplayvalue"),
+    ]
+
+    forward_sql_string = "\n".join(
+        f"ALTER FUNCTION {function} STABLE PARALLEL SAFE;"
+        for function in READ_ONLY_FUNCTIONS
+    )
+
+    reverse_sql_string = "\n".join(
+        f"ALTER FUNCTION {function} VOLATILE PARALLEL UNSAFE;"
+        for function in READ_ONLY_FUNCTIONS
+    )
+
+    operations = [
+        migrations.RunSQL(forward_sql_string, reverse_sql_string),
+    ]
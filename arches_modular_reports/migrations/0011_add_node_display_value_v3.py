@@ -0,0 +1,122 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_modular_reports", "0010_display_value_function_volatility"),
+    ]
+
+    forward_sql_string = """
+        CREATE OR REPLACE FUNCTION public.__arches_get_node_display_value_v3(
+            in_tiledata jsonb,
+            in_nodeid uuid,
+            language_id text DEFAULT 'en')
+            RETURNS jsonb
+            LANGUAGE 'plpgsql'
+            COST 100
+            STABLE PARALLEL SAFE
+        AS $BODY$
+            -- Returns a JSON array of {"label": ..., "id": ...} objects, one
+            -- per value of the node, where "id" is what a link points to
+            -- (a concept, resource instance, url, or reference uri) or null.
+            declare
+                node_value      jsonb;
+                in_node_type    text;
+                display_value   text;
+                labels          jsonb;
+            begin
+                if in_nodeid is null or in_tiledata is null then
+                    return '[]'::jsonb;
+                end if;
+
+                node_value := in_tiledata -> in_nodeid::text;
+                if node_value is null or node_value = 'null'::jsonb then
+                    return '[]'::jsonb;
+                end if;
+
+                select n.datatype
+                into in_node_type
+                from nodes n where nodeid = in_nodeid;
+
+                case in_node_type
+                    when 'concept' then
+                        return jsonb_build_array(
+                            jsonb_build_object(
+                                'label', __arches_get_concept_label_v2((node_value #>> '{}')::uuid, language_id),
+                                'id', nullif(__arches_get_concept_valueid((node_value #>> '{}')::uuid, language_id), '')
+                            )
+                        );
+                    when 'concept-list' then
+                        return coalesce(
+                            (
+                                select jsonb_agg(
+                                    jsonb_build_object(
+                                        'label', __arches_get_concept_label_v2(elem.value_id::uuid, language_id),
+                                        'id', nullif(__arches_get_concept_valueid(elem.value_id::uuid, language_id), '')
+                                    )
+                                    order by elem.position
+                                )
+                                from jsonb_array_elements_text(node_value) with ordinality as elem(value_id, position)
+                            ),
+                            '[]'::jsonb
+                        );
+                    when 'resource-instance', 'resource-instance-list' then
+                        if jsonb_typeof(node_value) = 'object' then
+                            node_value := jsonb_build_array(node_value);
+                        end if;
+                        return coalesce(
+                            (
+                                select jsonb_agg(
+                                    jsonb_build_object(
+                                        'label', __arches_get_resourceinstance_label(elem.resource_instance, 'name', language_id),
+                                        'id', elem.resource_instance ->> 'resourceId'
+                                    )
+                                    order by elem.position
+                                )
+                                from jsonb_array_elements(node_value) with ordinality as elem(resource_instance, position)
+                            ),
+                            '[]'::jsonb
+                        );
+                    when 'reference' then
+                        labels := __arches_controlled_lists_get_reference_label_list(node_value, language_id)::jsonb;
+                        return coalesce(
+                            (
+                                select jsonb_agg(
+                                    jsonb_build_object(
+                                        'label', labels ->> (elem.position - 1)::int,
+                                        'id', elem.reference ->> 'uri'
+                                    )
+                                    order by elem.position
+                                )
+                                from jsonb_array_elements(node_value) with ordinality as elem(reference, position)
+                            ),
+                            '[]'::jsonb
+                        );
+                    when 'url' then
+                        return jsonb_build_array(
+                            jsonb_build_object(
+                                'label', coalesce(nullif(node_value ->> 'url_label', ''), node_value ->> 'url'),
+                                'id', node_value ->> 'url'
+                            )
+                        );
+                    else
+                        display_value := __arches_get_node_display_value_v2(in_tiledata, in_nodeid, language_id);
+                        if display_value is null or display_value = '' then
+                            return '[]'::jsonb;
+                        end if;
+                        return jsonb_build_array(
+                            jsonb_build_object('label', display_value, 'id', null)
+                        );
+                end case;
+            end;
+        $BODY$;
+    """
+
+    reverse_sql_string = """
+        drop function if exists __arches_get_node_display_value_v3;
+    """
+
+    operations = [
+        migrations.RunSQL(forward_sql_string, reverse_sql_string),
+    ]
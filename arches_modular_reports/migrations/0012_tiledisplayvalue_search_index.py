@@ -0,0 +1,18 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_modular_reports", "0011_add_node_display_value_v3"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tiledisplayvalue",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="tile_display_value_search"
+            ),
+        ),
+    ]
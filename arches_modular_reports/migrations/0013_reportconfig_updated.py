@@ -0,0 +1,20 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_modular_reports", "0012_tiledisplayvalue_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reportconfig",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
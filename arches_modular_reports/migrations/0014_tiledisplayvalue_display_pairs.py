@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_modular_reports", "0013_reportconfig_updated"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tiledisplayvalue",
+            name="display_pairs",
+            field=models.JSONField(null=True),
+        ),
+    ]
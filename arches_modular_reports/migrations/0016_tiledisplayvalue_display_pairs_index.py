@@ -0,0 +1,20 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_modular_reports", "0015_display_value_v3_concept_value_ids"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tiledisplayvalue",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["display_pairs"],
+                name="tile_display_value_pairs",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
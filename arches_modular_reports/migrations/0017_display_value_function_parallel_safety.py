@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# These call core Arches label functions (e.g.
+# __arches_get_resourceinstance_label, __arches_get_file_list_label,
+# __arches_get_domain_label, __arches_get_nodevalue_label) or
+# __arches_controlled_lists_get_reference_label_list, which are declared
+# VOLATILE PARALLEL UNSAFE, so they can't be PARALLEL SAFE themselves.
+# Those callees only SELECT, so these functions stay STABLE.
+PARALLEL_UNSAFE_FUNCTIONS = [
+    "__arches_get_resourceinstance_list_label_v2(jsonb, text, text)",
+    "__arches_get_node_display_value_v2(jsonb, uuid, text)",
+    "__arches_get_node_display_value_v3(jsonb, uuid, text)",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arches_modular_reports", "0016_tiledisplayvalue_display_pairs_index"),
+    ]
+
+    forward_sql_string = "\n".join(
+        f"ALTER FUNCTION {function} PARALLEL UNSAFE;"
+        for function in PARALLEL_UNSAFE_FUNCTIONS
+    )
+
+    reverse_sql_string = "\n".join(
+        f"ALTER FUNCTION {function} PARALLEL SAFE;"
+        for function in PARALLEL_UNSAFE_FUNCTIONS
+    )
+
+    operations = [
+        migrations.RunSQL(forward_sql_string, reverse_sql_string),
+    ]
@@ -1,11 +1,13 @@
 import re
 from pathlib import Path
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 
 from arches import __version__ as _arches_version_str
-from arches.app.models.models import GraphModel, Node, NodeGroup
+from arches.app.models.models import GraphModel, Node, NodeGroup, TileModel
 from arches.app.models.system_settings import settings
 from arches_modular_reports.utils import PrettyJSONEncoder
 from packaging.version import Version
@@ -34,6 +36,7 @@ class ReportConfig(models.Model):
         related_name="report_configs",
         limit_choices_to=get_graph_choices,
     )
+    updated = models.DateTimeField(auto_now=True)
 
     class Meta:
         managed = True
@@ -362,3 +365,47 @@ class ReportConfig(models.Model):
         if key not in config:
             raise ValidationError(f"{section_name} section missing key: {key}")
         return config[key]
+
+
+class TileDisplayValue(models.Model):
+    """Display value of one node of a tile in one language, stored when
+    MODULAR_REPORTS_MATERIALIZE_DISPLAY_VALUES is enabled so that reports
+    need not compute it while reading."""
+
+    id = models.BigAutoField(primary_key=True)
+    # Tiles are also deleted outside the ORM, so rows are removed by
+    # signal receivers (or rebuilds) rather than a database constraint.
+    tile = models.ForeignKey(
+        TileModel,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    node = models.ForeignKey(Node, on_delete=models.CASCADE, related_name="+")
+    language = models.TextField()
+    display_value = models.TextField(null=True)
+    value_ids = models.TextField(null=True)
+    display_pairs = models.JSONField(null=True)
+    search_vector = SearchVectorField(null=True)
+
+    class Meta:
+        managed = True
+        db_table = "arches_modular_report_tile_display_value"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tile", "node", "language"],
+                name="unique_tile_node_language",
+            )
+        ]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="tile_display_value_search"),
+            # Finds the rows referring to a resource or concept value.
+            GinIndex(
+                fields=["display_pairs"],
+                name="tile_display_value_pairs",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.tile_id} {self.node_id} ({self.language})"
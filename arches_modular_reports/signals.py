@@ -0,0 +1,303 @@
+from functools import partial
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+from guardian.models import GroupObjectPermission, UserObjectPermission
+
+from arches import __version__ as _arches_version_str
+from arches.app.models import models
+from arches.app.models.card import Card
+from arches.app.models.graph import Graph
+from arches.app.models.resource import Resource
+from arches.app.models.tile import Tile
+
+from arches_modular_reports.app.utils.cache_versions import (
+    bump_cache_version,
+    make_cache_key,
+)
+from arches_modular_reports.app.utils.display_values import (
+    delete_tile_display_values,
+    refresh_concept_label_display_values,
+    refresh_resource_label_display_values,
+    refresh_tile_display_values,
+)
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    display_values_are_materialized,
+)
+from arches_modular_reports.app.utils.relation_counts import (
+    get_resource_instance_node_ids,
+    relation_counts_are_cached,
+)
+from arches_modular_reports.models import ReportConfig
+from packaging.version import Version
+
+arches_version = Version(_arches_version_str)
+
+
+@receiver(post_save, sender=ReportConfig, dispatch_uid="mr_report_config_saved")
+@receiver(post_delete, sender=ReportConfig, dispatch_uid="mr_report_config_deleted")
+@receiver(post_save, sender=models.Node, dispatch_uid="mr_node_saved")
+@receiver(post_delete, sender=models.Node, dispatch_uid="mr_node_deleted")
+def invalidate_graph_caches(sender, instance, **kwargs):
+    if instance.graph_id:
+        bump_cache_version("graph", instance.graph_id)
+
+
+@receiver(post_save, sender=models.Node, dispatch_uid="mr_node_saved_datatypes")
+@receiver(post_delete, sender=models.Node, dispatch_uid="mr_node_deleted_datatypes")
+def invalidate_resource_instance_nodes(sender, instance, **kwargs):
+    if instance.nodegroup_id:
+        cache.delete(make_cache_key("resource_instance_nodes", instance.nodegroup_id))
+
+
+# Graph and Card are proxies of GraphModel and CardModel, and send their own
+# signals.
+@receiver(post_save, sender=models.GraphModel, dispatch_uid="mr_graphmodel_saved")
+@receiver(post_save, sender=Graph, dispatch_uid="mr_graph_saved")
+def invalidate_saved_graph_caches(sender, instance, **kwargs):
+    bump_cache_version("graph", instance.pk)
+
+
+@receiver(post_save, sender=models.CardModel, dispatch_uid="mr_cardmodel_saved")
+@receiver(post_delete, sender=models.CardModel, dispatch_uid="mr_cardmodel_deleted")
+@receiver(post_save, sender=Card, dispatch_uid="mr_card_saved")
+@receiver(post_delete, sender=Card, dispatch_uid="mr_card_deleted")
+def invalidate_card_graph_caches(sender, instance, **kwargs):
+    if instance.graph_id:
+        bump_cache_version("graph", instance.graph_id)
+
+
+@receiver(
+    post_save, sender=models.CardXNodeXWidget, dispatch_uid="mr_widget_config_saved"
+)
+@receiver(
+    post_delete,
+    sender=models.CardXNodeXWidget,
+    dispatch_uid="mr_widget_config_deleted",
+)
+def invalidate_widget_graph_caches(sender, instance, **kwargs):
+    graph_ids = models.CardModel.objects.filter(pk=instance.card_id).values_list(
+        "graph_id", flat=True
+    )
+    for graph_id in graph_ids:
+        bump_cache_version("graph", graph_id)
+
+
+@receiver(post_save, sender=models.NodeGroup, dispatch_uid="mr_nodegroup_saved")
+@receiver(post_delete, sender=models.NodeGroup, dispatch_uid="mr_nodegroup_deleted")
+def invalidate_nodegroup_graph_caches(sender, instance, **kwargs):
+    graph_ids = (
+        models.Node.objects.filter(nodegroup_id=instance.pk)
+        .values_list("graph_id", flat=True)
+        .distinct()
+    )
+    for graph_id in graph_ids:
+        bump_cache_version("graph", graph_id)
+
+
+@receiver(post_save, sender=UserObjectPermission, dispatch_uid="mr_user_perm_saved")
+@receiver(post_delete, sender=UserObjectPermission, dispatch_uid="mr_user_perm_deleted")
+@receiver(post_save, sender=GroupObjectPermission, dispatch_uid="mr_group_perm_saved")
+@receiver(
+    post_delete, sender=GroupObjectPermission, dispatch_uid="mr_group_perm_deleted"
+)
+@receiver(post_save, sender=Group, dispatch_uid="mr_group_saved")
+@receiver(post_delete, sender=Group, dispatch_uid="mr_group_deleted")
+@receiver(post_save, sender=models.NodeGroup, dispatch_uid="mr_nodegroup_perms_saved")
+@receiver(
+    post_delete, sender=models.NodeGroup, dispatch_uid="mr_nodegroup_perms_deleted"
+)
+@receiver(m2m_changed, sender=User.groups.through, dispatch_uid="mr_user_groups")
+@receiver(
+    m2m_changed,
+    sender=User.user_permissions.through,
+    dispatch_uid="mr_user_permissions",
+)
+@receiver(
+    m2m_changed, sender=Group.permissions.through, dispatch_uid="mr_group_permissions"
+)
+def invalidate_permission_profiles(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("post_"):
+        bump_cache_version("permissions", "all")
+
+
+@receiver(post_save, sender=models.ResourceXResource, dispatch_uid="mr_relation_saved")
+@receiver(
+    post_delete, sender=models.ResourceXResource, dispatch_uid="mr_relation_deleted"
+)
+def invalidate_relation_caches(sender, instance, **kwargs):
+    if arches_version < Version("8.0"):
+        resource_ids = (
+            instance.resourceinstanceidfrom_id,
+            instance.resourceinstanceidto_id,
+        )
+    else:
+        resource_ids = (instance.from_resource_id, instance.to_resource_id)
+    for resource_id in resource_ids:
+        if resource_id:
+            bump_cache_version("relations", resource_id)
+
+
+def get_related_resource_ids(tile_data, node_ids=None):
+    """The ids of the resources referenced by resource-instance(-list) node
+    values in tile data, optionally only those of node_ids."""
+    resource_ids = set()
+    for node_id, value in (tile_data or {}).items():
+        if node_ids is not None and node_id not in node_ids:
+            continue
+        if isinstance(value, dict):
+            value = [value]
+        if isinstance(value, list):
+            resource_ids.update(
+                str(item["resourceId"])
+                for item in value
+                if isinstance(item, dict) and item.get("resourceId")
+            )
+    return resource_ids
+
+
+# Relations to resources referenced by a tile are written by a database
+# function when the tile is saved, which sends no signals, so compare what
+# the tile referenced before and after it is saved. The previous data is only
+# queried for tiles of nodegroups with resource-instance(-list) nodes, and not
+# at all if relation counts aren't cached.
+@receiver(pre_save, sender=models.TileModel, dispatch_uid="mr_tilemodel_saving")
+@receiver(pre_save, sender=Tile, dispatch_uid="mr_tile_saving")
+def remember_related_resources(sender, instance, **kwargs):
+    instance._previous_related_resource_ids = set()
+    if instance._state.adding or not relation_counts_are_cached():
+        return
+    if not (node_ids := get_resource_instance_node_ids(instance.nodegroup_id)):
+        return
+    previous_data = (
+        models.TileModel.objects.filter(pk=instance.pk)
+        .values_list("data", flat=True)
+        .first()
+    )
+    instance._previous_related_resource_ids = get_related_resource_ids(
+        previous_data, node_ids
+    )
+
+
+# Saving a Tile (a proxy of TileModel) sends signals with Tile as the sender.
+@receiver(post_save, sender=models.TileModel, dispatch_uid="mr_tilemodel_relations")
+@receiver(post_save, sender=Tile, dispatch_uid="mr_tile_relations")
+@receiver(
+    post_delete,
+    sender=models.TileModel,
+    dispatch_uid="mr_tilemodel_deleted_relations",
+)
+@receiver(post_delete, sender=Tile, dispatch_uid="mr_tile_deleted_relations")
+def invalidate_tile_relation_caches(sender, instance, **kwargs):
+    resource_ids = get_related_resource_ids(instance.data) | getattr(
+        instance, "_previous_related_resource_ids", set()
+    )
+    if resource_ids and instance.resourceinstance_id:
+        resource_ids.add(str(instance.resourceinstance_id))
+    for resource_id in resource_ids:
+        bump_cache_version("relations", resource_id)
+
+
+@receiver(post_save, sender=models.TileModel, dispatch_uid="mr_tilemodel_version")
+@receiver(post_save, sender=Tile, dispatch_uid="mr_tile_version")
+@receiver(
+    post_delete, sender=models.TileModel, dispatch_uid="mr_tilemodel_deleted_version"
+)
+@receiver(post_delete, sender=Tile, dispatch_uid="mr_tile_deleted_version")
+def invalidate_resource_caches(sender, instance, **kwargs):
+    if instance.resourceinstance_id:
+        bump_cache_version("resource", instance.resourceinstance_id)
+
+
+@receiver(post_save, sender=models.TileModel, dispatch_uid="mr_tilemodel_saved")
+@receiver(post_save, sender=Tile, dispatch_uid="mr_tile_saved")
+def refresh_display_values(sender, instance, **kwargs):
+    if display_values_are_materialized():
+        # After the edit is committed, rather than while it holds its locks,
+        # and not at all if it is rolled back.
+        transaction.on_commit(partial(refresh_tile_display_values, [instance.pk]))
+
+
+@receiver(post_delete, sender=models.TileModel, dispatch_uid="mr_tilemodel_deleted")
+@receiver(post_delete, sender=Tile, dispatch_uid="mr_tile_deleted")
+def delete_display_values(sender, instance, **kwargs):
+    if display_values_are_materialized():
+        delete_tile_display_values([instance.pk])
+
+
+def get_resource_names(descriptors):
+    return {
+        language: (language_descriptors or {}).get("name")
+        for language, language_descriptors in (descriptors or {}).items()
+    }
+
+
+def invalidate_resource_labels(resource_id):
+    """Invalidate what shows the name of a resource: the reports of the
+    resources referring to it, and their stored display values."""
+    if arches_version < Version("8.0"):
+        referring_ids = models.ResourceXResource.objects.filter(
+            resourceinstanceidto_id=resource_id
+        ).values_list("resourceinstanceidfrom_id", flat=True)
+    else:
+        referring_ids = models.ResourceXResource.objects.filter(
+            to_resource_id=resource_id
+        ).values_list("from_resource_id", flat=True)
+    for referring_id in set(referring_ids):
+        bump_cache_version("resource", referring_id)
+    if display_values_are_materialized():
+        transaction.on_commit(
+            partial(refresh_resource_label_display_values, resource_id)
+        )
+
+
+# Names are compared with those the resource was loaded with, so that saving
+# a resource doesn't query its previous name.
+@receiver(post_init, sender=models.ResourceInstance, dispatch_uid="mr_ri_loaded")
+@receiver(post_init, sender=Resource, dispatch_uid="mr_resource_loaded")
+def remember_resource_names(sender, instance, **kwargs):
+    # Deferred descriptors are not loaded just to be remembered.
+    if "descriptors" in instance.__dict__:
+        instance._previous_names = get_resource_names(instance.descriptors)
+
+
+@receiver(post_save, sender=models.ResourceInstance, dispatch_uid="mr_ri_saved")
+@receiver(post_save, sender=Resource, dispatch_uid="mr_resource_saved")
+def invalidate_renamed_resource_labels(sender, instance, created, **kwargs):
+    previous_names = getattr(instance, "_previous_names", None)
+    if "descriptors" not in instance.__dict__:
+        return
+    instance._previous_names = names = get_resource_names(instance.descriptors)
+    if created or previous_names is None or names == previous_names:
+        return
+    invalidate_resource_labels(instance.pk)
+
+
+@receiver(post_delete, sender=models.ResourceInstance, dispatch_uid="mr_ri_deleted")
+@receiver(post_delete, sender=Resource, dispatch_uid="mr_resource_deleted")
+def invalidate_deleted_resource_labels(sender, instance, **kwargs):
+    invalidate_resource_labels(instance.pk)
+
+
+@receiver(post_save, sender=models.Value, dispatch_uid="mr_concept_value_saved")
+@receiver(post_delete, sender=models.Value, dispatch_uid="mr_concept_value_deleted")
+def invalidate_concept_labels(sender, instance, **kwargs):
+    # Which reports show a concept is unknown, so all are invalidated.
+    bump_cache_version("concepts", "all")
+    if display_values_are_materialized() and instance.concept_id:
+        transaction.on_commit(
+            partial(
+                refresh_concept_label_display_values,
+                instance.concept_id,
+                [instance.pk],
+            )
+        )
@@ -120,6 +120,23 @@ export const fetchReportConfig = async (
     return parsed;
 };
 
+export const fetchReportBootstrap = async (
+    resourceId: string,
+    slug: string | undefined,
+) => {
+    const params = new URLSearchParams();
+
+    if (slug) {
+        params.append("report_config_slug", slug);
+    }
+    const url = `${arches.urls.api_report_bootstrap(resourceId)}?${params.toString()}`;
+
+    const response = await fetch(url);
+    const parsed = await response.json();
+    if (!response.ok) throw new Error(parsed.message || response.statusText);
+    return parsed;
+};
+
 export const fetchNodegroup = async (nodegroupId: string) => {
     const url = arches.urls.api_nodegroup(nodegroupId);
     const response = await fetch(url);
@@ -158,6 +175,8 @@ export const fetchNodegroupTileData = async (
     direction: string | null,
     query: string | null,
     filters: { alias: string; value: string; field_lookup: string }[] | null,
+    includeNextPage: boolean = false,
+    signal?: AbortSignal,
 ) => {
     const url = arches.urls.api_nodegroup_tile_data(
         resourceInstanceId,
@@ -170,9 +189,10 @@ export const fetchNodegroupTileData = async (
         direction: direction || "",
         query: query || "",
         filters: JSON.stringify(filters || []),
+        include_next_page: includeNextPage.toString(),
     });
 
-    const response = await fetch(url + "?" + params.toString());
+    const response = await fetch(url + "?" + params.toString(), { signal });
     const parsed = await response.json();
 
     if (!response.ok) throw new Error(parsed.message || response.statusText);
@@ -188,6 +208,8 @@ export const fetchRelatedResourceData = async (
     sortField: string,
     direction: string,
     query: string,
+    includeNextPage: boolean = false,
+    signal?: AbortSignal,
 ) => {
     const url = arches.urls.api_related_resources(
         resourceInstanceId,
@@ -200,15 +222,26 @@ export const fetchRelatedResourceData = async (
         sort_field: sortField,
         direction,
         query,
+        include_next_page: includeNextPage.toString(),
     });
 
-    const response = await fetch(url + "?" + params.toString());
+    const response = await fetch(url + "?" + params.toString(), { signal });
     const parsed = await response.json();
 
     if (!response.ok) throw new Error(parsed.message || response.statusText);
     return parsed;
 };
 
+export const fetchRelatedResourceCounts = async (
+    resourceInstanceId: string,
+) => {
+    const url = arches.urls.api_related_resource_counts(resourceInstanceId);
+    const response = await fetch(url);
+    const parsed = await response.json();
+    if (!response.ok) throw new Error(parsed.message || response.statusText);
+    return parsed;
+};
+
 export const fetchCardFromNodegroupId = async (nodegroupId: string) => {
     const url = arches.urls.api_card_from_nodegroup_id(nodegroupId);
     const response = await fetch(url);
@@ -0,0 +1,210 @@
+import { ref } from "vue";
+
+import { runWhenIdle } from "@/arches_modular_reports/ModularReport/utils.ts";
+
+import type { SectionPage } from "@/arches_modular_reports/ModularReport/types";
+
+// The most pages a section keeps; the least recently used are dropped first.
+const PAGE_CACHE_SIZE = 20;
+
+export interface FetchedPage<Page extends SectionPage = SectionPage> {
+    results: unknown[];
+    page: number;
+    totalCount: number;
+    response: Page;
+}
+
+export function usePagedFetch<
+    Parameters extends { rowsPerPage: number },
+    Page extends SectionPage,
+>({
+    getRequestParameters,
+    fetchPage,
+    prefetch,
+    onShowPage,
+}: {
+    getRequestParameters: () => Parameters;
+    fetchPage: (
+        page: number,
+        parameters: Parameters,
+        includeNextPage: boolean,
+        signal?: AbortSignal,
+    ) => Promise<Page>;
+    prefetch: boolean;
+    onShowPage?: (fetched: FetchedPage<Page>) => void;
+}) {
+    const currentPage = ref(1);
+    const currentlyDisplayedTableData = ref<unknown[]>([]);
+    const searchResultsTotalCount = ref(0);
+    const isLoading = ref(false);
+    const hasLoadingError = ref(false);
+
+    // Pages already fetched, keyed on the request parameters (see getCacheKey)
+    // and ordered from least to most recently used.
+    const pageCache = new Map<string, FetchedPage<Page>>();
+    let abortController: AbortController | null = null;
+    let inFlightCacheKey: string | null = null;
+    let pendingPrefetch: {
+        cacheKey: string;
+        request: Promise<FetchedPage<Page>>;
+    } | null = null;
+
+    function getCacheKey(page: number, parameters = getRequestParameters()) {
+        return JSON.stringify({ ...parameters, page });
+    }
+
+    function isPageCached(page: number) {
+        return pageCache.has(getCacheKey(page));
+    }
+
+    function getCachedPage(cacheKey: string) {
+        const cached = pageCache.get(cacheKey);
+        if (cached) {
+            setCachedPage(cacheKey, cached);
+        }
+        return cached;
+    }
+
+    function setCachedPage(cacheKey: string, fetched: FetchedPage<Page>) {
+        pageCache.delete(cacheKey);
+        pageCache.set(cacheKey, fetched);
+        for (const staleKey of pageCache.keys()) {
+            if (pageCache.size <= PAGE_CACHE_SIZE) {
+                break;
+            }
+            pageCache.delete(staleKey);
+        }
+    }
+
+    function cancelPendingFetch() {
+        abortController?.abort();
+        abortController = null;
+        inFlightCacheKey = null;
+        isLoading.value = false;
+    }
+
+    async function fetchData(page: number = 1) {
+        const parameters = getRequestParameters();
+        const cacheKey = getCacheKey(page, parameters);
+        const cached = getCachedPage(cacheKey);
+        if (cached) {
+            // Don't let a slower, older request overwrite what we show.
+            cancelPendingFetch();
+            showPage(cached);
+            return;
+        }
+        if (cacheKey === inFlightCacheKey) {
+            return;
+        }
+
+        cancelPendingFetch();
+        const controller = new AbortController();
+        abortController = controller;
+        inFlightCacheKey = cacheKey;
+        isLoading.value = true;
+
+        try {
+            const fetched = await (pendingPrefetch?.cacheKey === cacheKey
+                ? pendingPrefetch.request
+                : requestPage(page, parameters, prefetch, controller.signal));
+            if (!controller.signal.aborted) {
+                showPage(fetched);
+            }
+        } catch (error) {
+            if (controller.signal.aborted) {
+                return;
+            }
+            hasLoadingError.value = true;
+            throw error;
+        } finally {
+            if (abortController === controller) {
+                abortController = null;
+                inFlightCacheKey = null;
+                isLoading.value = false;
+            }
+        }
+    }
+
+    async function requestPage(
+        page: number,
+        parameters: Parameters,
+        includeNextPage: boolean,
+        signal?: AbortSignal,
+    ) {
+        const response = await fetchPage(
+            page,
+            parameters,
+            includeNextPage,
+            signal,
+        );
+        return cachePage(page, parameters, response);
+    }
+
+    function cachePage(page: number, parameters: Parameters, response: Page) {
+        const fetched = {
+            results: response.results,
+            page: response.page,
+            totalCount: response.total_count,
+            response,
+        };
+        // The server may return a different page than requested, e.g. the
+        // last page if the requested one is out of range.
+        setCachedPage(getCacheKey(page, parameters), fetched);
+        setCachedPage(getCacheKey(response.page, parameters), fetched);
+        if (response.next_page) {
+            setCachedPage(getCacheKey(response.next_page.page, parameters), {
+                results: response.next_page.results,
+                page: response.next_page.page,
+                totalCount: response.total_count,
+                response,
+            });
+        }
+        return fetched;
+    }
+
+    function prefetchNextPage() {
+        if (!prefetch || pendingPrefetch) {
+            return;
+        }
+        const parameters = getRequestParameters();
+        const nextPage = currentPage.value + 1;
+        const cacheKey = getCacheKey(nextPage, parameters);
+        if (
+            (nextPage - 1) * parameters.rowsPerPage >=
+                searchResultsTotalCount.value ||
+            pageCache.has(cacheKey)
+        ) {
+            return;
+        }
+
+        // The page following this one is prefetched once this one is shown.
+        const request = requestPage(nextPage, parameters, false);
+        pendingPrefetch = { cacheKey, request };
+        request
+            .catch(() => {
+                // Only reported if the page is shown, by fetchData().
+            })
+            .finally(() => {
+                pendingPrefetch = null;
+            });
+    }
+
+    function showPage(fetched: FetchedPage<Page>) {
+        currentlyDisplayedTableData.value = fetched.results;
+        currentPage.value = fetched.page;
+        searchResultsTotalCount.value = fetched.totalCount;
+        onShowPage?.(fetched);
+        runWhenIdle(prefetchNextPage);
+    }
+
+    return {
+        currentPage,
+        currentlyDisplayedTableData,
+        searchResultsTotalCount,
+        isLoading,
+        hasLoadingError,
+        cachePage,
+        fetchData,
+        isPageCached,
+    };
+}
@@ -48,6 +48,45 @@ export interface NodePresentationLookup {
     [key: string]: NodePresentation;
 }
 
+export interface PrefetchedNodeTileData {
+    header?: NodeValueDisplayDataLookup;
+    tombstone?: NodeValueDisplayDataLookup;
+    tombstone_image?: NodeValueDisplayDataLookup;
+}
+
+export interface ReportBootstrap {
+    config: NamedSection;
+    node_presentation: NodePresentationLookup;
+    node_tile_data: PrefetchedNodeTileData;
+    permissions: Record<string, boolean>;
+    user_can_edit_resource: boolean;
+    language: string;
+    language_dir: string;
+}
+
+export interface SectionPage {
+    results: unknown[];
+    page: number;
+    total_count: number;
+    next_page?: { results: unknown[]; page: number };
+}
+
+export interface RelatedResourcesPage extends SectionPage {
+    graph_name: string;
+    widget_labels: Record<string, string>;
+}
+
+// API payloads embedded in the report page; those missing are fetched.
+export interface ReportSnapshot {
+    resourceid: string;
+    report_config_slug: string;
+    rows_per_page: number;
+    bootstrap: ReportBootstrap;
+    related_resource_counts: { counts: Record<string, number> } | null;
+    nodegroup_tile_data: Record<string, SectionPage | null>;
+    related_resources: Record<string, RelatedResourcesPage | null>;
+}
+
 export interface KeyedComponent {
     component: Component;
     key: number;
@@ -17,6 +17,14 @@ export function uniqueId(_unused: unknown) {
     return Math.floor(Math.random() * Date.now());
 }
 
+export function runWhenIdle(callback: () => void) {
+    if ("requestIdleCallback" in window) {
+        window.requestIdleCallback(callback);
+    } else {
+        setTimeout(callback, 0);
+    }
+}
+
 export async function importComponents(
     namedSections: NamedSection[],
     componentLookup: ComponentLookup,
@@ -0,0 +1,161 @@
+from tempfile import TemporaryFile
+
+from celery import shared_task
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone, translation
+from django.utils.translation import gettext as _
+
+from arches.app.models import models
+from arches.app.tasks import notify_completion
+from arches.app.utils.message_contexts import return_message_context
+
+from arches_modular_reports.app.utils.cache_versions import (
+    get_report_cache_timeout,
+    make_cache_key,
+)
+from arches_modular_reports.app.utils.permission_profiles import (
+    get_permission_profile,
+)
+from arches_modular_reports.app.utils.report_config_cache import (
+    get_permitted_report_config,
+)
+from arches_modular_reports.app.utils.report_export import (
+    delete_expired_report_files,
+    get_report_file_name,
+    get_report_file_url,
+    iter_report_rows,
+    stream_csv,
+    stream_html,
+    stream_json,
+)
+from arches_modular_reports.app.utils.report_snapshots import build_report_snapshot
+
+REPORT_FILE_FORMATS = ("json", "csv", "html")
+
+
+def write_report_file(
+    *, task_id, user, resourceid, report_config_slug, file_format, language
+):
+    """Write a report to a file in the default storage, and return its name."""
+    profile = get_permission_profile(user)
+    resource = models.ResourceInstance.objects.select_related("graph").get(
+        pk=resourceid
+    )
+    rows = iter_report_rows(
+        resource=resource,
+        config=get_permitted_report_config(resourceid, report_config_slug, user),
+        user=user,
+        profile=profile,
+        language=language,
+    )
+    match file_format:
+        case "json":
+            chunks = stream_json(rows)
+        case "csv":
+            chunks = stream_csv(rows)
+        case "html":
+            chunks = stream_html(rows, title=str(resource.name) or _("Resource Report"))
+
+    with TemporaryFile() as tmp:
+        for chunk in chunks:
+            tmp.write(chunk.encode("utf-8"))
+        tmp.seek(0)
+        return default_storage.save(
+            get_report_file_name(
+                resourceid=resourceid,
+                fingerprint=profile.fingerprint,
+                task_id=task_id,
+                file_format=file_format,
+            ),
+            File(tmp),
+        )
+
+
+def notify_report_file_users(*, task_id, resourceid, file_format, file_name):
+    """Update the task records of the users waiting for a report file, and
+    notify them that it is ready, or that it could not be written if
+    file_name is None."""
+    if file_name:
+        status = "SUCCESS"
+        msg = _("Your report export is ready for download.")
+        greeting = _("Hello,\nYour report export is now ready.")
+        link_context = {
+            "link": get_report_file_url(
+                resourceid=resourceid, task_id=task_id, file_format=file_format
+            ),
+            "button_text": _("Download Now"),
+        }
+    else:
+        status = "ERROR"
+        msg = _("Your report export failed.")
+        greeting = _("Hello,\nYour report export could not be completed.")
+        link_context = {}
+
+    user_tasks = models.UserXTask.objects.filter(taskid=task_id)
+    user_tasks.update(status=status, datedone=timezone.now())
+    for user_task in user_tasks.select_related("user"):
+        notify_completion(
+            msg,
+            user_task.user,
+            context=return_message_context(
+                greeting=greeting,
+                closing_text=_("Thank you"),
+                additional_context={
+                    **link_context,
+                    "username": user_task.user.first_name or user_task.user.username,
+                },
+            ),
+        )
+    return msg
+
+
+@shared_task(bind=True)
+def generate_report_file(
+    self, userid, resourceid, report_config_slug, file_format, language, job_key
+):
+    """Write a report to a file in the default storage and notify the users
+    waiting for it (see report_jobs.start_report_file_job), also if writing
+    it fails."""
+    delete_expired_report_files(default_storage)
+    file_name = None
+    with translation.override(language):
+        try:
+            file_name = write_report_file(
+                task_id=self.request.id,
+                user=User.objects.get(pk=userid),
+                resourceid=resourceid,
+                report_config_slug=report_config_slug,
+                file_format=file_format,
+                language=language,
+            )
+        finally:
+            # Users requesting the report from now on start another job.
+            cache.delete(job_key)
+            msg = notify_report_file_users(
+                task_id=self.request.id,
+                resourceid=resourceid,
+                file_format=file_format,
+                file_name=file_name,
+            )
+
+    return {"taskid": self.request.id, "msg": msg, "file_name": file_name}
+
+
+@shared_task
+def generate_report_snapshot(resourceid, report_config_slug, language, snapshot_key):
+    """Cache a snapshot of the report for the anonymous user under
+    snapshot_key (see report_jobs.get_report_snapshot)."""
+    snapshot = None
+    try:
+        with translation.override(language):
+            snapshot = build_report_snapshot(
+                resourceid=resourceid, report_config_slug=report_config_slug
+            )
+    finally:
+        # An empty snapshot records that there is nothing to embed, also if
+        # building it failed, so that it is not rebuilt on every request.
+        cache.set(snapshot_key, snapshot or {}, timeout=get_report_cache_timeout())
+        cache.delete(make_cache_key("report_snapshot_job", snapshot_key))
@@ -9,7 +9,11 @@ from arches_modular_reports.app.views.modular_report import (
     NodePresentationView,
     NodeTileDataView,
     ModularReportConfigView,
+    RelatedResourceCountsView,
     RelatedResourceView,
+    ReportBootstrapView,
+    ReportExportView,
+    ReportFileView,
     UserPermissionsView,
     LanguageSettingsView,
 )
@@ -44,6 +48,11 @@ urlpatterns = [
         RelatedResourceView.as_view(),
         name="api_related_resources",
     ),
+    path(
+        "api/related_resource_counts/<uuid:resourceid>",
+        RelatedResourceCountsView.as_view(),
+        name="api_related_resource_counts",
+    ),
     path(
         "api/node_presentation/<uuid:resourceid>",
         NodePresentationView.as_view(),
@@ -59,6 +68,21 @@ urlpatterns = [
         NodeTileDataView.as_view(),
         name="api_node_tile_data",
     ),
+    path(
+        "api/report_bootstrap/<uuid:resourceid>",
+        ReportBootstrapView.as_view(),
+        name="api_report_bootstrap",
+    ),
+    path(
+        "api/report_export/<uuid:resourceid>",
+        ReportExportView.as_view(),
+        name="api_report_export",
+    ),
+    path(
+        "api/report_file/<uuid:resourceid>",
+        ReportFileView.as_view(),
+        name="api_report_file",
+    ),
     path(
         "api/has_permissions",
         UserPermissionsView.as_view(),
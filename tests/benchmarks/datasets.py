@@ -0,0 +1,346 @@
+import os
+import uuid
+from types import SimpleNamespace
+
+from arches import __version__ as _arches_version_str
+from arches.app.models.graph import Graph
+from arches.app.models.models import (
+    Concept,
+    Node,
+    NodeGroup,
+    ResourceInstance,
+    ResourceXResource,
+    TileModel,
+    Value,
+)
+from packaging.version import Version
+
+arches_version = Version(_arches_version_str)
+
+
+def benchmarks_enabled():
+    return bool(os.environ.get("MODULAR_REPORTS_BENCHMARK"))
+
+
+def get_dataset_size(name, default):
+    return int(os.environ.get(f"MODULAR_REPORTS_BENCHMARK_{name}", default))
+
+
+def create_graph(slug):
+    if arches_version < Version("8.0"):
+        graph = Graph.new(is_resource=True)
+        graph.slug = slug
+        graph.save()
+    else:
+        graph = Graph.objects.create_graph(is_resource=True, slug=slug)
+        Graph.objects.filter(slug=slug).exclude(
+            source_identifier=None
+        ).delete()  # delete draft graph
+    return graph
+
+
+def create_nodegroup(graph, alias, datatypes):
+    """Create a nodegroup with a node of each of the given datatypes,
+    aliased <alias>_<n>. Returns (nodegroup, nodes)."""
+    nodegroup = NodeGroup.objects.create(cardinality="n")
+    Node.objects.create(
+        pk=nodegroup.pk,
+        name=alias,
+        alias=alias,
+        graph_id=graph.pk,
+        nodegroup=nodegroup,
+        datatype="semantic",
+        istopnode=False,
+    )
+    nodes = [
+        Node.objects.create(
+            nodegroup=nodegroup,
+            name=f"{alias} {i}",
+            alias=f"{alias}_{i}",
+            graph_id=graph.pk,
+            istopnode=False,
+            datatype=datatype,
+        )
+        for i, datatype in enumerate(datatypes)
+    ]
+    return nodegroup, nodes
+
+
+def make_string_tile_data(nodes, text):
+    return {
+        str(node.pk): {"en": {"value": f"{text} {i}", "direction": "ltr"}}
+        for i, node in enumerate(nodes)
+    }
+
+
+def make_relation(*, resource, related_resource, node):
+    if arches_version < Version("8.0"):
+        return ResourceXResource(
+            resourceinstanceidfrom=resource,
+            resourceinstanceidto=related_resource,
+            resourceinstancefrom_graphid_id=resource.graph_id,
+            resourceinstanceto_graphid_id=related_resource.graph_id,
+            nodeid=node,
+        )
+    return ResourceXResource(
+        from_resource=resource,
+        to_resource=related_resource,
+        from_resource_graph_id=resource.graph_id,
+        to_resource_graph_id=related_resource.graph_id,
+        node=node,
+    )
+
+
+def create_benchmark_dataset(*, tile_count, relation_count):
+    """A resource with tile_count tiles in one nodegroup of string nodes,
+    related to relation_count resources of another graph that each have a
+    tile of string nodes."""
+    graph = create_graph("benchmark_graph")
+    related_graph = create_graph("benchmark_related_graph")
+
+    nodegroup, string_nodes = create_nodegroup(
+        graph, "inscription", ["string", "string", "string"]
+    )
+    relation_nodegroup, (relation_node,) = create_nodegroup(
+        graph, "related", ["resource-instance-list"]
+    )
+    related_nodegroup, related_nodes = create_nodegroup(
+        related_graph, "label", ["string", "string"]
+    )
+
+    resource = ResourceInstance.objects.create(graph_id=graph.pk)
+    TileModel.objects.bulk_create(
+        [
+            TileModel(
+                resourceinstance=resource,
+                nodegroup=nodegroup,
+                sortorder=i,
+                data=make_string_tile_data(string_nodes, f"Inscription {i}"),
+            )
+            for i in range(tile_count)
+        ],
+        batch_size=1000,
+    )
+
+    related_resources = ResourceInstance.objects.bulk_create(
+        [ResourceInstance(graph_id=related_graph.pk) for _ in range(relation_count)],
+        batch_size=1000,
+    )
+    TileModel.objects.bulk_create(
+        [
+            TileModel(
+                resourceinstance=related_resource,
+                nodegroup=related_nodegroup,
+                data=make_string_tile_data(related_nodes, f"Label {i}"),
+            )
+            for i, related_resource in enumerate(related_resources)
+        ],
+        batch_size=1000,
+    )
+    ResourceXResource.objects.bulk_create(
+        [
+            make_relation(
+                resource=resource,
+                related_resource=related_resource,
+                node=relation_node,
+            )
+            for related_resource in related_resources
+        ],
+        batch_size=1000,
+    )
+
+    return SimpleNamespace(
+        graph=graph,
+        related_graph=related_graph,
+        resource=resource,
+        nodegroup=nodegroup,
+        string_nodes=string_nodes,
+        relation_nodegroup=relation_nodegroup,
+        relation_node=relation_node,
+        related_nodegroup=related_nodegroup,
+        related_nodes=related_nodes,
+    )
+
+
+def get_large_resource_datatypes():
+    datatypes = [
+        "string",
+        "concept",
+        "concept-list",
+        "resource-instance-list",
+        "file-list",
+    ]
+    if arches_version >= Version("8.0"):
+        datatypes.append("reference")
+    return datatypes
+
+
+def create_concept_values(count):
+    values = []
+    for i in range(count):
+        concept = Concept.objects.create(nodetype_id="Concept")
+        values.append(
+            Value.objects.create(
+                concept=concept,
+                valuetype_id="prefLabel",
+                value=f"Concept {i}",
+                language_id="en",
+            )
+        )
+    return values
+
+
+def make_localized(text):
+    return {"en": {"value": text, "direction": "ltr"}}
+
+
+def make_node_value(datatype, i, *, concept_values, related_resources):
+    match datatype:
+        case "string":
+            return make_localized(f"Value {i}")
+        case "concept":
+            return str(concept_values[i % len(concept_values)].pk)
+        case "concept-list":
+            return [
+                str(concept_values[(i + offset) % len(concept_values)].pk)
+                for offset in range(3)
+            ]
+        case "resource-instance-list":
+            return (
+                [
+                    {
+                        "resourceId": str(
+                            related_resources[(i + offset) % len(related_resources)].pk
+                        ),
+                        "ontologyProperty": "",
+                        "inverseOntologyProperty": "",
+                    }
+                    for offset in range(3)
+                ]
+                if related_resources
+                else None
+            )
+        case "file-list":
+            return [
+                {
+                    "file_id": str(uuid.uuid4()),
+                    "name": f"image_{i}.jpg",
+                    "url": f"/files/image_{i}.jpg",
+                    "type": "image/jpeg",
+                    "size": 1024,
+                    "status": "uploaded",
+                    "title": make_localized(f"Image {i}"),
+                    "altText": make_localized(f"Alt text {i}"),
+                    "attribution": make_localized(""),
+                    "description": make_localized(""),
+                }
+            ]
+        case "reference":
+            list_id = str(uuid.uuid4())
+            return [
+                {
+                    "uri": f"https://example.org/reference/{i}",
+                    "list_id": list_id,
+                    "labels": [
+                        {
+                            "id": str(uuid.uuid4()),
+                            "value": f"Reference {i}",
+                            "language_id": "en",
+                            "valuetype_id": "prefLabel",
+                            "list_item_id": str(uuid.uuid4()),
+                        }
+                    ],
+                }
+            ]
+
+
+def create_large_resource_dataset(
+    *, nodegroup_count, tiles_per_nodegroup, related_count
+):
+    """A resource with nodegroup_count nodegroups, each with a node of every
+    datatype in get_large_resource_datatypes() and tiles_per_nodegroup
+    tiles, related to related_count resources of another graph. Nodegroups
+    are aliased section_<n>, and their nodes section_<n>_<datatype index>."""
+    graph = create_graph("large_benchmark_graph")
+    related_graph = create_graph("large_benchmark_related_graph")
+    datatypes = get_large_resource_datatypes()
+    concept_values = create_concept_values(20)
+
+    related_nodegroup, related_nodes = create_nodegroup(
+        related_graph, "summary", ["string", "concept"]
+    )
+    related_resources = ResourceInstance.objects.bulk_create(
+        [ResourceInstance(graph_id=related_graph.pk) for _ in range(related_count)],
+        batch_size=1000,
+    )
+    TileModel.objects.bulk_create(
+        [
+            TileModel(
+                resourceinstance=related_resource,
+                nodegroup=related_nodegroup,
+                data={
+                    str(node.pk): make_node_value(
+                        node.datatype,
+                        i,
+                        concept_values=concept_values,
+                        related_resources=[],
+                    )
+                    for node in related_nodes
+                },
+            )
+            for i, related_resource in enumerate(related_resources)
+        ],
+        batch_size=1000,
+    )
+
+    resource = ResourceInstance.objects.create(graph_id=graph.pk)
+    nodegroups = []
+    for n in range(nodegroup_count):
+        nodegroup, nodes = create_nodegroup(graph, f"section_{n}", datatypes)
+        nodegroups.append((nodegroup, nodes))
+        TileModel.objects.bulk_create(
+            [
+                TileModel(
+                    resourceinstance=resource,
+                    nodegroup=nodegroup,
+                    sortorder=i,
+                    data={
+                        str(node.pk): make_node_value(
+                            node.datatype,
+                            i,
+                            concept_values=concept_values,
+                            related_resources=related_resources,
+                        )
+                        for node in nodes
+                    },
+                )
+                for i in range(tiles_per_nodegroup)
+            ],
+            batch_size=1000,
+        )
+
+    # Relations are recorded against the first nodegroup's
+    # resource-instance-list node, as if its tiles referenced them all.
+    _nodegroup, nodes = nodegroups[0]
+    relation_node = nodes[datatypes.index("resource-instance-list")]
+    ResourceXResource.objects.bulk_create(
+        [
+            make_relation(
+                resource=resource,
+                related_resource=related_resource,
+                node=relation_node,
+            )
+            for related_resource in related_resources
+        ],
+        batch_size=1000,
+    )
+
+    return SimpleNamespace(
+        graph=graph,
+        related_graph=related_graph,
+        resource=resource,
+        nodegroups=nodegroups,
+        related_nodegroup=related_nodegroup,
+        related_nodes=related_nodes,
+        datatypes=datatypes,
+    )
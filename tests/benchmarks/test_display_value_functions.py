@@ -0,0 +1,155 @@
+import statistics
+import time
+from importlib import import_module
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    annotate_related_graph_nodes_with_widget_labels,
+    get_sorted_filtered_relations,
+    get_sorted_filtered_tiles,
+)
+from tests.benchmarks.datasets import (
+    benchmarks_enabled,
+    create_benchmark_dataset,
+    get_dataset_size,
+)
+
+READ_ONLY_FUNCTIONS = import_module(
+    "arches_modular_reports.migrations.0010_display_value_function_volatility"
+).READ_ONLY_FUNCTIONS
+PARALLEL_UNSAFE_FUNCTIONS = import_module(
+    "arches_modular_reports.migrations.0017_display_value_function_parallel_safety"
+).PARALLEL_UNSAFE_FUNCTIONS
+
+
+def set_volatility(volatility, functions=READ_ONLY_FUNCTIONS):
+    with connection.cursor() as cursor:
+        for function in functions:
+            cursor.execute(f"ALTER FUNCTION {function} {volatility};")
+
+
+def set_migrated_volatility():
+    set_volatility("STABLE PARALLEL SAFE")
+    set_volatility("PARALLEL UNSAFE", functions=PARALLEL_UNSAFE_FUNCTIONS)
+
+
+class DisplayValueFunctionVolatilityTests(TestCase):
+    def get_declarations(self, functions):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT oid::regprocedure::text, provolatile, proparallel
+                FROM pg_proc
+                WHERE oid = ANY(%s::regprocedure[])
+                """,
+                [functions],
+            )
+            rows = cursor.fetchall()
+        self.assertEqual(len(rows), len(functions))
+        return {
+            signature: (volatility, parallel)
+            for signature, volatility, parallel in rows
+        }
+
+    def test_functions_are_stable(self):
+        declarations = self.get_declarations(
+            [*READ_ONLY_FUNCTIONS, *PARALLEL_UNSAFE_FUNCTIONS]
+        )
+        for signature, (volatility, parallel) in declarations.items():
+            with self.subTest(function=signature):
+                self.assertEqual(volatility, "s")  # STABLE
+
+    def test_only_functions_with_safe_callees_are_parallel_safe(self):
+        unsafe = self.get_declarations(PARALLEL_UNSAFE_FUNCTIONS)
+        for signature, (volatility, parallel) in unsafe.items():
+            with self.subTest(function=signature):
+                self.assertEqual(parallel, "u")  # PARALLEL UNSAFE
+
+        safe = self.get_declarations(
+            [f for f in READ_ONLY_FUNCTIONS if f not in PARALLEL_UNSAFE_FUNCTIONS]
+        )
+        for signature, (volatility, parallel) in safe.items():
+            with self.subTest(function=signature):
+                self.assertEqual(parallel, "s")  # PARALLEL SAFE
+
+
+@skipUnless(benchmarks_enabled(), "Set MODULAR_REPORTS_BENCHMARK=1 to run.")
+class DisplayValueFunctionBenchmark(TestCase):
+    """Compares plans and timings of the report queries with the display
+    value functions declared VOLATILE PARALLEL UNSAFE (as before migration
+    0010) and as migrated. DDL is transactional, so the test
+    transaction restores the migrated declarations."""
+
+    REPEAT = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(
+            tile_count=get_dataset_size("TILES", 5000),
+            relation_count=get_dataset_size("RELATIONS", 1000),
+        )
+        cls.user = User.objects.create_superuser("benchmark_admin")
+
+    def get_tiles(self):
+        return get_sorted_filtered_tiles(
+            resourceinstanceid=self.dataset.resource.pk,
+            nodegroup_alias="inscription",
+            sort_node_id=str(self.dataset.string_nodes[0].pk),
+            direction="asc",
+            query="inscription",
+            user_language="en",
+            user=self.user,
+            filters=None,
+        )
+
+    def get_relations(self):
+        return get_sorted_filtered_relations(
+            resource=self.dataset.resource,
+            related_graph=self.dataset.related_graph,
+            nodes=annotate_related_graph_nodes_with_widget_labels(
+                ["label_0", "label_1"], self.dataset.related_graph, "en"
+            ),
+            permitted_nodegroups=[
+                self.dataset.relation_nodegroup.pk,
+                self.dataset.related_nodegroup.pk,
+            ],
+            sort_field="label_0",
+            direction="asc",
+            query="label",
+            request_language="en",
+        )
+
+    def measure(self, get_queryset):
+        queryset = get_queryset()
+        plan = queryset.explain(analyze=True)
+        timings = []
+        for _ in range(self.REPEAT):
+            queryset = get_queryset()
+            start = time.perf_counter()
+            rows = [row.pk for row in queryset]
+            timings.append(time.perf_counter() - start)
+        return rows, plan, statistics.median(timings)
+
+    def compare(self, name, get_queryset):
+        set_volatility("VOLATILE PARALLEL UNSAFE")
+        before_rows, before_plan, before_time = self.measure(get_queryset)
+        set_migrated_volatility()
+        after_rows, after_plan, after_time = self.measure(get_queryset)
+
+        print(f"\n{name}: VOLATILE PARALLEL UNSAFE\n{before_plan}")
+        print(f"\n{name}: migrated\n{after_plan}")
+        print(
+            f"\n{name}: median {before_time * 1000:.1f} ms before, "
+            f"{after_time * 1000:.1f} ms after ({len(after_rows)} rows)"
+        )
+        self.assertEqual(before_rows, after_rows)
+
+    def test_sorted_filtered_tiles(self):
+        self.compare("get_sorted_filtered_tiles", self.get_tiles)
+
+    def test_sorted_filtered_relations(self):
+        self.compare("get_sorted_filtered_relations", self.get_relations)
@@ -0,0 +1,115 @@
+import statistics
+import time
+from unittest import skipUnless
+
+from django.db.models import Case, F, Q, When
+from django.db.models.fields.json import KT
+from django.test import TestCase
+
+from arches.app.models.models import ResourceXResource
+
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    get_sorted_filtered_relations,
+)
+from packaging.version import Version
+from tests.benchmarks.datasets import (
+    arches_version,
+    benchmarks_enabled,
+    create_benchmark_dataset,
+    get_dataset_size,
+)
+
+PAGE_SIZE = 25
+
+if arches_version < Version("8.0"):
+    FROM_FIELD = "resourceinstanceidfrom"
+    FROM_GRAPH_FIELD = "resourceinstancefrom_graphid"
+    TO_FIELD = "resourceinstanceidto"
+    TO_GRAPH_FIELD = "resourceinstanceto_graphid"
+    NODE_FIELD = "nodeid"
+else:
+    FROM_FIELD = "from_resource"
+    FROM_GRAPH_FIELD = "from_resource_graph"
+    TO_FIELD = "to_resource"
+    TO_GRAPH_FIELD = "to_resource_graph"
+    NODE_FIELD = "node"
+
+
+@skipUnless(benchmarks_enabled(), "Set MODULAR_REPORTS_BENCHMARK=1 to run.")
+class RelationSourceBenchmark(TestCase):
+    """Compares plans and timings of the relations of a hub resource
+    selected as an OR of both directions with DISTINCT (as before) and as
+    the UNION ALL used by get_sorted_filtered_relations()."""
+
+    REPEAT = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(
+            tile_count=1, relation_count=get_dataset_size("RELATIONS", 20000)
+        )
+        cls.permitted_nodegroups = [cls.dataset.relation_nodegroup.pk]
+
+    def get_or_relations(self):
+        resource = self.dataset.resource
+        related_graph = self.dataset.related_graph
+        return (
+            (
+                ResourceXResource.objects.filter(
+                    Q(**{FROM_FIELD: resource}),
+                    Q(**{TO_GRAPH_FIELD: related_graph}),
+                    Q(**{f"{NODE_FIELD}__nodegroup_id__in": self.permitted_nodegroups}),
+                )
+                | ResourceXResource.objects.filter(
+                    Q(**{TO_FIELD: resource}),
+                    Q(**{FROM_GRAPH_FIELD: related_graph}),
+                    Q(**{f"{NODE_FIELD}__nodegroup_id__in": self.permitted_nodegroups}),
+                )
+            )
+            .distinct()
+            .annotate(
+                display_name_json=Case(
+                    When(Q(**{FROM_FIELD: resource}), then=F(f"{TO_FIELD}__name")),
+                    When(Q(**{TO_FIELD: resource}), then=F(f"{FROM_FIELD}__name")),
+                )
+            )
+            .annotate(**{"@display_name": KT("display_name_json__en")})
+            .order_by(F("@display_name").asc(nulls_last=True), "pk")
+        )
+
+    def get_union_relations(self):
+        return get_sorted_filtered_relations(
+            resource=self.dataset.resource,
+            related_graph=self.dataset.related_graph,
+            nodes=[],
+            permitted_nodegroups=self.permitted_nodegroups,
+            sort_field="@display_name",
+            direction="asc",
+            query="",
+            request_language="en",
+            include_node_values=False,
+        ).order_by(F("@display_name").asc(nulls_last=True), "pk")
+
+    def measure(self, name, get_queryset):
+        results = {}
+        for label, run in {
+            "count": lambda queryset: queryset.count(),
+            "page": lambda queryset: [row.pk for row in queryset[:PAGE_SIZE]],
+        }.items():
+            plan = get_queryset()[:PAGE_SIZE].explain(analyze=True)
+            timings = []
+            for _ in range(self.REPEAT):
+                start = time.perf_counter()
+                results[label] = run(get_queryset())
+                timings.append(time.perf_counter() - start)
+            if label == "page":
+                print(f"\n{name}: page plan\n{plan}")
+            print(
+                f"\n{name}: {label} median {statistics.median(timings) * 1000:.1f} ms"
+            )
+        return results
+
+    def test_relation_source(self):
+        before = self.measure("OR with DISTINCT", self.get_or_relations)
+        after = self.measure("UNION ALL", self.get_union_relations)
+        self.assertEqual(before, after)
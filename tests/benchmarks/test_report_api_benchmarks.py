@@ -0,0 +1,240 @@
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from arches import __version__ as arches_version_str
+from arches.app.utils.permission_backend import get_nodegroups_by_perm
+
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    annotate_node_values,
+    annotate_related_graph_nodes_with_widget_labels,
+    attach_related_node_values,
+    get_sorted_filtered_relations,
+    get_sorted_filtered_tiles,
+)
+from arches_modular_reports.models import ReportConfig
+from tests.benchmarks.datasets import (
+    benchmarks_enabled,
+    create_large_resource_dataset,
+    get_dataset_size,
+)
+
+PAGE_SIZE = 25
+
+
+@skipUnless(benchmarks_enabled(), "Set MODULAR_REPORTS_BENCHMARK=1 to run.")
+class ReportApiBenchmarks(TestCase):
+    """Times the report queries and views on a large generated resource.
+    Set MODULAR_REPORTS_BENCHMARK_OUTPUT to a path to write the results as
+    JSON, e.g. to compare them between commits."""
+
+    REPEAT = 5
+    results = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sizes = {
+            "nodegroups": get_dataset_size("NODEGROUPS", 5),
+            "tiles_per_nodegroup": get_dataset_size("TILES", 500),
+            "related_resources": get_dataset_size("RELATIONS", 500),
+        }
+        cls.dataset = create_large_resource_dataset(
+            nodegroup_count=cls.sizes["nodegroups"],
+            tiles_per_nodegroup=cls.sizes["tiles_per_nodegroup"],
+            related_count=cls.sizes["related_resources"],
+        )
+        report_config = ReportConfig(graph=cls.dataset.graph)
+        report_config.config = report_config.generate_config()
+        report_config.save()
+        cls.user = User.objects.create_superuser("benchmark_admin")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if not (path := os.environ.get("MODULAR_REPORTS_BENCHMARK_OUTPUT")):
+            return
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "created": datetime.now(timezone.utc).isoformat(),
+                    "arches_version": arches_version_str,
+                    "dataset": cls.sizes,
+                    "repeat": cls.REPEAT,
+                    "results": dict(sorted(cls.results.items())),
+                },
+                f,
+                indent=2,
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.resourceid = self.dataset.resource.pk
+        self.nodegroup, self.nodes = self.dataset.nodegroups[0]
+        self.nodegroup_alias = "section_0"
+
+    def benchmark(self, name, func):
+        func()  # warm up
+        timings = []
+        for _ in range(self.REPEAT):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+        self.results[name] = {
+            "median_ms": round(statistics.median(timings) * 1000, 2),
+            "min_ms": round(min(timings) * 1000, 2),
+            "max_ms": round(max(timings) * 1000, 2),
+            "queries": len(queries),
+        }
+        print(f"\n{name}: {self.results[name]}")
+
+    def get_tiles(self, *, sort_node_id=None, query=""):
+        return get_sorted_filtered_tiles(
+            resourceinstanceid=self.resourceid,
+            nodegroup_alias=self.nodegroup_alias,
+            sort_node_id=sort_node_id,
+            direction="asc",
+            query=query,
+            user_language="en",
+            user=self.user,
+            filters=None,
+        )
+
+    def get_related_nodes(self):
+        return annotate_related_graph_nodes_with_widget_labels(
+            [node.alias for node in self.dataset.related_nodes],
+            self.dataset.related_graph,
+            "en",
+        )
+
+    def get_relations(self, *, sort_field="@relation_name", query="", **kwargs):
+        return get_sorted_filtered_relations(
+            resource=self.dataset.resource,
+            related_graph=self.dataset.related_graph,
+            nodes=self.get_related_nodes(),
+            permitted_nodegroups=get_nodegroups_by_perm(
+                self.user, "models.read_nodegroup"
+            ),
+            sort_field=sort_field,
+            direction="asc",
+            query=query,
+            request_language="en",
+            **kwargs,
+        )
+
+    def get_prejoined_relations_page(self):
+        relations = list(self.get_relations(include_node_values=False)[:PAGE_SIZE])
+        attach_related_node_values(
+            relations,
+            nodes=self.get_related_nodes(),
+            permitted_nodegroups=get_nodegroups_by_perm(
+                self.user, "models.read_nodegroup"
+            ),
+            request_language="en",
+        )
+        return relations
+
+    def test_get_sorted_filtered_tiles(self):
+        sort_node_id = str(self.nodes[0].pk)
+        self.benchmark(
+            "get_sorted_filtered_tiles.page",
+            lambda: list(self.get_tiles()[:PAGE_SIZE]),
+        )
+        self.benchmark(
+            "get_sorted_filtered_tiles.sorted_page",
+            lambda: list(self.get_tiles(sort_node_id=sort_node_id)[:PAGE_SIZE]),
+        )
+        self.benchmark(
+            "get_sorted_filtered_tiles.search_count",
+            lambda: self.get_tiles(query="value 1").count(),
+        )
+
+    def test_get_sorted_filtered_relations(self):
+        self.benchmark(
+            "get_sorted_filtered_relations.page",
+            lambda: list(self.get_relations()[:PAGE_SIZE]),
+        )
+        self.benchmark(
+            "get_sorted_filtered_relations.prejoined_page",
+            self.get_prejoined_relations_page,
+        )
+        self.benchmark(
+            "get_sorted_filtered_relations.sorted_page",
+            lambda: list(
+                self.get_relations(sort_field=self.dataset.related_nodes[0].alias)[
+                    :PAGE_SIZE
+                ]
+            ),
+        )
+        self.benchmark(
+            "get_sorted_filtered_relations.search_count",
+            lambda: self.get_relations(query="value 1").count(),
+        )
+
+    def test_annotate_node_values(self):
+        self.benchmark(
+            "annotate_node_values",
+            lambda: list(
+                annotate_node_values(
+                    [node.alias for node in self.nodes],
+                    self.resourceid,
+                    get_nodegroups_by_perm(self.user, "models.read_nodegroup"),
+                    "en",
+                    5,
+                )
+            ),
+        )
+
+    def test_views(self):
+        views = {
+            "modular_report_config": (
+                reverse("modular_report_config"),
+                {"resourceId": str(self.resourceid)},
+            ),
+            "api_report_bootstrap": (
+                reverse("api_report_bootstrap", args=[self.resourceid]),
+                {},
+            ),
+            "api_node_presentation": (
+                reverse("api_node_presentation", args=[self.resourceid]),
+                {},
+            ),
+            "api_node_tile_data": (
+                reverse("api_node_tile_data", args=[self.resourceid]),
+                {"node_alias": [node.alias for node in self.nodes], "tile_limit": 5},
+            ),
+            "api_nodegroup_tile_data": (
+                reverse(
+                    "api_nodegroup_tile_data",
+                    args=[self.resourceid, self.nodegroup_alias],
+                ),
+                {"page": 1, "rows_per_page": PAGE_SIZE, "query": ""},
+            ),
+            "api_related_resources": (
+                reverse(
+                    "api_related_resources",
+                    args=[self.resourceid, self.dataset.related_graph.slug],
+                ),
+                {
+                    "page": 1,
+                    "rows_per_page": PAGE_SIZE,
+                    "node_aliases": ",".join(
+                        node.alias for node in self.dataset.related_nodes
+                    ),
+                },
+            ),
+        }
+        for name, (path, data) in views.items():
+            with self.subTest(view=name):
+                response = self.client.get(path, data)
+                self.assertEqual(response.status_code, 200)
+                self.benchmark(f"view.{name}", lambda: self.client.get(path, data))
@@ -0,0 +1,18 @@
+"""Cache settings for tests of what is cached, for use with
+override_settings(CACHES=...). The test settings use a DummyCache."""
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "modular_reports_tests",
+    },
+    "user_permission": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        "LOCATION": "user_permission_cache",
+    },
+}
+
+DUMMY_CACHES = {
+    alias: {**config, "BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    for alias, config in LOCMEM_CACHES.items()
+}
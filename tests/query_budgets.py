@@ -0,0 +1,32 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """Assertions on the number of SQL queries a request to an endpoint runs,
+    for use in django.test.TestCase subclasses."""
+
+    def get_with_query_count(self, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, data)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, queries.captured_queries
+
+    def assertQueryBudget(self, budget, path, data=None):
+        response, queries = self.get_with_query_count(path, data)
+        self.assertLessEqual(
+            len(queries),
+            budget,
+            f"{path} ran {len(queries)} queries (budget {budget}):\n"
+            + "\n".join(query["sql"] for query in queries),
+        )
+        return response
+
+    def assertQueryCountIndependentOf(self, path, data_variants):
+        """Assert that a request runs as many queries whatever the variant of
+        its parameters, e.g. whatever the page size (i.e. there is no N+1)."""
+        counts = {
+            str(data): len(self.get_with_query_count(path, data)[1])
+            for data in data_variants
+        }
+        self.assertEqual(len(set(counts.values())), 1, counts)
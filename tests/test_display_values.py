@@ -0,0 +1,216 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVector
+from django.core.management import call_command
+from django.db.models import Value
+from django.test import TestCase, override_settings
+
+from arches import __version__ as _arches_version_str
+from arches.app.models.graph import Graph
+from arches.app.models.models import Node, NodeGroup, ResourceInstance, TileModel
+
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    get_sorted_filtered_tiles,
+    serialize_node_tile_data,
+)
+from arches_modular_reports.models import TileDisplayValue
+from packaging.version import Version
+
+arches_version = Version(_arches_version_str)
+
+
+@override_settings(
+    MODULAR_REPORTS_MATERIALIZE_DISPLAY_VALUES=True,
+    LANGUAGES=[("en", "English")],
+)
+class MaterializedDisplayValueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        if arches_version < Version("8.0"):
+            cls.graph = Graph.new(is_resource=True)
+            cls.graph.slug = "materialized_graph"
+            cls.graph.save()
+        else:
+            cls.graph = Graph.objects.create_graph(
+                is_resource=True, slug="materialized_graph"
+            )
+            Graph.objects.filter(slug="materialized_graph").exclude(
+                source_identifier=None
+            ).delete()  # delete draft graph
+
+        cls.nodegroup = NodeGroup.objects.create(cardinality="n")
+        Node.objects.create(
+            pk=cls.nodegroup.pk,
+            name="Inscription",
+            alias="inscription",
+            graph_id=cls.graph.pk,
+            nodegroup=cls.nodegroup,
+            datatype="semantic",
+            istopnode=False,
+        )
+        cls.text_node = Node.objects.create(
+            nodegroup=cls.nodegroup,
+            name="Inscription text",
+            alias="inscription_text",
+            graph_id=cls.graph.pk,
+            istopnode=False,
+            datatype="string",
+        )
+        cls.resource = ResourceInstance.objects.create(graph_id=cls.graph.pk)
+        cls.user = User.objects.create_superuser("materialized_admin")
+
+    def create_tile(self, text):
+        with self.captureOnCommitCallbacks(execute=True):
+            return TileModel.objects.create(
+                resourceinstance=self.resource,
+                nodegroup=self.nodegroup,
+                data={
+                    str(self.text_node.pk): {"en": {"value": text, "direction": "ltr"}}
+                },
+            )
+
+    def get_tiles(self, query=""):
+        return get_sorted_filtered_tiles(
+            resourceinstanceid=self.resource.pk,
+            nodegroup_alias="inscription",
+            sort_node_id=None,
+            direction="asc",
+            query=query,
+            user_language="en",
+            user=self.user,
+            filters=None,
+        )
+
+    def test_saving_tile_stores_display_values(self):
+        tile = self.create_tile("Carved")
+        stored = TileDisplayValue.objects.get(tile_id=tile.pk)
+        self.assertEqual(stored.node_id, self.text_node.pk)
+        self.assertEqual(stored.language, "en")
+        self.assertEqual(stored.display_value, "Carved")
+        self.assertEqual(stored.display_pairs, [{"label": "Carved", "id": None}])
+
+        tile.data[str(self.text_node.pk)]["en"]["value"] = "Painted"
+        with self.captureOnCommitCallbacks(execute=True):
+            tile.save()
+            # Not refreshed until the edit is committed.
+            self.assertEqual(
+                TileDisplayValue.objects.get(tile_id=tile.pk).display_value, "Carved"
+            )
+        self.assertEqual(
+            TileDisplayValue.objects.get(tile_id=tile.pk).display_value, "Painted"
+        )
+
+    def test_reads_use_stored_display_values(self):
+        tile = self.create_tile("Carved")
+        # Bypass signals: reads should come from the stored row.
+        TileDisplayValue.objects.filter(tile_id=tile.pk).update(
+            display_value="Stored",
+            search_vector=SearchVector(Value("Stored"), config="simple"),
+        )
+        (result,) = self.get_tiles(query="stored")
+        self.assertEqual(
+            result.alias_annotations["inscription_text"]["display_value"], "Stored"
+        )
+
+    def test_node_values_use_stored_display_pairs(self):
+        tile = self.create_tile("Carved")
+        TileDisplayValue.objects.filter(tile_id=tile.pk).update(
+            display_pairs=[{"label": "Stored", "id": None}]
+        )
+        self.create_tile("Painted")
+        # Rows stored before display pairs were.
+        TileDisplayValue.objects.exclude(tile_id=tile.pk).update(display_pairs=None)
+
+        node_values = serialize_node_tile_data(
+            ["inscription_text"],
+            self.resource.pk,
+            [self.nodegroup.pk],
+            "en",
+            None,
+            False,
+        )
+        self.assertCountEqual(
+            node_values["inscription_text"],
+            [
+                {"display_values": ["Stored"], "links": []},
+                {"display_values": ["Painted"], "links": []},
+            ],
+        )
+
+    def test_search_matches_word_prefixes(self):
+        carved = self.create_tile("Carved in stone")
+        self.create_tile("Painted on wood")
+        for query in ("carv", "STONE", "in carv", "carved, stone"):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    [tile.pk for tile in self.get_tiles(query)], [carved.pk]
+                )
+        self.assertEqual(list(self.get_tiles("marble")), [])
+
+    def test_tiles_without_stored_display_values(self):
+        tile = self.create_tile("Carved in stone")
+        self.create_tile("Painted on wood")
+        # e.g. saved before display values were materialized.
+        TileDisplayValue.objects.filter(tile_id=tile.pk).delete()
+
+        (result,) = self.get_tiles(query="stone")
+        self.assertEqual(result.pk, tile.pk)
+        self.assertEqual(
+            result.alias_annotations["inscription_text"]["display_value"],
+            "Carved in stone",
+        )
+        self.assertEqual(len(self.get_tiles(query="wood")), 1)
+
+    def test_renaming_referenced_resource_refreshes_display_values(self):
+        referenced = ResourceInstance.objects.create(
+            graph_id=self.graph.pk, descriptors={"en": {"name": "Old name"}}
+        )
+        tile = self.create_tile("Carved")
+        self.create_tile("Painted")
+        # As if the tile referred to the resource.
+        TileDisplayValue.objects.filter(tile_id=tile.pk).update(
+            display_value="Old name",
+            display_pairs=[{"label": "Old name", "id": str(referenced.pk)}],
+        )
+
+        referenced = ResourceInstance.objects.get(pk=referenced.pk)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            referenced.save()
+        self.assertEqual(callbacks, [])
+
+        referenced.descriptors = {"en": {"name": "New name"}}
+        with self.captureOnCommitCallbacks(execute=True):
+            referenced.save()
+        self.assertEqual(
+            TileDisplayValue.objects.get(tile_id=tile.pk).display_value, "Carved"
+        )
+
+    def test_deleting_tile_deletes_display_values(self):
+        tile = self.create_tile("Carved")
+        tile.delete()
+        self.assertFalse(TileDisplayValue.objects.filter(tile_id=tile.pk).exists())
+
+    def test_rebuild_and_clear_commands(self):
+        tile = self.create_tile("Carved")
+        TileDisplayValue.objects.filter(tile_id=tile.pk).update(display_value="Stale")
+
+        call_command(
+            "report_display_values",
+            "rebuild",
+            "--graph",
+            "materialized_graph",
+            stdout=StringIO(),
+        )
+        self.assertEqual(
+            TileDisplayValue.objects.get(tile_id=tile.pk).display_value, "Carved"
+        )
+
+        call_command(
+            "report_display_values",
+            "clear",
+            "--graph",
+            "materialized_graph",
+            stdout=StringIO(),
+        )
+        self.assertFalse(TileDisplayValue.objects.filter(tile_id=tile.pk).exists())
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from arches_modular_reports.app.utils.node_presentation import (
+    get_node_presentation,
+)
+from tests.benchmarks.datasets import create_benchmark_dataset
+from tests.caches import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class NodePresentationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(tile_count=1, relation_count=0)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_presentation_is_masked_by_permitted_nodegroups(self):
+        presentation = get_node_presentation(
+            self.dataset.graph, {self.dataset.nodegroup.pk}
+        )
+        self.assertEqual(
+            set(presentation),
+            {"inscription", *(node.alias for node in self.dataset.string_nodes)},
+        )
+        self.assertEqual(
+            set(
+                get_node_presentation(
+                    self.dataset.graph, {self.dataset.relation_nodegroup.pk}
+                )
+            ),
+            {"related", "related_0"},
+        )
+
+    def test_presentation_is_compiled_once_per_graph_edit(self):
+        permitted_nodegroups = {self.dataset.nodegroup.pk}
+        get_node_presentation(self.dataset.graph, permitted_nodegroups)
+        with self.assertNumQueries(0):
+            get_node_presentation(self.dataset.graph, permitted_nodegroups)
+
+        node = self.dataset.string_nodes[0]
+        node.name = "Renamed"
+        node.save()
+        presentation = get_node_presentation(self.dataset.graph, permitted_nodegroups)
+        self.assertEqual(presentation[node.alias]["name"], "Renamed")
@@ -0,0 +1,54 @@
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from arches_modular_reports.app.utils.permission_profiles import (
+    get_permission_profile,
+)
+from tests.caches import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PermissionProfileTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("profile_admin")
+        cls.other_admin = User.objects.create_superuser("other_profile_admin")
+        cls.user = User.objects.create_user("profile_user")
+        cls.other_user = User.objects.create_user("other_profile_user")
+        cls.rdm_group, _created = Group.objects.get_or_create(name="RDM Administrator")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_profiles_are_cached_per_user(self):
+        profile = get_permission_profile(self.admin)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_permission_profile(self.admin), profile)
+
+    def test_users_with_the_same_permissions_share_a_fingerprint(self):
+        self.assertEqual(
+            get_permission_profile(self.admin).fingerprint,
+            get_permission_profile(self.other_admin).fingerprint,
+        )
+        self.assertEqual(
+            get_permission_profile(self.user).fingerprint,
+            get_permission_profile(self.other_user).fingerprint,
+        )
+        self.assertNotEqual(
+            get_permission_profile(self.admin).fingerprint,
+            get_permission_profile(self.user).fingerprint,
+        )
+
+    def test_group_membership_invalidates_profiles(self):
+        before = get_permission_profile(self.user)
+        self.assertFalse(before.is_rdm_admin)
+
+        self.user.groups.add(self.rdm_group)
+
+        after = get_permission_profile(self.user)
+        self.assertTrue(after.is_rdm_admin)
+        self.assertNotEqual(after.fingerprint, before.fingerprint)
+        self.assertNotEqual(
+            after.fingerprint, get_permission_profile(self.other_user).fingerprint
+        )
@@ -0,0 +1,83 @@
+import uuid
+from types import SimpleNamespace
+
+from django.test import TestCase
+from django.urls import reverse
+
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    get_relation_display_pairs,
+    prepare_links,
+    resolve_display_pairs,
+)
+
+
+class PrepareLinksTests(TestCase):
+    def test_concept_list_links_come_from_display_pairs(self):
+        node = SimpleNamespace(datatype="concept-list")
+        concept_id = str(uuid.uuid4())
+        display_pairs = [
+            {"label": "Stone", "id": concept_id},
+            # e.g. a concept value deleted since the tile was saved
+            {"label": "", "id": None},
+            {"label": "Wood", "id": concept_id},
+        ]
+        with self.assertNumQueries(0):
+            links = prepare_links(node, [], display_pairs, "en", True)
+        self.assertEqual(
+            links,
+            [
+                {"label": "Stone", "link": reverse("rdm", args=[concept_id])},
+                {"label": "Wood", "link": reverse("rdm", args=[concept_id])},
+            ],
+        )
+
+        self.assertEqual(prepare_links(node, [], display_pairs, "en", False), [])
+
+    def test_resource_instance_list_links_need_no_queries(self):
+        node = SimpleNamespace(alias="related", datatype="resource-instance-list")
+        resource_ids = [str(uuid.uuid4()) for _ in range(3)]
+        # One list of pairs per related tile, as annotated on a relation.
+        relation = SimpleNamespace(
+            related_display_pairs=[
+                [
+                    {"label": "First", "id": resource_ids[0]},
+                    {"label": "Second", "id": resource_ids[1]},
+                ],
+                [{"label": "Third", "id": resource_ids[2]}],
+            ]
+        )
+        with self.assertNumQueries(0):
+            links = prepare_links(
+                node,
+                [],
+                get_relation_display_pairs(relation, node),
+                "en",
+                False,
+            )
+        self.assertEqual(
+            links,
+            [
+                {
+                    "label": label,
+                    "link": reverse("resource_report", args=[resource_id]),
+                }
+                for label, resource_id in zip(
+                    ["First", "Second", "Third"], resource_ids
+                )
+            ],
+        )
+
+    def test_unnamed_resources_are_undefined(self):
+        resource_id = str(uuid.uuid4())
+        self.assertEqual(
+            resolve_display_pairs(
+                [{"label": None, "id": resource_id}, {"label": "", "id": None}]
+            ),
+            [{"label": "Undefined", "id": resource_id}, {"label": "", "id": None}],
+        )
+
+    def test_unlinked_datatypes(self):
+        node = SimpleNamespace(datatype="string")
+        self.assertEqual(
+            prepare_links(node, [], [{"label": "Text", "id": None}], "en", True), []
+        )
@@ -0,0 +1,120 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from arches_modular_reports.metrics_registry import register, unregister
+from arches_modular_reports.models import ReportConfig
+from tests.benchmarks.datasets import create_benchmark_dataset
+from tests.query_budgets import QueryBudgetMixin
+
+# Ceilings with a few queries of headroom for the session, authentication
+# and Arches permission checks; lower them when an endpoint gets cheaper.
+QUERY_BUDGETS = {
+    "modular_report_config": 20,
+    "api_node_presentation": 18,
+    "api_node_tile_data": 18,
+    "api_nodegroup_tile_data": 22,
+    "api_related_resources": 22,
+    "api_related_resource_counts": 15,
+    "api_report_bootstrap": 30,
+}
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(tile_count=30, relation_count=30)
+        report_config = ReportConfig(graph=cls.dataset.graph)
+        report_config.config = report_config.generate_config()
+        report_config.save()
+        cls.user = User.objects.create_superuser("query_budget_admin")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.resourceid = self.dataset.resource.pk
+
+    def test_report_config(self):
+        self.assertQueryBudget(
+            QUERY_BUDGETS["modular_report_config"],
+            reverse("modular_report_config"),
+            {"resourceId": str(self.resourceid)},
+        )
+
+    def test_node_presentation(self):
+        self.assertQueryBudget(
+            QUERY_BUDGETS["api_node_presentation"],
+            reverse("api_node_presentation", args=[self.resourceid]),
+        )
+
+    def test_node_tile_data(self):
+        self.assertQueryBudget(
+            QUERY_BUDGETS["api_node_tile_data"],
+            reverse("api_node_tile_data", args=[self.resourceid]),
+            {"node_alias": ["inscription_0", "inscription_1"]},
+        )
+
+    def test_nodegroup_tile_data(self):
+        path = reverse("api_nodegroup_tile_data", args=[self.resourceid, "inscription"])
+        data = {"page": 1, "rows_per_page": 25, "query": ""}
+        self.assertQueryBudget(QUERY_BUDGETS["api_nodegroup_tile_data"], path, data)
+        self.assertQueryCountIndependentOf(
+            path, [{**data, "rows_per_page": 5}, {**data, "rows_per_page": 25}]
+        )
+
+    def test_related_resources(self):
+        path = reverse(
+            "api_related_resources",
+            args=[self.resourceid, self.dataset.related_graph.slug],
+        )
+        data = {"page": 1, "rows_per_page": 25, "node_aliases": "label_0,label_1"}
+        self.assertQueryBudget(QUERY_BUDGETS["api_related_resources"], path, data)
+        self.assertQueryCountIndependentOf(
+            path, [{**data, "rows_per_page": 5}, {**data, "rows_per_page": 25}]
+        )
+
+    def test_related_resource_counts(self):
+        self.assertQueryBudget(
+            QUERY_BUDGETS["api_related_resource_counts"],
+            reverse("api_related_resource_counts", args=[self.resourceid]),
+        )
+
+    def test_report_bootstrap(self):
+        self.assertQueryBudget(
+            QUERY_BUDGETS["api_report_bootstrap"],
+            reverse("api_report_bootstrap", args=[self.resourceid]),
+        )
+
+
+class InstrumentationTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(tile_count=5, relation_count=0)
+        cls.user = User.objects.create_superuser("instrumentation_admin")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.path = reverse("api_node_presentation", args=[self.dataset.resource.pk])
+        self.recorded = []
+        register("test", lambda request, metrics: self.recorded.append(metrics))
+        self.addCleanup(unregister, "test")
+
+    @override_settings(MODULAR_REPORTS_INSTRUMENTATION=True)
+    def test_metrics_are_reported(self):
+        response, queries = self.get_with_query_count(self.path)
+
+        (metrics,) = self.recorded
+        self.assertEqual(metrics.view_name, "api_node_presentation")
+        # Session and authentication queries run outside the view.
+        self.assertGreater(metrics.query_count, 0)
+        self.assertLessEqual(metrics.query_count, len(queries))
+        self.assertEqual(metrics.status_code, 200)
+        self.assertEqual(metrics.response_size, len(response.content))
+        self.assertGreater(metrics.serialization_time, 0)
+        self.assertIn(
+            f'db;desc="{metrics.query_count} queries"', response["Server-Timing"]
+        )
+
+    def test_disabled_by_default(self):
+        response, _queries = self.get_with_query_count(self.path)
+        self.assertEqual(self.recorded, [])
+        self.assertNotIn("Server-Timing", response)
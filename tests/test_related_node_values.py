@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from arches.app.utils.permission_backend import get_nodegroups_by_perm
+
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    annotate_related_graph_nodes_with_widget_labels,
+    attach_related_node_values,
+    get_sorted_filtered_relations,
+)
+from tests.benchmarks.datasets import create_benchmark_dataset
+
+
+class RelatedNodeValuesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(tile_count=1, relation_count=4)
+        cls.user = User.objects.create_superuser("related_values_admin")
+
+    def setUp(self):
+        self.nodes = annotate_related_graph_nodes_with_widget_labels(
+            [node.alias for node in self.dataset.related_nodes],
+            self.dataset.related_graph,
+            "en",
+        )
+        self.permitted_nodegroups = get_nodegroups_by_perm(
+            self.user, "models.read_nodegroup"
+        )
+
+    def get_relations(self, **kwargs):
+        return get_sorted_filtered_relations(
+            resource=self.dataset.resource,
+            related_graph=self.dataset.related_graph,
+            nodes=self.nodes,
+            permitted_nodegroups=self.permitted_nodegroups,
+            sort_field="@display_name",
+            direction="asc",
+            query="",
+            request_language="en",
+            **kwargs,
+        )
+
+    def test_attached_values_match_annotations(self):
+        annotated = list(self.get_relations())
+        prejoined = list(self.get_relations(include_node_values=False))
+        self.assertNotIn(self.nodes[0].alias, vars(prejoined[0]))
+
+        # One query for the single nodegroup of the requested nodes.
+        with self.assertNumQueries(1):
+            attach_related_node_values(
+                prejoined,
+                nodes=self.nodes,
+                permitted_nodegroups=self.permitted_nodegroups,
+                request_language="en",
+            )
+
+        self.assertEqual(len(prejoined), 4)
+        annotated_by_pk = {relation.pk: relation for relation in annotated}
+        for relation in prejoined:
+            for node in self.nodes:
+                self.assertEqual(
+                    getattr(relation, node.alias),
+                    getattr(annotated_by_pk[relation.pk], node.alias),
+                )
+
+    def test_view_rows_per_page(self):
+        self.client.force_login(self.user)
+        path = reverse(
+            "api_related_resources",
+            args=[self.dataset.resource.pk, self.dataset.related_graph.slug],
+        )
+        response = self.client.get(path, {"rows_per_page": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 2)
+
+        for rows_per_page in ("many", "0", "-1", "100000"):
+            with self.subTest(rows_per_page=rows_per_page):
+                response = self.client.get(path, {"rows_per_page": rows_per_page})
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,147 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from arches.app.models.models import ResourceInstance, TileModel
+from arches.app.utils.permission_backend import get_nodegroups_by_perm
+
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    get_relation_counts_by_graph,
+)
+from arches_modular_reports.app.utils.relation_counts import (
+    get_relation_count,
+    get_relation_counts,
+)
+from tests.benchmarks.datasets import create_benchmark_dataset, make_relation
+from tests.caches import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RelationCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(tile_count=1, relation_count=3)
+        cls.user = User.objects.create_superuser("relation_count_admin")
+
+    def setUp(self):
+        cache.clear()
+        self.permitted_nodegroups = get_nodegroups_by_perm(
+            self.user, "models.read_nodegroup"
+        )
+
+    def get_count(self):
+        return get_relation_count(
+            resource=self.dataset.resource,
+            related_graph=self.dataset.related_graph,
+            permitted_nodegroups=self.permitted_nodegroups,
+        )
+
+    def add_relation(self):
+        related_resource = ResourceInstance.objects.create(
+            graph_id=self.dataset.related_graph.pk
+        )
+        relation = make_relation(
+            resource=self.dataset.resource,
+            related_resource=related_resource,
+            node=self.dataset.relation_node,
+        )
+        relation.save()
+        return relation
+
+    def test_count_is_cached(self):
+        self.assertEqual(self.get_count(), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_count(), 3)
+
+    def test_saving_or_deleting_relation_invalidates(self):
+        self.get_count()
+        relation = self.add_relation()
+        self.assertEqual(self.get_count(), 4)
+        relation.delete()
+        self.assertEqual(self.get_count(), 3)
+
+    def test_saving_or_deleting_tile_with_related_resources_invalidates(self):
+        self.get_count()
+        related_resource = ResourceInstance.objects.create(
+            graph_id=self.dataset.related_graph.pk
+        )
+        node_id = str(self.dataset.relation_node.pk)
+        # The relation is written by a database function, not the ORM.
+        tile = TileModel.objects.create(
+            resourceinstance=self.dataset.resource,
+            nodegroup=self.dataset.relation_nodegroup,
+            data={
+                node_id: [
+                    {
+                        "resourceId": str(related_resource.pk),
+                        "ontologyProperty": "",
+                        "inverseOntologyProperty": "",
+                    }
+                ]
+            },
+        )
+        self.assertEqual(self.get_count(), 4)
+
+        tile.data[node_id] = None
+        tile.save()
+        self.assertEqual(self.get_count(), 3)
+
+        tile.data[node_id] = [{"resourceId": str(related_resource.pk)}]
+        tile.save()
+        self.assertEqual(self.get_count(), 4)
+        tile.delete()
+        self.assertEqual(self.get_count(), 3)
+
+    def test_saving_tile_without_related_resources_skips_previous_data(self):
+        tile = TileModel.objects.filter(nodegroup=self.dataset.nodegroup).first()
+        tile.save()  # caches the nodegroup's resource-instance nodes
+        with CaptureQueriesContext(connection) as queries:
+            tile.save()
+        self.assertFalse(
+            [
+                query["sql"]
+                for query in queries
+                if query["sql"].startswith('SELECT "tiles"."tiledata"')
+            ]
+        )
+
+    def test_only_permitted_nodegroups_are_counted(self):
+        self.permitted_nodegroups = []
+        self.assertEqual(self.get_count(), 0)
+
+    def test_counts_are_shared_across_unrelated_nodegroups(self):
+        counts = get_relation_counts(
+            resource=self.dataset.resource,
+            permitted_nodegroups=self.permitted_nodegroups,
+        )
+        self.assertEqual(counts, {self.dataset.related_graph.slug: 3})
+        # e.g. a user who can also read a nodegroup of an unrelated graph
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_relation_counts(
+                    resource=self.dataset.resource,
+                    permitted_nodegroups=[*self.permitted_nodegroups, uuid.uuid4()],
+                ),
+                counts,
+            )
+
+        self.add_relation()
+        self.assertEqual(
+            get_relation_counts(
+                resource=self.dataset.resource,
+                permitted_nodegroups=self.permitted_nodegroups,
+            ),
+            {self.dataset.related_graph.slug: 4},
+        )
+
+    def test_counts_by_graph(self):
+        with self.assertNumQueries(1):
+            counts = get_relation_counts_by_graph(
+                resource=self.dataset.resource,
+                permitted_nodegroups=self.permitted_nodegroups,
+            )
+        self.assertEqual(counts, {self.dataset.related_graph.slug: 3})
@@ -0,0 +1,85 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from arches import __version__ as _arches_version_str
+from arches.app.models.graph import Graph
+from arches.app.models.models import Node, NodeGroup, ResourceInstance
+
+from arches_modular_reports.app.utils.report_config_cache import (
+    get_permitted_report_config,
+)
+from arches_modular_reports.models import ReportConfig
+from packaging.version import Version
+from tests.caches import LOCMEM_CACHES
+
+arches_version = Version(_arches_version_str)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReportConfigCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        if arches_version < Version("8.0"):
+            cls.graph = Graph.new(is_resource=True)
+            cls.graph.slug = "cached_graph"
+            cls.graph.save()
+        else:
+            cls.graph = Graph.objects.create_graph(
+                is_resource=True, slug="cached_graph"
+            )
+            Graph.objects.filter(slug="cached_graph").exclude(
+                source_identifier=None
+            ).delete()  # delete draft graph
+
+        cls.nodegroup = NodeGroup.objects.create()
+        cls.grouping_node = Node.objects.create(
+            pk=cls.nodegroup.pk,
+            name="Production",
+            alias="production",
+            graph_id=cls.graph.pk,
+            nodegroup=cls.nodegroup,
+            datatype="semantic",
+            istopnode=False,
+        )
+        Node.objects.create(
+            nodegroup=cls.nodegroup,
+            name="Name content",
+            alias="name_content",
+            graph_id=cls.graph.pk,
+            istopnode=False,
+            datatype="string",
+        )
+        cls.report_config = ReportConfig(graph_id=cls.graph.pk)
+        cls.report_config.config = cls.report_config.generate_config()
+        cls.report_config.save()
+        cls.resource = ResourceInstance.objects.create(graph_id=cls.graph.pk)
+        cls.user = User.objects.create_superuser("cache_admin")
+
+    def get_config(self):
+        return get_permitted_report_config(self.resource.pk, "default", self.user)
+
+    def test_cached_config_is_reused(self):
+        first = self.get_config()
+        # Bypass signals: the cached copy should still be served.
+        ReportConfig.objects.filter(pk=self.report_config.pk).update(
+            config={**first, "name": "Changed behind the cache"}
+        )
+        self.assertEqual(self.get_config()["name"], first["name"])
+
+    def test_saving_report_config_invalidates(self):
+        self.get_config()
+        self.report_config.config["name"] = "Renamed"
+        self.report_config.save()
+        self.assertEqual(self.get_config()["name"], "Renamed")
+
+    def test_saving_node_invalidates(self):
+        self.get_config()
+        ReportConfig.objects.filter(pk=self.report_config.pk).update(
+            config={**self.report_config.config, "name": "Renamed"}
+        )
+        self.grouping_node.save()
+        self.assertEqual(self.get_config()["name"], "Renamed")
+
+    def test_missing_slug_raises(self):
+        with self.assertRaises(ReportConfig.DoesNotExist):
+            get_permitted_report_config(self.resource.pk, "missing", self.user)
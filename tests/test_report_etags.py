@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from arches.app.models.models import ResourceInstance, TileModel
+
+from arches_modular_reports.models import ReportConfig
+from tests.benchmarks.datasets import (
+    create_benchmark_dataset,
+    create_concept_values,
+    make_relation,
+    make_string_tile_data,
+)
+from tests.caches import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReportETagTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(tile_count=5, relation_count=0)
+        cls.report_config = ReportConfig(graph=cls.dataset.graph)
+        cls.report_config.config = cls.report_config.generate_config()
+        cls.report_config.save()
+        cls.user = User.objects.create_superuser("etag_admin")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.paths = [
+            reverse("api_report_bootstrap", args=[self.dataset.resource.pk]),
+            reverse("api_node_presentation", args=[self.dataset.resource.pk]),
+            reverse("api_node_tile_data", args=[self.dataset.resource.pk]),
+        ]
+
+    def get_etags(self):
+        etags = []
+        for path in self.paths:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertIn("no-cache", response["Cache-Control"])
+            etags.append(response["ETag"])
+        return etags
+
+    def test_unchanged_reports_are_not_modified(self):
+        for path, etag in zip(self.paths, self.get_etags()):
+            with self.subTest(path=path):
+                with CaptureQueriesContext(connection) as full_queries:
+                    self.client.get(path)
+                with CaptureQueriesContext(connection) as conditional_queries:
+                    response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+                self.assertLess(len(conditional_queries), len(full_queries))
+
+    def test_edits_change_etags(self):
+        etags = self.get_etags()
+
+        TileModel.objects.create(
+            resourceinstance=self.dataset.resource,
+            nodegroup=self.dataset.nodegroup,
+            sortorder=5,
+            data=make_string_tile_data(self.dataset.string_nodes, "Inscription 5"),
+        )
+        edited_etags = self.get_etags()
+        for etag, edited_etag in zip(etags, edited_etags):
+            self.assertNotEqual(etag, edited_etag)
+
+        self.report_config.save()
+        updated_etags = self.get_etags()
+        for etag, updated_etag in zip(edited_etags, updated_etags):
+            self.assertNotEqual(etag, updated_etag)
+
+        # Bumps the graph's version.
+        self.dataset.string_nodes[0].save()
+        for etag, graph_etag in zip(updated_etags, self.get_etags()):
+            self.assertNotEqual(etag, graph_etag)
+
+    def test_referenced_labels_change_etags(self):
+        referenced = ResourceInstance.objects.create(
+            graph_id=self.dataset.related_graph.pk,
+            descriptors={"en": {"name": "Old name"}},
+        )
+        make_relation(
+            resource=self.dataset.resource,
+            related_resource=referenced,
+            node=self.dataset.relation_node,
+        ).save()
+        etags = self.get_etags()
+
+        referenced = ResourceInstance.objects.get(pk=referenced.pk)
+        referenced.descriptors = {"en": {"name": "New name"}}
+        referenced.save()
+        renamed_etags = self.get_etags()
+        for etag, renamed_etag in zip(etags, renamed_etags):
+            self.assertNotEqual(etag, renamed_etag)
+
+        create_concept_values(1)
+        for etag, concept_etag in zip(renamed_etags, self.get_etags()):
+            self.assertNotEqual(etag, concept_etag)
@@ -0,0 +1,101 @@
+import csv
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from arches_modular_reports.app.utils.report_export import stream_json
+from arches_modular_reports.models import ReportConfig
+from tests.benchmarks.datasets import create_benchmark_dataset
+
+COMPONENTS = "arches_modular_reports/ModularReport/components/"
+
+
+class ReportExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(tile_count=3, relation_count=2)
+        ReportConfig.objects.create(
+            graph=cls.dataset.graph,
+            config={
+                "name": "Export",
+                "components": [
+                    {
+                        "component": COMPONENTS + "ReportTombstone",
+                        "config": {"node_aliases": ["inscription_0"]},
+                    },
+                    {
+                        "component": COMPONENTS + "DataSection",
+                        "config": {
+                            "nodegroup_alias": "inscription",
+                            "node_aliases": ["inscription_0", "inscription_1"],
+                            "custom_labels": {"inscription_1": "Second"},
+                        },
+                    },
+                    {
+                        "component": COMPONENTS + "RelatedResourcesSection",
+                        "config": {
+                            "graph_slug": "benchmark_related_graph",
+                            "node_aliases": ["label_0"],
+                            "custom_labels": {"label_0": "Label"},
+                        },
+                    },
+                ],
+            },
+        )
+        cls.user = User.objects.create_superuser("export_admin")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.path = reverse("api_report_export", args=[self.dataset.resource.pk])
+
+    def test_ndjson_export(self):
+        response = self.client.get(self.path, {"format": "ndjson"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+
+        # One tombstone row, one row per tile, and one per relation.
+        self.assertEqual(len(lines), 1 + 3 + 2)
+        self.assertEqual(
+            [line["values"].get("Second") for line in lines[1:4]],
+            ["Inscription 0 1", "Inscription 1 1", "Inscription 2 1"],
+        )
+        self.assertEqual(
+            sorted(line["values"]["Label"] for line in lines[4:]),
+            ["Label 0 0", "Label 1 0"],
+        )
+
+    def test_csv_export(self):
+        response = self.client.get(self.path, {"format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(
+            csv.reader(b"".join(response.streaming_content).decode().splitlines())
+        )
+        # A header row for each of the three sections.
+        self.assertEqual(len(rows), 3 + 1 + 3 + 2)
+        self.assertEqual(rows[2][-1], "Second")
+
+    def test_unsupported_format(self):
+        response = self.client.get(self.path, {"format": "xlsx"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_sections_sharing_a_name_keep_their_columns(self):
+        rows = [
+            ("Inscriptions", {"Text": "Carved"}),
+            ("Inscriptions", {"Language": "Latin"}),
+            ("Inscriptions", {"Language": "Greek"}),
+        ]
+        self.assertEqual(
+            json.loads("".join(stream_json(iter(rows)))),
+            [
+                {"section": "Inscriptions", "rows": [{"Text": "Carved"}]},
+                {
+                    "section": "Inscriptions",
+                    "rows": [{"Language": "Latin"}, {"Language": "Greek"}],
+                },
+            ],
+        )
@@ -0,0 +1,153 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from arches.app.models.models import UserXNotification, UserXTask
+
+from arches_modular_reports.app.utils.report_export import (
+    REPORT_FILE_EXPIRY,
+    delete_expired_report_files,
+    stream_html,
+)
+from arches_modular_reports.app.utils.report_jobs import start_report_file_job
+from arches_modular_reports.models import ReportConfig
+from arches_modular_reports.tasks import generate_report_file
+from tests.benchmarks.datasets import create_benchmark_dataset
+from tests.caches import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReportFileJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(tile_count=3, relation_count=2)
+        ReportConfig.objects.create(
+            graph=cls.dataset.graph,
+            config={
+                "name": "Export",
+                "components": [
+                    {
+                        "component": "arches_modular_reports/ModularReport/components/DataSection",
+                        "config": {
+                            "nodegroup_alias": "inscription",
+                            "node_aliases": ["inscription_0"],
+                        },
+                    },
+                ],
+            },
+        )
+        cls.user = User.objects.create_superuser("report_job_admin")
+        cls.other_user = User.objects.create_superuser("other_report_job_admin")
+
+    def setUp(self):
+        cache.clear()
+
+    def start_job(self, user, file_format="csv"):
+        return start_report_file_job(
+            user=user,
+            resourceid=self.dataset.resource.pk,
+            report_config_slug="default",
+            file_format=file_format,
+            language="en",
+        )
+
+    @mock.patch.object(generate_report_file, "apply_async")
+    def test_concurrent_requests_share_a_job(self, apply_async):
+        task_id = self.start_job(self.user)
+        self.assertEqual(self.start_job(self.other_user), task_id)
+        apply_async.assert_called_once()
+
+        self.assertNotEqual(self.start_job(self.user, "json"), task_id)
+        self.assertEqual(apply_async.call_count, 2)
+
+    def test_job_writes_file_and_notifies_waiting_users(self):
+        with mock.patch.object(generate_report_file, "apply_async") as apply_async:
+            task_id = self.start_job(self.user)
+            self.start_job(self.other_user)
+        args = apply_async.call_args.kwargs["args"]
+
+        with tempfile.TemporaryDirectory() as media_root:
+            with self.settings(MEDIA_ROOT=media_root):
+                result = generate_report_file.apply(args=args, task_id=task_id).get()
+                with default_storage.open(result["file_name"]) as f:
+                    self.assertIn(b"Inscription 0 0", f.read())
+
+                path = reverse("api_report_file", args=[self.dataset.resource.pk])
+                self.client.force_login(self.other_user)
+                response = self.client.get(path, {"taskid": task_id, "format": "csv"})
+                self.assertIn(b"Inscription 0 0", b"".join(response.streaming_content))
+                response = self.client.get(path, {"taskid": task_id, "format": "json"})
+                self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(
+            set(
+                UserXNotification.objects.values_list("recipient__username", flat=True)
+            ),
+            {"report_job_admin", "other_report_job_admin"},
+        )
+        self.assertEqual(
+            list(
+                UserXTask.objects.filter(taskid=task_id).values_list(
+                    "status", flat=True
+                )
+            ),
+            ["SUCCESS", "SUCCESS"],
+        )
+        # A finished job is no longer joined.
+        with mock.patch.object(generate_report_file, "apply_async"):
+            self.assertNotEqual(self.start_job(self.user), task_id)
+
+    def test_failed_job_notifies_waiting_users(self):
+        with mock.patch.object(generate_report_file, "apply_async") as apply_async:
+            task_id = self.start_job(self.user)
+        args = apply_async.call_args.kwargs["args"]
+
+        with mock.patch(
+            "arches_modular_reports.tasks.iter_report_rows", side_effect=ValueError
+        ):
+            result = generate_report_file.apply(args=args, task_id=task_id)
+        self.assertTrue(result.failed())
+
+        self.assertEqual(
+            UserXTask.objects.get(taskid=task_id, user=self.user).status, "ERROR"
+        )
+        self.assertTrue(UserXNotification.objects.filter(recipient=self.user).exists())
+        with mock.patch.object(generate_report_file, "apply_async"):
+            self.assertNotEqual(self.start_job(self.user), task_id)
+
+    def test_expired_files_are_deleted(self):
+        with tempfile.TemporaryDirectory() as media_root:
+            with self.settings(MEDIA_ROOT=media_root):
+                expired = default_storage.save(
+                    "modular_reports/expired.csv", ContentFile(b"")
+                )
+                recent = default_storage.save(
+                    "modular_reports/recent.csv", ContentFile(b"")
+                )
+                written = time.time() - REPORT_FILE_EXPIRY - 60
+                os.utime(default_storage.path(expired), (written, written))
+
+                delete_expired_report_files(default_storage)
+                self.assertFalse(default_storage.exists(expired))
+                self.assertTrue(default_storage.exists(recent))
+
+    def test_html_is_streamed_by_row(self):
+        rows = [
+            ("Inscriptions", {"Text": "<b>Carved</b>"}),
+            ("Inscriptions", {"Text": "Painted"}),
+        ]
+        chunks = list(stream_html(iter(rows), title="Report"))
+        page = "".join(chunks)
+        self.assertIn("<h2>Inscriptions</h2>", page)
+        self.assertIn("<td>&lt;b&gt;Carved&lt;/b&gt;</td>", page)
+        self.assertIn("<td>Painted</td>", page)
+        self.assertGreater(len(chunks), len(rows))
+        self.assertIn("no data", "".join(stream_html(iter([]), title="Report")))
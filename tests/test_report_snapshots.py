@@ -0,0 +1,174 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from arches.app.models.models import GraphModel, TileModel
+
+from arches_modular_reports.app.utils.report_jobs import get_report_snapshot
+from arches_modular_reports.app.utils.report_snapshots import (
+    SNAPSHOT_ROWS_PER_PAGE,
+    build_report_snapshot,
+)
+from arches_modular_reports.models import ReportConfig
+from tests.benchmarks.datasets import create_benchmark_dataset, make_string_tile_data
+from tests.caches import DUMMY_CACHES, LOCMEM_CACHES
+
+MODULAR_REPORT_TEMPLATE_ID = "b0908227-ecc2-48dd-931b-314a9031caa0"
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@mock.patch(
+    "arches_modular_reports.app.utils.report_jobs.check_if_celery_available",
+    return_value=False,
+)
+class ReportSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = create_benchmark_dataset(tile_count=3, relation_count=2)
+        GraphModel.objects.filter(pk=cls.dataset.graph.pk).update(
+            template_id=MODULAR_REPORT_TEMPLATE_ID
+        )
+        ReportConfig.objects.create(
+            graph=cls.dataset.graph,
+            config={
+                "name": "Snapshot",
+                "components": [
+                    {
+                        "component": "arches_modular_reports/ModularReport/components/DataSection",
+                        "config": {
+                            "nodegroup_alias": "inscription",
+                            "node_aliases": ["inscription_0"],
+                        },
+                    },
+                    {
+                        "component": "arches_modular_reports/ModularReport/components/RelatedResourcesSection",
+                        "config": {
+                            "graph_slug": "benchmark_related_graph",
+                            "node_aliases": ["label_0"],
+                        },
+                    },
+                ],
+            },
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_snapshot(self):
+        return get_report_snapshot(
+            resourceid=self.dataset.resource.pk,
+            graph_id=self.dataset.graph.pk,
+            report_config_slug="default",
+            language="en",
+        )
+
+    def test_snapshot_holds_first_pages(self, check_if_celery_available):
+        snapshot = build_report_snapshot(
+            resourceid=self.dataset.resource.pk, report_config_slug="default"
+        )
+
+        self.assertEqual(snapshot["bootstrap"]["config"]["name"], "Snapshot")
+        self.assertEqual(snapshot["rows_per_page"], SNAPSHOT_ROWS_PER_PAGE)
+        self.assertEqual(
+            snapshot["related_resource_counts"]["counts"],
+            {"benchmark_related_graph": 2},
+        )
+        self.assertEqual(
+            snapshot["nodegroup_tile_data"]["inscription"]["total_count"], 3
+        )
+        self.assertEqual(
+            snapshot["related_resources"]["benchmark_related_graph"]["total_count"], 2
+        )
+
+    def test_snapshot_is_rebuilt_when_tiles_change(self, check_if_celery_available):
+        snapshot = self.get_snapshot()
+        self.assertEqual(
+            snapshot["nodegroup_tile_data"]["inscription"]["total_count"], 3
+        )
+
+        with mock.patch(
+            "arches_modular_reports.tasks.build_report_snapshot"
+        ) as build_snapshot:
+            self.assertEqual(self.get_snapshot(), snapshot)
+        build_snapshot.assert_not_called()
+
+        TileModel.objects.create(
+            resourceinstance=self.dataset.resource,
+            nodegroup=self.dataset.nodegroup,
+            sortorder=3,
+            data=make_string_tile_data(self.dataset.string_nodes, "Inscription 3"),
+        )
+        snapshot = self.get_snapshot()
+        self.assertEqual(
+            snapshot["nodegroup_tile_data"]["inscription"]["total_count"], 4
+        )
+
+    def test_failed_build_is_not_retried(self, check_if_celery_available):
+        with mock.patch(
+            "arches_modular_reports.tasks.build_report_snapshot",
+            side_effect=User.DoesNotExist,
+        ) as build_snapshot:
+            with self.assertLogs(
+                "arches_modular_reports.app.utils.report_jobs", "ERROR"
+            ):
+                self.assertIsNone(self.get_snapshot())
+            self.assertIsNone(self.get_snapshot())
+        build_snapshot.assert_called_once()
+
+    def test_report_embeds_snapshot_for_anonymous_user(self, check_if_celery_available):
+        path = reverse("resource_report", args=[self.dataset.resource.pk])
+
+        response = self.client.get(path)
+        self.assertNotContains(response, 'id="modular-report-snapshot"')
+
+        with self.settings(MODULAR_REPORTS_ANONYMOUS_SNAPSHOTS=True):
+            response = self.client.get(path)
+        self.assertContains(response, 'id="modular-report-snapshot"')
+        self.assertContains(response, "Inscription 0 0")
+
+    def test_snapshots_need_a_cache(self, check_if_celery_available):
+        path = reverse("resource_report", args=[self.dataset.resource.pk])
+        with (
+            self.settings(
+                MODULAR_REPORTS_ANONYMOUS_SNAPSHOTS=True, CACHES=DUMMY_CACHES
+            ),
+            mock.patch(
+                "arches_modular_reports.tasks.build_report_snapshot"
+            ) as build_snapshot,
+        ):
+            response = self.client.get(path)
+        self.assertNotContains(response, 'id="modular-report-snapshot"')
+        build_snapshot.assert_not_called()
+
+    def test_report_embeds_bootstrap_when_enabled(self, check_if_celery_available):
+        path = reverse("resource_report", args=[self.dataset.resource.pk])
+        self.client.force_login(User.objects.create_superuser("snapshot_admin"))
+
+        with self.settings(MODULAR_REPORTS_ANONYMOUS_SNAPSHOTS=True):
+            response = self.client.get(path)
+        self.assertNotContains(response, 'id="modular-report-snapshot"')
+
+        with self.settings(MODULAR_REPORTS_INLINE_BOOTSTRAP=True):
+            response = self.client.get(path)
+        self.assertContains(response, 'id="modular-report-snapshot"')
+        self.assertContains(response, "Snapshot")
+        self.assertNotContains(response, "Inscription 0 0")
+
+    def test_report_renders_when_bootstrap_fails(self, check_if_celery_available):
+        path = reverse("resource_report", args=[self.dataset.resource.pk])
+        self.client.force_login(User.objects.create_superuser("snapshot_admin"))
+
+        with (
+            self.settings(MODULAR_REPORTS_INLINE_BOOTSTRAP=True),
+            mock.patch(
+                "arches_modular_reports.app.views.modular_report.build_bootstrap_snapshot",
+                side_effect=ReportConfig.DoesNotExist,
+            ),
+            self.assertLogs("arches_modular_reports.app.views.modular_report", "ERROR"),
+        ):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'id="modular-report-snapshot"')
@@ -0,0 +1,175 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from arches import __version__ as _arches_version_str
+from arches.app.models.graph import Graph
+from arches.app.models.models import Node, NodeGroup, ResourceInstance, TileModel
+
+from arches_modular_reports.app.utils.nodegroup_tile_data_utils import (
+    get_sorted_filtered_tiles,
+    get_unfiltered_tiles,
+    paginate_by_cursor,
+    UnfilteredTilePaginator,
+)
+from packaging.version import Version
+
+arches_version = Version(_arches_version_str)
+
+
+class TilePaginationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        if arches_version < Version("8.0"):
+            cls.graph = Graph.new(is_resource=True)
+            cls.graph.slug = "paginated_graph"
+            cls.graph.save()
+        else:
+            cls.graph = Graph.objects.create_graph(
+                is_resource=True, slug="paginated_graph"
+            )
+            Graph.objects.filter(slug="paginated_graph").exclude(
+                source_identifier=None
+            ).delete()  # delete draft graph
+
+        nodegroup = NodeGroup.objects.create(cardinality="n")
+        Node.objects.create(
+            pk=nodegroup.pk,
+            name="Inscription",
+            alias="inscription",
+            graph_id=cls.graph.pk,
+            nodegroup=nodegroup,
+            datatype="semantic",
+            istopnode=False,
+        )
+        cls.text_node = Node.objects.create(
+            nodegroup=nodegroup,
+            name="Inscription text",
+            alias="inscription_text",
+            graph_id=cls.graph.pk,
+            istopnode=False,
+            datatype="string",
+        )
+        cls.resource = ResourceInstance.objects.create(graph_id=cls.graph.pk)
+        # Duplicate and empty values exercise the tie-breakers.
+        for sortorder, text in enumerate(["b", "a", "c", "a", "", "d", "b"]):
+            TileModel.objects.create(
+                resourceinstance=cls.resource,
+                nodegroup=nodegroup,
+                sortorder=sortorder % 3,
+                data={
+                    str(cls.text_node.pk): {"en": {"value": text, "direction": "ltr"}}
+                },
+            )
+        cls.user = User.objects.create_superuser("pagination_admin")
+
+    def get_tiles(self, sort_node_id=None, direction="asc"):
+        return get_sorted_filtered_tiles(
+            resourceinstanceid=self.resource.pk,
+            nodegroup_alias="inscription",
+            sort_node_id=sort_node_id,
+            direction=direction,
+            query="",
+            user_language="en",
+            user=self.user,
+            filters=None,
+        )
+
+
+class CursorPaginationTests(TilePaginationTestCase):
+    def assert_cursor_pages_match_offset_pages(self, tiles):
+        expected = [tile.pk for tile in tiles]
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor, previous_cursor = paginate_by_cursor(tiles, 3, cursor)
+            seen.extend(tile.pk for tile in rows)
+            if not cursor:
+                break
+        self.assertEqual(seen, expected)
+
+        # Walking back from the last page returns the page before it.
+        rows, _, _ = paginate_by_cursor(tiles, 3, previous_cursor)
+        self.assertEqual([tile.pk for tile in rows], expected[3:6])
+
+    def test_default_order(self):
+        self.assert_cursor_pages_match_offset_pages(self.get_tiles())
+
+    def test_sorted_by_display_value(self):
+        for direction in ("asc", "desc"):
+            with self.subTest(direction=direction):
+                self.assert_cursor_pages_match_offset_pages(
+                    self.get_tiles(str(self.text_node.pk), direction)
+                )
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            paginate_by_cursor(self.get_tiles(), 3, "garbage")
+
+    def test_view_rows_per_page(self):
+        self.client.force_login(self.user)
+        path = reverse(
+            "api_nodegroup_tile_data", args=[self.resource.pk, "inscription"]
+        )
+
+        response = self.client.get(path, {"pagination": "cursor"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 7)
+
+        for rows_per_page in ("many", "0", "-1", "100000"):
+            with self.subTest(rows_per_page=rows_per_page):
+                for pagination in ("cursor", "offset"):
+                    response = self.client.get(
+                        path,
+                        {"pagination": pagination, "rows_per_page": rows_per_page},
+                    )
+                    self.assertEqual(response.status_code, 400)
+
+
+class UnfilteredTilePaginatorTests(TilePaginationTestCase):
+    def get_paginator(self, tiles):
+        return UnfilteredTilePaginator(
+            tiles,
+            3,
+            unfiltered_tiles=get_unfiltered_tiles(
+                resourceinstanceid=self.resource.pk, nodegroup_alias="inscription"
+            ),
+        )
+
+    def test_pages_match_annotated_queryset(self):
+        for sort_node_id in (None, str(self.text_node.pk)):
+            with self.subTest(sort_node_id=sort_node_id):
+                tiles = self.get_tiles(sort_node_id)
+                expected = [tile.pk for tile in tiles]
+                paginator = self.get_paginator(tiles)
+                self.assertEqual(paginator.count, len(expected))
+                seen = []
+                for number in paginator.page_range:
+                    page = paginator.page(number)
+                    seen.extend(tile.pk for tile in page.object_list)
+                    for tile in page.object_list:
+                        self.assertIn("inscription_text", tile.alias_annotations)
+                self.assertEqual(seen, expected)
+
+    def test_page_and_next(self):
+        for sort_node_id in (None, str(self.text_node.pk)):
+            with self.subTest(sort_node_id=sort_node_id):
+                tiles = self.get_tiles(sort_node_id)
+                expected = [tile.pk for tile in tiles]
+                paginator = self.get_paginator(tiles)
+
+                page, next_page = paginator.get_page_and_next(1)
+                self.assertEqual([tile.pk for tile in page.object_list], expected[:3])
+                self.assertEqual(next_page.number, 2)
+                self.assertEqual(
+                    [tile.pk for tile in next_page.object_list], expected[3:6]
+                )
+
+                # Out of range pages are clamped, as by get_page().
+                page, next_page = paginator.get_page_and_next(99)
+                self.assertEqual(page.number, 3)
+                self.assertEqual([tile.pk for tile in page.object_list], expected[6:])
+                self.assertIsNone(next_page)
+
+    def test_no_search_text_without_query(self):
+        self.assertNotIn("search_text", self.get_tiles().query.annotations)